@@ -0,0 +1,75 @@
+"""Cold-start import time of ``main``, from ``python -X importtime``.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_import
+  python -m benchmarks.bench_import --runs 5 --top 15 --json
+
+Each run imports ``main`` in a fresh interpreter. Reported, best of ``--runs``:
+
+- ``main_ms``: cumulative import time of ``main``
+- ``own_ms``: the same minus the FastAPI framework import
+- ``slowest``: the ``--top`` modules with the largest cumulative time (best run)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _import_profile() -> Dict[str, int]:
+  """``{module: cumulative microseconds}`` for a cold ``import main``."""
+  proc = subprocess.run(
+    [sys.executable, '-X', 'importtime', '-c', 'import main'],
+    cwd=ROOT,
+    capture_output=True,
+    text=True,
+    check=True
+  )
+  profile: Dict[str, int] = {}
+  for line in proc.stderr.splitlines():
+    if not line.startswith('import time:') or '|' not in line:
+      continue
+    _, cumulative, name = line.split('|', 2)
+    try:
+      profile[name.strip()] = int(cumulative.strip())
+    except ValueError:
+      continue  # header row
+  return profile
+
+
+def run(runs: int, top: int) -> Dict[str, object]:
+  profiles: List[Dict[str, int]] = [_import_profile() for _ in range(runs)]
+  best = min(profiles, key=lambda profile: profile['main'])
+  slowest = sorted(best.items(), key=lambda item: -item[1])[:top]
+  return {
+    'main_ms': best['main'] / 1000,
+    'own_ms': (best['main'] - best.get('fastapi', 0)) / 1000,
+    'slowest': [{'module': name, 'ms': micros / 1000} for name, micros in slowest],
+  }
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--runs', type=int, default=3, help='best of this many cold imports')
+  parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  results = run(args.runs, args.top)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  print(f"import main: {results['main_ms']:.1f} ms (own {results['own_ms']:.1f} ms, excluding fastapi)")
+  for entry in results['slowest']:
+    print(f"  {entry['ms']:8.1f} ms  {entry['module']}")
+
+
+if __name__ == '__main__':
+  main()
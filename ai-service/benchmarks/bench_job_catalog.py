@@ -0,0 +1,139 @@
+"""Recommending from a stored job catalog vs. sending the jobs with every request.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_job_catalog
+  python -m benchmarks.bench_job_catalog --jobs 10000,100000 --dim 384 --json
+
+Jobs draw skills from a large pool, so a candidate shares a skill with only a
+small share of them. Each time is the best of ``--repeat`` runs:
+
+- ``validate_ms``: building a ``RecommendationRequest`` with every job (what
+  FastAPI does per ``/ai/recommend`` call)
+- ``recommend_ms``: ``recommend_jobs`` on that request
+- ``upsert_ms``: loading all jobs into an empty ``JobCatalog`` (paid once; later
+  changes are upserted incrementally)
+- ``catch_up_ms``: a worker's first recommendation from a catalog file another
+  worker filled (reading the jobs back and indexing them; paid once per
+  worker start)
+- ``catalog_ms``: ``recommend_from_catalog`` returning the top ``--top-k``
+
+``shared`` is the fraction of jobs sharing at least one skill with the
+candidate: the only ones whose overlap the catalog counts.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+import numpy as np  # noqa: E402
+
+from models.recommendation import CatalogRecommendationRequest, RecommendationRequest  # noqa: E402
+from services import job_catalog  # noqa: E402
+from services.recommendation_service import recommend_jobs  # noqa: E402
+
+_SKILLS = [f'Skill {idx}' for idx in range(5000)]
+_LOCATIONS = ['remote', 'Berlin', 'London', 'New York', 'Pune', None]
+
+
+def _best_of_ms(fn: Callable[[], object], repeat: int) -> float:
+  best = float('inf')
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1e3
+
+
+def run(sizes: Sequence[int], dim: int, top_k: int, repeat: int, seed: int) -> Dict[int, Dict[str, float]]:
+  rng = random.Random(seed)
+  vectors = np.random.default_rng(seed)
+  candidate = {
+    'skills': rng.sample(_SKILLS, 25),
+    'preferred_locations': ['remote', 'Berlin'],
+    'seniority': 'senior',
+    'embeddings': vectors.normal(size=dim).tolist(),
+  }
+  results: Dict[int, Dict[str, float]] = {}
+  for size in sizes:
+    embeddings = vectors.normal(size=(size, dim)).astype(np.float32)
+    jobs = [
+      {
+        'job_id': f'job-{idx}',
+        'title': 'Engineer',
+        'required_skills': rng.sample(_SKILLS, rng.randint(3, 12)),
+        'nice_to_have_skills': rng.sample(_SKILLS, rng.randint(0, 4)),
+        'location': rng.choice(_LOCATIONS),
+        'seniority': rng.choice(['junior', 'mid', 'senior']),
+        'embeddings': embeddings[idx].tolist(),
+      }
+      for idx in range(size)
+    ]
+    payload = {'candidate': candidate, 'jobs': jobs}
+    request = RecommendationRequest.model_validate(payload)
+    own = {skill.lower() for skill in candidate['skills']}
+    shared = sum(
+      1 for job in request.jobs if own.intersection(s.lower() for s in job.required_skills + job.nice_to_have_skills)
+    )
+
+    def upsert() -> job_catalog.JobCatalog:
+      catalog = job_catalog.JobCatalog()
+      catalog.upsert(request.jobs)
+      return catalog
+
+    job_catalog._CATALOG = upsert()
+    catalog_request = CatalogRecommendationRequest(candidate=request.candidate, top_k=top_k)
+    expected = [(job.job_id, job.score) for job in recommend_jobs(request).ranked_jobs[:top_k]]
+    got = [(job.job_id, job.score) for job in job_catalog.recommend_from_catalog(catalog_request).ranked_jobs]
+    if got != expected:
+      raise AssertionError(f'catalog ranking differs from recommend_jobs at size {size}')
+
+    store = Path(tempfile.mkdtemp(prefix='bench-catalog-')) / 'catalog.sqlite3'
+    job_catalog.JobCatalog(str(store)).upsert(request.jobs)
+
+    stats = {
+      'shared': shared / size,
+      'validate_ms': _best_of_ms(lambda: RecommendationRequest.model_validate(payload), repeat),
+      'recommend_ms': _best_of_ms(lambda: recommend_jobs(request), repeat),
+      'upsert_ms': _best_of_ms(upsert, repeat),
+      'catalog_ms': _best_of_ms(lambda: job_catalog.recommend_from_catalog(catalog_request), repeat),
+      'catch_up_ms': _best_of_ms(lambda: job_catalog.JobCatalog(str(store)).top(request.candidate, top_k), repeat),
+    }
+    stats['speedup'] = (stats['validate_ms'] + stats['recommend_ms']) / stats['catalog_ms']
+    results[size] = stats
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--jobs', default='1000,10000,100000', help='comma-separated catalog sizes')
+  parser.add_argument('--dim', type=int, default=64)
+  parser.add_argument('--top-k', type=int, default=20)
+  parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  sizes = sorted(int(part) for part in args.jobs.split(',') if part.strip())
+  results = run(sizes, args.dim, args.top_k, args.repeat, args.seed)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for size, stats in results.items():
+    print(
+      f"jobs={size:<7} shared {stats['shared']:5.1%}  validate {stats['validate_ms']:8.1f} ms  "
+      f"recommend {stats['recommend_ms']:8.1f} ms  upsert {stats['upsert_ms']:8.1f} ms  catch-up {stats['catch_up_ms']:8.1f} ms  "
+      f"catalog {stats['catalog_ms']:6.2f} ms (x{stats['speedup']:.0f})"
+    )
+
+
+if __name__ == '__main__':
+  main()
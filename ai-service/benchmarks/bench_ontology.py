@@ -0,0 +1,149 @@
+"""Ontology load time and per-token lookup cost as the ontology grows.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_ontology
+  python -m benchmarks.bench_ontology --sizes 1000,10000,100000 --tokens 2000 --json
+
+For each size a synthetic ontology (``benchmarks.corpus.build_ontology``) is
+loaded and timed. Per-token cost is then reported for:
+
+- ``exact``: alias/display/id hits through ``resolve_alias_to_canonical``
+- ``similarity``: unknown tokens through ``similarity_to_canonical`` on first
+  sight (embedding + index search)
+- ``memoized``: the same unknown tokens again
+- ``index_search`` / ``linear_scan``: the index search alone vs. a full
+  mat-vec scan over every label (the pre-index behaviour), on the same query
+  vectors
+- ``near_global`` / ``near_hinted``: queries close to a ``language`` label,
+  searched over every label vs. with a ``language`` category hint (only
+  ``language`` rows are scanned once they yield a hit)
+
+``scaling`` divides each cost by the smallest size's cost. Linear behaviour
+would track the growth in labels.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+import numpy as np  # noqa: E402
+
+from benchmarks.corpus import write_ontology  # noqa: E402
+from utils.embeddings_client import get_embeddings_client  # noqa: E402
+from utils.skill_ontology_loader import (  # noqa: E402
+  load_skill_ontology,
+  resolve_alias_to_canonical,
+  similarity_to_canonical
+)
+
+
+def _per_token_us(fn: Callable[[str], object], tokens: Sequence[str]) -> float:
+  started = time.perf_counter()
+  for token in tokens:
+    fn(token)
+  return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def _per_query_us(fn: Callable[[np.ndarray], object], queries: np.ndarray) -> float:
+  started = time.perf_counter()
+  for query in queries:
+    fn(query)
+  return (time.perf_counter() - started) / len(queries) * 1e6
+
+
+def run(sizes: Sequence[int], tokens: int, seed: int, workdir: Path) -> Dict[int, Dict[str, float]]:
+  results: Dict[int, Dict[str, float]] = {}
+  previous = os.environ.get('SKILL_ONTOLOGY_PATH')
+  try:
+    for size in sizes:
+      os.environ['SKILL_ONTOLOGY_PATH'] = str(write_ontology(workdir / f'ontology-{size}.json', size, seed))
+      started = time.perf_counter()
+      ontology = load_skill_ontology(force_reload=True)
+      load_s = time.perf_counter() - started
+
+      rng = np.random.default_rng(seed)
+      known = [ontology.embedding_labels[i] for i in rng.integers(0, len(ontology.embedding_labels), size=tokens)]
+      unknown = [f'unlisted-skill-{size}-{i}' for i in range(tokens)]
+      embed = get_embeddings_client()
+      queries = embed.embed_array(unknown)
+      index = ontology.embedding_index
+      language = [
+        label for label, entry in zip(ontology.embedding_labels, ontology.label_entries.tolist())
+        if ontology.categories[entry] == 'language'
+      ]
+      near = embed.embed_array([language[i] for i in rng.integers(0, len(language), size=tokens)])
+      near = near + rng.normal(scale=0.05, size=near.shape).astype(np.float32) * np.abs(near).mean()
+
+      def linear_scan(query: np.ndarray) -> int:
+        return int(np.argmax(index.unit @ (query / np.linalg.norm(query))))
+
+      results[size] = {
+        'labels': len(ontology.embedding_labels),
+        'load_s': load_s,
+        'index_mib': index.nbytes / 2**20,
+        'ivf': not index.is_flat,
+        'exact_us': _per_token_us(resolve_alias_to_canonical, known),
+        'similarity_us': _per_token_us(similarity_to_canonical, unknown),
+        'memoized_us': _per_token_us(similarity_to_canonical, unknown),
+        'index_search_us': _per_query_us(index.search, queries),
+        'linear_scan_us': _per_query_us(linear_scan, queries),
+        'near_global_us': _per_query_us(index.search, near),
+        'near_hinted_us': _per_query_us(lambda query: index.search(query, ('language',), 0.82), near),
+      }
+  finally:
+    if previous is None:
+      os.environ.pop('SKILL_ONTOLOGY_PATH', None)
+    else:
+      os.environ['SKILL_ONTOLOGY_PATH'] = previous
+    load_skill_ontology(force_reload=True)
+
+  base = results[sizes[0]]
+  for stats in results.values():
+    stats['scaling'] = {'labels': stats['labels'] / base['labels']}
+    for key in ('exact', 'similarity', 'index_search', 'linear_scan'):
+      stats['scaling'][key] = stats[f'{key}_us'] / base[f'{key}_us'] if base[f'{key}_us'] else 0.0
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--sizes', default='1000,10000,100000', help='comma-separated ontology entry counts')
+  parser.add_argument('--tokens', type=int, default=2000, help='lookups per measurement')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  sizes: List[int] = sorted(int(part) for part in args.sizes.split(',') if part.strip())
+  with tempfile.TemporaryDirectory(prefix='ai-ontology-') as workdir:
+    results = run(sizes, args.tokens, args.seed, Path(workdir))
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for size, stats in results.items():
+    scaling = stats['scaling']
+    print(
+      f"entries={size:<7} labels={stats['labels']:<7} load={stats['load_s']:.2f}s index={stats['index_mib']:.1f}MiB "
+      f"{'ivf ' if stats['ivf'] else 'flat'}"
+    )
+    print(
+      f"  exact={stats['exact_us']:.2f}us similarity={stats['similarity_us']:.1f}us "
+      f"memoized={stats['memoized_us']:.2f}us index_search={stats['index_search_us']:.1f}us "
+      f"linear_scan={stats['linear_scan_us']:.1f}us near_global={stats['near_global_us']:.1f}us "
+      f"near_hinted={stats['near_hinted_us']:.1f}us"
+    )
+    print(
+      f"  x{scaling['labels']:.0f} labels -> similarity x{scaling['similarity']:.1f}, "
+      f"index_search x{scaling['index_search']:.1f}, linear_scan x{scaling['linear_scan']:.1f}"
+    )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,135 @@
+"""Nightly regeneration: one ``recommend_jobs`` call per candidate vs. ``recommend_batch``.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_recommend_batch
+  python -m benchmarks.bench_recommend_batch --candidates 1000,10000 --jobs 2000 --dim 384 --json
+
+Every candidate is scored against the same job list. Each time is the best of
+``--repeat`` runs:
+
+- ``per_candidate_ms``: ``recommend_jobs`` once per candidate (the HTTP loop,
+  minus HTTP and minus re-validating the job list each call). Only measured up
+  to ``--per-candidate-max`` candidates
+- ``batch_ms``: ``recommend_batch`` with the default block size
+- ``per_candidate_us`` / ``batch_us``: the same, per candidate
+
+The first ``--check`` candidates of every size are checked to get identical
+top ``--top-k`` lists from both paths.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+import numpy as np  # noqa: E402
+
+from models.recommendation import (  # noqa: E402
+  BatchRecommendationRequest,
+  CandidateProfile,
+  JobRecommendationInput,
+  RecommendationRequest,
+)
+from services.recommendation_service import recommend_batch, recommend_jobs  # noqa: E402
+
+_SKILLS = [f'Skill {idx}' for idx in range(1500)]
+_LOCATIONS = ['remote', 'Berlin', 'London', 'New York', 'Pune', None]
+_SENIORITY = ['junior', 'mid', 'senior', None]
+
+
+def _best_of_ms(fn: Callable[[], object], repeat: int) -> float:
+  best = float('inf')
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1e3
+
+
+def run(
+  sizes: Sequence[int], n_jobs: int, dim: int, top_k: int, per_candidate_max: int, check: int, repeat: int, seed: int
+) -> Dict[int, Dict[str, float]]:
+  rng = random.Random(seed)
+  vectors = np.random.default_rng(seed)
+  job_vectors = vectors.normal(size=(n_jobs, dim)).astype(np.float32)
+  jobs = [
+    JobRecommendationInput(
+      job_id=f'job-{idx}',
+      title='Engineer',
+      required_skills=rng.sample(_SKILLS, rng.randint(3, 12)),
+      nice_to_have_skills=rng.sample(_SKILLS, rng.randint(0, 4)),
+      location=rng.choice(_LOCATIONS),
+      seniority=rng.choice(_SENIORITY),
+      embeddings=job_vectors[idx].tolist()
+    )
+    for idx in range(n_jobs)
+  ]
+  results: Dict[int, Dict[str, float]] = {}
+  for size in sizes:
+    candidate_vectors = vectors.normal(size=(size, dim)).astype(np.float32)
+    candidates = [
+      CandidateProfile(
+        id=f'cand-{idx}',
+        skills=rng.sample(_SKILLS, rng.randint(5, 30)),
+        preferred_locations=[loc for loc in rng.sample(_LOCATIONS, 2) if loc],
+        seniority=rng.choice(_SENIORITY),
+        embeddings=candidate_vectors[idx].tolist()
+      )
+      for idx in range(size)
+    ]
+    request = BatchRecommendationRequest(candidates=candidates, jobs=jobs, top_k=top_k)
+    singles = [RecommendationRequest(candidate=candidate, jobs=jobs) for candidate in candidates]
+
+    batch = recommend_batch(request).results
+    for single, result in zip(singles[:check], batch):
+      expected = [(job.job_id, job.score) for job in recommend_jobs(single).ranked_jobs[:top_k]]
+      if [(job.job_id, job.score) for job in result.ranked_jobs] != expected:
+        raise AssertionError(f'batch ranking differs from recommend_jobs for {result.candidate_id}')
+
+    stats = {'batch_ms': _best_of_ms(lambda: recommend_batch(request), repeat)}
+    stats['batch_us'] = stats['batch_ms'] * 1e3 / size
+    if size <= per_candidate_max:
+      stats['per_candidate_ms'] = _best_of_ms(lambda: [recommend_jobs(single) for single in singles], repeat)
+      stats['per_candidate_us'] = stats['per_candidate_ms'] * 1e3 / size
+      stats['speedup'] = stats['per_candidate_ms'] / stats['batch_ms']
+    results[size] = stats
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--candidates', default='100,1000,10000', help='comma-separated candidate counts')
+  parser.add_argument('--jobs', type=int, default=2000, help='shared job list size')
+  parser.add_argument('--dim', type=int, default=64)
+  parser.add_argument('--top-k', type=int, default=20)
+  parser.add_argument('--per-candidate-max', type=int, default=1000, help='largest batch to run the per-candidate baseline on')
+  parser.add_argument('--check', type=int, default=50, help='candidates checked against recommend_jobs per size')
+  parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  sizes = sorted(int(part) for part in args.candidates.split(',') if part.strip())
+  results = run(sizes, args.jobs, args.dim, args.top_k, args.per_candidate_max, args.check, args.repeat, args.seed)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for size, stats in results.items():
+    per_candidate = (
+      f"{stats['per_candidate_ms']:9.1f} ms ({stats['per_candidate_us']:7.0f} us each)  x{stats['speedup']:.1f}"
+      if 'per_candidate_ms' in stats else '        -'
+    )
+    print(
+      f"candidates={size:<6} jobs={args.jobs:<6} batch {stats['batch_ms']:9.1f} ms ({stats['batch_us']:6.0f} us each)  "
+      f"per_candidate {per_candidate}"
+    )
+
+
+if __name__ == '__main__':
+  main()
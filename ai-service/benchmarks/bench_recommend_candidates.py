@@ -0,0 +1,119 @@
+"""Ranking candidates for one job: per-pair ``_score_job`` vs. ``rank_candidates``.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_recommend_candidates
+  python -m benchmarks.bench_recommend_candidates --sizes 1000,10000,100000 --dim 1536 --json
+
+For each pool size, synthetic candidates are scored against one job. Each
+time is the best of ``--repeat`` runs:
+
+- ``validate_ms``: building the request model (what FastAPI does per request)
+- ``per_pair_ms``: ``_score_job`` for every candidate plus a sort (the N
+  match-call baseline, minus HTTP). Only measured up to ``--per-pair-max``
+  candidates
+- ``vectorized_ms``: ``rank_candidates`` returning the top ``--top-k``
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from models.recommendation import CandidateRankingRequest
+from services.recommendation_service import _embedding_scores, _score_job, rank_candidates
+
+_SKILLS = [f'skill-{idx}' for idx in range(400)]
+_LOCATIONS = ['remote', 'Berlin', 'London', 'New York', 'Pune', None]
+_SENIORITY = ['junior', 'mid', 'senior', None]
+
+
+def _payload(size: int, dim: int, top_k: int, seed: int) -> Dict:
+  rng = random.Random(seed)
+  vectors = np.random.default_rng(seed).normal(size=(size + 1, dim)).astype(np.float32)
+  job = {
+    'job_id': 'job-1',
+    'title': 'Engineer',
+    'required_skills': rng.sample(_SKILLS, 8),
+    'nice_to_have_skills': rng.sample(_SKILLS, 4),
+    'embeddings': vectors[0].tolist(),
+    'location': 'Berlin',
+    'seniority': 'senior',
+  }
+  candidates = [
+    {
+      'id': f'cand-{idx}',
+      'skills': rng.sample(_SKILLS, rng.randint(5, 30)),
+      'preferred_locations': [loc for loc in rng.sample(_LOCATIONS, 2) if loc],
+      'seniority': rng.choice(_SENIORITY),
+      'embeddings': vectors[idx + 1].tolist(),
+    }
+    for idx in range(size)
+  ]
+  return {'job': job, 'candidates': candidates, 'top_k': top_k}
+
+
+def _per_pair(request: CandidateRankingRequest) -> List:
+  job, candidates = request.job, request.candidates
+  # The same float32 embedding scores the vectorized path uses, so only the per-pair scoring is compared.
+  embeddings = _embedding_scores(job.embeddings, [candidate.embeddings for candidate in candidates]).tolist()
+  scored = [(round(_score_job(c, job, e)[0], 3), idx) for idx, (c, e) in enumerate(zip(candidates, embeddings))]
+  return sorted(scored, key=lambda item: -item[0])[:request.top_k]
+
+
+def _best_of_ms(fn: Callable[[], object], repeat: int) -> float:
+  best = float('inf')
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1e3
+
+
+def run(sizes: Sequence[int], dim: int, top_k: int, per_pair_max: int, repeat: int, seed: int) -> Dict[int, Dict[str, float]]:
+  results: Dict[int, Dict[str, float]] = {}
+  for size in sizes:
+    payload = _payload(size, dim, top_k, seed)
+    request = CandidateRankingRequest.model_validate(payload)
+    stats = {'validate_ms': _best_of_ms(lambda: CandidateRankingRequest.model_validate(payload), repeat)}
+    stats['vectorized_ms'] = _best_of_ms(lambda: rank_candidates(request), repeat)
+    if size <= per_pair_max:
+      stats['per_pair_ms'] = _best_of_ms(lambda: _per_pair(request), repeat)
+      stats['speedup'] = stats['per_pair_ms'] / stats['vectorized_ms']
+      got = [(item.score, item.index) for item in rank_candidates(request).ranked_candidates]
+      if got != _per_pair(request):
+        raise AssertionError(f'vectorized ranking differs from per-pair scoring at size {size}')
+    results[size] = stats
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--sizes', default='1000,10000,100000', help='comma-separated candidate pool sizes')
+  parser.add_argument('--dim', type=int, default=64)
+  parser.add_argument('--top-k', type=int, default=50)
+  parser.add_argument('--per-pair-max', type=int, default=20000, help='largest pool to run the per-pair baseline on')
+  parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  sizes = sorted(int(part) for part in args.sizes.split(',') if part.strip())
+  results = run(sizes, args.dim, args.top_k, args.per_pair_max, args.repeat, args.seed)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for size, stats in results.items():
+    per_pair = f"{stats['per_pair_ms']:9.1f} ms  x{stats['speedup']:.1f}" if 'per_pair_ms' in stats else '        -'
+    print(
+      f"candidates={size:<7} validate {stats['validate_ms']:8.1f} ms  vectorized {stats['vectorized_ms']:8.1f} ms  "
+      f"per_pair {per_pair}"
+    )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,121 @@
+"""Requirement engine (RSE) cost per match: slotted dataclasses vs. Pydantic models.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_rse --skills 40 --repeat 200
+
+Both cases run ``build_requirements`` -> ``evaluate_requirements`` ->
+``calculate_scores`` on the same synthetic JD/resume pair:
+
+- ``pydantic_models``: what the engine used to do -- validate a
+  ``JDRequirement`` and a ``RequirementResult`` per requirement and
+  ``.dict()`` every result for the match explanation
+- ``slotted_dataclasses``: the current engine, with no conversion
+
+Reports microseconds per match and the bytes (tracemalloc) each match's
+requirements, results and breakdown keep alive.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks.bench_serialization import _documents
+from models.job import JobDescriptionResponse
+from models.rse import JDRequirement, RequirementResult
+from services.rse_engine import build_requirements, calculate_scores, evaluate_requirements
+from services.skill_utils import extract_skills, normalize_skill_list
+from utils.skill_ontology_loader import suppress_unknown_skill_recording
+
+
+def _parsed_jd(jd_text: str) -> JobDescriptionResponse:
+  return JobDescriptionResponse(
+    required_skills=sorted(set(normalize_skill_list(extract_skills(jd_text)))),
+    nice_to_have_skills=[],
+    summary=jd_text,
+    embeddings=[],
+    warnings=[]
+  )
+
+
+def _slotted(jd_text: str, parsed: JobDescriptionResponse, resume_text: str) -> Any:
+  requirements = build_requirements(jd_text, parsed)
+  results = evaluate_requirements(requirements, resume_text)
+  return calculate_scores(requirements, results), results
+
+
+def _fields(obj: Any) -> Dict[str, Any]:
+  return {name: getattr(obj, name) for name in obj.__slots__}
+
+
+def _pydantic(jd_text: str, parsed: JobDescriptionResponse, resume_text: str) -> Any:
+  requirements = [JDRequirement(**_fields(req)) for req in build_requirements(jd_text, parsed)]
+  results = [RequirementResult(**_fields(res)) for res in evaluate_requirements(requirements, resume_text)]
+  return calculate_scores(requirements, results), [res.model_dump() for res in results]
+
+
+def _per_call_us(fn: Callable[[], Any], repeat: int) -> float:
+  fn()  # warm regex and ontology caches
+  started = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  return (time.perf_counter() - started) / repeat * 1e6
+
+
+def _allocated_bytes(fn: Callable[[], Any], repeat: int) -> float:
+  tracemalloc.start()
+  try:
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [fn() for _ in range(repeat)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+  finally:
+    tracemalloc.stop()
+  del kept
+  return allocated / repeat
+
+
+def run(skills: int, repeat: int) -> Dict[str, Dict[str, float]]:
+  docs = _documents(skills)
+  parsed = _parsed_jd(docs['jd'])
+  cases = {
+    'pydantic_models': lambda: _pydantic(docs['jd'], parsed, docs['resume']),
+    'slotted_dataclasses': lambda: _slotted(docs['jd'], parsed, docs['resume']),
+  }
+  requirement_count = len(build_requirements(docs['jd'], parsed))
+  results: Dict[str, Dict[str, float]] = {}
+  for name, fn in cases.items():
+    results[name] = {
+      'us_per_match': _per_call_us(fn, repeat),
+      'bytes_per_match': _allocated_bytes(fn, min(repeat, 50)),
+      'requirements': requirement_count,
+    }
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--skills', type=int, default=40, help='skills mentioned in the synthetic JD')
+  parser.add_argument('--repeat', type=int, default=200)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  # Unknown-skill bookkeeping writes a JSON file per hit and would dominate the timings.
+  with suppress_unknown_skill_recording():
+    results = run(args.skills, args.repeat)
+  if args.json:
+    print(json.dumps({'skills': args.skills, 'repeat': args.repeat, 'results': results}, indent=2))
+    return
+  baseline = results['pydantic_models']
+  print(f"{int(baseline['requirements'])} requirements per match")
+  for name, stats in results.items():
+    print(
+      f"{name:>20}: {stats['us_per_match']:>9.1f} us  x{baseline['us_per_match'] / stats['us_per_match']:.2f}"
+      f"  {stats['bytes_per_match']:>10,.0f} B"
+    )
+
+
+if __name__ == '__main__':
+  main()
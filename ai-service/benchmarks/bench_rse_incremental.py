@@ -0,0 +1,117 @@
+"""Re-scoring an edited resume: full ``evaluate_requirements`` vs. ``reevaluate_requirements``.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_rse_incremental --size large --repeat 200
+
+A synthetic resume (``benchmarks.corpus``) is scored against a JD. Then each
+edit below is applied, the way the correction flow re-submits a resume after
+a small change:
+
+- ``typo``: one character changed inside an experience bullet
+- ``experience_bullet``: a bullet rewritten to mention another skill
+- ``skills_line``: a skill appended to the skills section
+- ``summary``: the summary sentence replaced
+
+For each edit the report shows microseconds for the full evaluation and for
+``diff_text`` + ``reevaluate_requirements`` from the previous state. It also
+shows how many requirements had their evidence recomputed. Both paths are
+checked to produce identical results.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+from benchmarks.bench_rse import _parsed_jd  # noqa: E402
+from benchmarks.corpus import SIZES, generate_jd, generate_resume  # noqa: E402
+from services.rse_engine import (  # noqa: E402
+  build_requirements,
+  diff_text,
+  evaluate_requirements,
+  evaluate_requirements_state,
+  reevaluate_requirements
+)
+from utils.skill_ontology_loader import suppress_unknown_skill_recording  # noqa: E402
+
+
+def _edits(text: str) -> Dict[str, str]:
+  lines = text.splitlines()
+  bullet = next(idx for idx, line in enumerate(lines) if line.startswith('- '))
+  skills = next(idx for idx, line in enumerate(lines) if line.strip().lower() == 'skills') + 1
+  summary = next(idx for idx, line in enumerate(lines) if line.strip().lower() == 'summary') + 1
+
+  def replaced(idx: int, line: str) -> str:
+    return '\n'.join(lines[:idx] + [line] + lines[idx + 1:])
+
+  typo = lines[bullet]
+  middle = len(typo) // 2
+  return {
+    'typo': replaced(bullet, typo[:middle] + ('x' if typo[middle] != 'x' else 'y') + typo[middle + 1:]),
+    'experience_bullet': replaced(bullet, '- Rebuilt the billing pipeline with Rust and PostgreSQL.'),
+    'skills_line': replaced(skills, lines[skills] + ', Elixir'),
+    'summary': replaced(summary, 'Engineer focused on distributed systems and developer experience.'),
+  }
+
+
+def _per_call_us(fn: Callable[[], Any], repeat: int) -> float:
+  fn()
+  started = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  return (time.perf_counter() - started) / repeat * 1e6
+
+
+def run(size: str, repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+  rng = random.Random(seed)
+  resume = generate_resume(rng, size).text
+  jd_text = generate_jd(rng, 'large').text
+  with suppress_unknown_skill_recording():
+    requirements = build_requirements(jd_text, _parsed_jd(jd_text))
+    state = evaluate_requirements_state(requirements, resume)
+    results: Dict[str, Dict[str, float]] = {}
+    for name, edited in _edits(resume).items():
+      updated = reevaluate_requirements(requirements, state, diff_text(resume, edited))
+      if updated.results != evaluate_requirements(requirements, edited):
+        raise AssertionError(f'incremental result differs from full evaluation for {name!r}')
+      full_us = _per_call_us(lambda: evaluate_requirements(requirements, edited), repeat)
+      incremental_us = _per_call_us(
+        lambda: reevaluate_requirements(requirements, state, diff_text(resume, edited)), repeat
+      )
+      results[name] = {
+        'requirements': len(requirements),
+        'evidence_recomputed': updated.evaluated,
+        'full_us': full_us,
+        'incremental_us': incremental_us,
+        'speedup': full_us / incremental_us if incremental_us else 0.0,
+      }
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--size', choices=tuple(SIZES), default='large', help='synthetic resume size')
+  parser.add_argument('--repeat', type=int, default=200)
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  results = run(args.size, args.repeat, args.seed)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for name, stats in results.items():
+    print(
+      f"{name:>18}: full {stats['full_us']:8.1f} us  incremental {stats['incremental_us']:8.1f} us  "
+      f"x{stats['speedup']:.1f}  evidence recomputed {stats['evidence_recomputed']}/{stats['requirements']}"
+    )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,139 @@
+"""Response serialization cost for realistic ATS and match payloads.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_serialization --skills 40 --repeat 200
+
+For each payload it reports microseconds per response for:
+
+- ``fastapi_default``: FastAPI's response_model path (validate, dump to a
+  JSON-compatible dict, ``json.dumps`` in ``JSONResponse``)
+- ``legacy_match``: the same, with the old match explanation that pre-dumped
+  every requirement result via ``.dict()`` (match only)
+- ``model_json_response``: ``utils.responses.ModelJSONResponse``
+- ``orjson``: ``orjson.dumps(model.model_dump())`` when orjson is installed,
+  for reference
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models.ats import ATSScanRequest
+from models.match import MatchRequest
+from services.ats_analyzer import ATSAnalyzer
+from services.jd_parser import JobDescriptionParser
+from services.matching_service import score_match
+from services.resume_parser import ResumeParser
+from utils.responses import ModelJSONResponse
+from utils.skill_ontology_loader import suppress_unknown_skill_recording
+
+_SKILL_POOL = [
+  'Python', 'FastAPI', 'Django', 'Flask', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Kafka', 'RabbitMQ',
+  'Docker', 'Kubernetes', 'Terraform', 'AWS', 'GCP', 'Azure', 'React', 'TypeScript', 'JavaScript', 'Node.js',
+  'GraphQL', 'REST', 'gRPC', 'Airflow', 'Spark', 'Pandas', 'NumPy', 'PyTorch', 'TensorFlow', 'Scikit-learn',
+  'Go', 'Rust', 'Java', 'Kotlin', 'Scala', 'Elasticsearch', 'Prometheus', 'Grafana', 'Linux', 'Git',
+]
+
+
+def _documents(skills: int) -> Dict[str, str]:
+  pool = (_SKILL_POOL * (skills // len(_SKILL_POOL) + 1))[:skills]
+  required, preferred = pool[: skills * 2 // 3], pool[skills * 2 // 3:]
+  jd = (
+    f"Must have: {', '.join(required)}.\n"
+    f"Nice to have: {', '.join(preferred)}.\n"
+    "5+ years experience building distributed systems. Location: Remote."
+  )
+  bullets = '\n'.join(f'- Shipped {skill} services used by millions of users.' for skill in pool[::2])
+  resume = (
+    'Alex Example\nSummary\nSenior backend engineer.\nExperience\n'
+    f'Staff Engineer at Example Corp (2018 - Present)\n{bullets}\n'
+    f"Skills\n{', '.join(pool[::2])}\nEducation\nExample University, B.Sc. Computer Science, 2014\n"
+  )
+  return {'jd': jd, 'resume': resume}
+
+
+def _payloads(skills: int) -> Dict[str, Any]:
+  docs = _documents(skills)
+  resume_parser, jd_parser = ResumeParser(), JobDescriptionParser()
+  resume_parser._use_llm = jd_parser._use_llm = False
+  with suppress_unknown_skill_recording():
+    ats = ATSAnalyzer(resume_parser=resume_parser, jd_parser=jd_parser).scan(ATSScanRequest(
+      job_title='Senior Backend Engineer', job_description=docs['jd'], user_id='bench', resume_text=docs['resume']
+    ))
+    match = score_match(MatchRequest(resume_text=docs['resume'], job_summary=docs['jd'], include_trace=True))
+  legacy = match.model_copy(deep=True)
+  legacy.explanation['requirements'] = [res.model_dump() for res in legacy.explanation['requirements']]
+  return {'ats': ats, 'match': match, 'legacy_match': legacy}
+
+
+def _fastapi_default(field: Any, model: Any) -> bytes:
+  # serialize_response never awaits for async routes; drive it without an event loop.
+  coro = serialize_response(field=field, response_content=model)
+  try:
+    coro.send(None)
+  except StopIteration as done:
+    return JSONResponse(done.value).body
+  raise RuntimeError('serialize_response unexpectedly suspended')
+
+
+def _per_call_us(fn: Callable[[], Any], repeat: int) -> float:
+  fn()  # warm caches
+  started = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  return (time.perf_counter() - started) / repeat * 1e6
+
+
+def run(skills: int, repeat: int) -> Dict[str, Dict[str, float]]:
+  payloads = _payloads(skills)
+  try:
+    import orjson  # type: ignore
+  except ImportError:
+    orjson = None
+
+  results: Dict[str, Dict[str, float]] = {}
+  for name in ('ats', 'match'):
+    model = payloads[name]
+    # FastAPI builds the response field once per route.
+    field = create_model_field(name='Response', type_=type(model), mode='serialization')
+    cases: Dict[str, Callable[[], Any]] = {'fastapi_default': lambda m=model: _fastapi_default(field, m)}
+    if name == 'match':
+      cases['legacy_match'] = lambda m=payloads['legacy_match']: _fastapi_default(field, m)
+    cases['model_json_response'] = lambda m=model: ModelJSONResponse(m).body
+    if orjson is not None:
+      cases['orjson'] = lambda m=model: orjson.dumps(m.model_dump())
+    stats = {case: _per_call_us(fn, repeat) for case, fn in cases.items()}
+    stats['bytes'] = len(ModelJSONResponse(model).body)
+    results[name] = stats
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--skills', type=int, default=40, help='skills mentioned in the synthetic JD')
+  parser.add_argument('--repeat', type=int, default=200)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  results = run(args.skills, args.repeat)
+  if args.json:
+    print(json.dumps({'skills': args.skills, 'repeat': args.repeat, 'results': results}, indent=2))
+    return
+  for payload, stats in results.items():
+    baseline = stats['fastapi_default']
+    print(f"{payload} ({int(stats['bytes']):,} bytes)")
+    for case, micros in stats.items():
+      if case == 'bytes':
+        continue
+      print(f'  {case:>20}: {micros:>9.1f} us  x{baseline / micros:.1f}')
+
+
+if __name__ == '__main__':
+  main()
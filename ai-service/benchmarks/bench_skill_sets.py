@@ -0,0 +1,113 @@
+"""Skill overlap for one candidate against many jobs: Python sets vs. skill id arrays.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.bench_skill_sets
+  python -m benchmarks.bench_skill_sets --jobs 1000,10000,100000 --json
+
+Each time is the best of ``--repeat`` runs:
+
+- ``per_pair_ms``: ``_skill_overlap`` + ``_nice_to_have_overlap`` per job,
+  which rebuilds the candidate's set every time (the previous scoring loop)
+- ``encode_ms``: turning the job skill lists into ``SkillSets``, which a
+  stored catalog pays once
+- ``count_ms``: coverage from encoded rows (mask gather + ``bincount``)
+- ``recommend_ms``: the whole ``recommend_jobs`` call
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+import numpy as np  # noqa: E402
+
+from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest  # noqa: E402
+from services.recommendation_service import _nice_to_have_overlap, _skill_overlap, recommend_jobs  # noqa: E402
+from utils.skill_sets import get_skill_vocabulary  # noqa: E402
+
+_SKILLS = [f'Skill {idx}' for idx in range(2000)]
+
+
+def _best_of_ms(fn: Callable[[], object], repeat: int) -> float:
+  best = float('inf')
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1e3
+
+
+def run(sizes: Sequence[int], repeat: int, seed: int) -> Dict[int, Dict[str, float]]:
+  rng = random.Random(seed)
+  candidate = CandidateProfile(skills=rng.sample(_SKILLS, 25), preferred_locations=['remote'])
+  vocabulary = get_skill_vocabulary()
+  results: Dict[int, Dict[str, float]] = {}
+  for size in sizes:
+    jobs = [
+      JobRecommendationInput(
+        job_id=f'job-{idx}',
+        title='Engineer',
+        required_skills=rng.sample(_SKILLS, rng.randint(3, 12)),
+        nice_to_have_skills=rng.sample(_SKILLS, rng.randint(0, 4)),
+        location='remote'
+      )
+      for idx in range(size)
+    ]
+
+    def per_pair() -> None:
+      for job in jobs:
+        _skill_overlap(candidate.skills, job.required_skills)
+        _nice_to_have_overlap(candidate.skills, job.nice_to_have_skills)
+
+    def encode():
+      return vocabulary.encode(
+        [job.required_skills for job in jobs], [job.nice_to_have_skills for job in jobs], [candidate.skills]
+      )
+
+    required, nice, own = encode()
+
+    def count() -> None:
+      members = own.mask()
+      required.count_in(members) / np.maximum(required.sizes, 1)
+      nice.count_in(members) / np.maximum(nice.sizes, 1)
+
+    request = RecommendationRequest(candidate=candidate, jobs=jobs)
+    stats = {
+      'per_pair_ms': _best_of_ms(per_pair, repeat),
+      'encode_ms': _best_of_ms(encode, repeat),
+      'count_ms': _best_of_ms(count, repeat),
+      'recommend_ms': _best_of_ms(lambda: recommend_jobs(request), repeat),
+    }
+    stats['count_speedup'] = stats['per_pair_ms'] / stats['count_ms']
+    results[size] = stats
+  return results
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--jobs', default='1000,10000,100000', help='comma-separated job counts')
+  parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', action='store_true', help='print machine-readable results')
+  args = parser.parse_args()
+
+  sizes = sorted(int(part) for part in args.jobs.split(',') if part.strip())
+  results = run(sizes, args.repeat, args.seed)
+  if args.json:
+    print(json.dumps(results, indent=2))
+    return
+  for size, stats in results.items():
+    print(
+      f"jobs={size:<7} per_pair {stats['per_pair_ms']:8.1f} ms  encode {stats['encode_ms']:7.1f} ms  "
+      f"count {stats['count_ms']:6.2f} ms (x{stats['count_speedup']:.0f})  recommend {stats['recommend_ms']:8.1f} ms"
+    )
+
+
+if __name__ == '__main__':
+  main()
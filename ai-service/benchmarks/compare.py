@@ -0,0 +1,83 @@
+"""Diff two ``benchmarks.run_suite`` JSON reports and flag regressions.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.compare base.json head.json --threshold 0.10
+
+Rows are matched on (pipeline, size, ontology, format). A row regresses when
+p50 or p95 latency grows, or ops/sec drops, by more than ``--threshold``
+(relative), or when peak memory grows by more than ``--memory-threshold``.
+The exit status is 1 if any row regressed, so CI can gate on it.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+Key = Tuple[str, str, int, Any]
+
+
+def _rows(path: str) -> Dict[Key, Dict[str, Any]]:
+  report = json.loads(Path(path).read_text(encoding='utf-8'))
+  return {(r['pipeline'], r['size'], r['ontology'], r.get('format')): r for r in report['results']}
+
+
+def _change(base: float, head: float) -> float:
+  return (head - base) / base if base else 0.0
+
+
+def compare(
+  base: Dict[Key, Dict[str, Any]],
+  head: Dict[Key, Dict[str, Any]],
+  threshold: float,
+  memory_threshold: float
+) -> List[Dict[str, Any]]:
+  rows = []
+  for key in sorted(set(base) & set(head), key=str):
+    old, new = base[key], head[key]
+    changes = {
+      'p50_ms': _change(old['p50_ms'], new['p50_ms']),
+      'p95_ms': _change(old['p95_ms'], new['p95_ms']),
+      'ops_per_sec': _change(old['ops_per_sec'], new['ops_per_sec']),
+      'peak_kib': _change(old.get('peak_kib', 0.0), new.get('peak_kib', 0.0)),
+    }
+    regressed = [
+      metric for metric, worse in (
+        ('p50_ms', changes['p50_ms'] > threshold),
+        ('p95_ms', changes['p95_ms'] > threshold),
+        ('ops_per_sec', changes['ops_per_sec'] < -threshold),
+        ('peak_kib', changes['peak_kib'] > memory_threshold),
+      ) if worse
+    ]
+    rows.append({'key': key, 'changes': changes, 'regressed': regressed})
+  return rows
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('base')
+  parser.add_argument('head')
+  parser.add_argument('--threshold', type=float, default=0.10, help='relative latency/throughput tolerance')
+  parser.add_argument('--memory-threshold', type=float, default=0.25, help='relative peak memory tolerance')
+  args = parser.parse_args()
+
+  base, head = _rows(args.base), _rows(args.head)
+  rows = compare(base, head, args.threshold, args.memory_threshold)
+  for key in sorted(set(base) ^ set(head), key=str):
+    print(f"{'only in base' if key in base else 'only in head'}: {key}")
+  for row in rows:
+    pipeline, size, ontology, fmt = row['key']
+    label = f"{pipeline}[{size}, ontology={ontology}{', ' + fmt if fmt else ''}]"
+    deltas = '  '.join(f'{metric} {value:+.1%}' for metric, value in row['changes'].items())
+    flag = f"  REGRESSION ({', '.join(row['regressed'])})" if row['regressed'] else ''
+    print(f'{label:<48} {deltas}{flag}')
+  regressions = sum(1 for row in rows if row['regressed'])
+  print(f'{regressions} regression(s) across {len(rows)} comparable rows')
+  sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+  main()
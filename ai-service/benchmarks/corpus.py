@@ -0,0 +1,249 @@
+"""Deterministic synthetic resumes, job descriptions and ontologies for benchmarks.
+
+Everything is generated from a seed, so two runs (or two releases) see the
+same inputs. Documents come in three sizes and can be written as txt, PDF or
+DOCX. PDFs are produced by a small built-in writer, so no extra dependency is
+needed; pypdf reads them back like any text PDF.
+
+Run from ``ai-service/`` to inspect a corpus on disk::
+
+  python -m benchmarks.corpus --out /tmp/corpus --formats txt,pdf,docx
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+FORMATS = ('txt', 'pdf', 'docx')
+
+# (display name, category, aliases)
+SKILLS: Sequence[tuple] = (
+  ('Python', 'language', ['python', 'py']), ('JavaScript', 'language', ['javascript', 'js']),
+  ('TypeScript', 'language', ['typescript', 'ts']), ('Go', 'language', ['golang']),
+  ('Java', 'language', ['java']), ('Kotlin', 'language', ['kotlin']), ('Rust', 'language', ['rust']),
+  ('Scala', 'language', ['scala']), ('SQL', 'language', ['sql']), ('Node.js', 'runtime', ['nodejs', 'node js']),
+  ('FastAPI', 'framework', ['fastapi']), ('Django', 'framework', ['django']), ('Flask', 'framework', ['flask']),
+  ('Express', 'framework', ['expressjs', 'express.js']), ('React', 'framework', ['reactjs', 'react.js']),
+  ('Spring Boot', 'framework', ['spring boot', 'springboot']), ('PostgreSQL', 'database', ['postgres', 'postgresql']),
+  ('MySQL', 'database', ['mysql']), ('MongoDB', 'database', ['mongodb', 'mongo']), ('Redis', 'database', ['redis']),
+  ('Elasticsearch', 'database', ['elasticsearch', 'elastic search']), ('Kafka', 'messaging', ['kafka', 'apache kafka']),
+  ('RabbitMQ', 'messaging', ['rabbitmq']), ('Docker', 'devops', ['docker']), ('Kubernetes', 'devops', ['kubernetes', 'k8s']),
+  ('Terraform', 'devops', ['terraform']), ('AWS', 'cloud', ['aws', 'amazon web services']), ('GCP', 'cloud', ['gcp']),
+  ('Azure', 'cloud', ['azure']), ('GraphQL', 'api', ['graphql']), ('REST', 'api', ['rest', 'rest api', 'restful']),
+  ('gRPC', 'api', ['grpc']), ('Airflow', 'data', ['airflow']), ('Spark', 'data', ['spark', 'pyspark']),
+  ('Pandas', 'data', ['pandas']), ('NumPy', 'data', ['numpy']), ('PyTorch', 'ml', ['pytorch', 'torch']),
+  ('TensorFlow', 'ml', ['tensorflow']), ('Scikit-learn', 'ml', ['scikit-learn', 'sklearn']),
+  ('Prometheus', 'observability', ['prometheus']), ('Grafana', 'observability', ['grafana']),
+  ('Linux', 'platform', ['linux']), ('Git', 'tool', ['git']), ('JWT', 'security', ['jwt', 'json web token']),
+  ('CI/CD', 'devops', ['ci/cd', 'cicd']),
+)
+
+SIZES: Dict[str, Dict[str, int]] = {
+  'small': {'skills': 8, 'roles': 1, 'bullets': 3, 'jd_skills': 6},
+  'medium': {'skills': 18, 'roles': 3, 'bullets': 5, 'jd_skills': 12},
+  'large': {'skills': 35, 'roles': 6, 'bullets': 8, 'jd_skills': 24},
+}
+
+_FIRST = ('Alex', 'Sam', 'Priya', 'Wei', 'Maria', 'Omar', 'Lena', 'Diego', 'Aisha', 'Jonas')
+_LAST = ('Rivera', 'Chen', 'Patel', 'Okafor', 'Novak', 'Silva', 'Haddad', 'Kim', 'Larsen', 'Mensah')
+_COMPANIES = ('Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Tech', 'Vandelay')
+_ROLES = ('Software Engineer', 'Backend Engineer', 'Senior Software Engineer', 'Data Engineer', 'Platform Engineer')
+_TITLES = ('Backend Engineer', 'Senior Python Developer', 'Full Stack Engineer', 'Data Platform Engineer')
+_CITIES = ('Berlin', 'Austin', 'Bangalore', 'Toronto', 'London', 'Remote')
+_VERBS = ('Built', 'Designed', 'Scaled', 'Migrated', 'Optimized', 'Led development of', 'Automated')
+_OBJECTS = (
+  'a payments API', 'the search indexing pipeline', 'internal developer tooling', 'a recommendation service',
+  'event-driven order processing', 'the reporting data warehouse', 'multi-tenant auth', 'a resume parsing service',
+)
+_OUTCOMES = (
+  'cutting p95 latency by 40%', 'serving 2M requests per day', 'reducing infra cost by 25%',
+  'improving uptime to 99.95%', 'halving deploy time', 'supporting 30 engineering teams',
+)
+_UNIVERSITIES = ('State University', 'Institute of Technology', 'City College', 'National University')
+
+
+@dataclass
+class Document:
+  kind: str  # 'resume' | 'jd'
+  size: str
+  title: str
+  text: str
+  skills: List[str]
+
+
+def _pick(rng: random.Random, pool: Sequence, k: int) -> List:
+  return rng.sample(list(pool), min(k, len(pool)))
+
+
+def _mention(rng: random.Random, skill: tuple) -> str:
+  # Mix display names and aliases so normalization does real work.
+  return rng.choice([skill[0]] + list(skill[2]))
+
+
+def generate_resume(rng: random.Random, size: str) -> Document:
+  spec = SIZES[size]
+  skills = _pick(rng, SKILLS, spec['skills'])
+  name = f'{rng.choice(_FIRST)} {rng.choice(_LAST)}'
+  lines = [name, f'{rng.choice(_CITIES)} | {name.split()[0].lower()}@example.com', '', 'Summary']
+  lines.append(
+    f'{rng.choice(_ROLES)} with {rng.randint(2, 15)} years of experience in '
+    f"{', '.join(s[0] for s in skills[:3])}."
+  )
+  lines += ['', 'Experience']
+  year = 2024
+  for _ in range(spec['roles']):
+    start = year - rng.randint(1, 4)
+    lines.append(f'{rng.choice(_ROLES)} at {rng.choice(_COMPANIES)} ({start} - {year})')
+    for _ in range(spec['bullets']):
+      used = _pick(rng, skills, 2)
+      lines.append(
+        f'- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} with {_mention(rng, used[0])} and '
+        f'{_mention(rng, used[-1])}, {rng.choice(_OUTCOMES)}.'
+      )
+    year = start
+  lines += ['', 'Skills', ', '.join(_mention(rng, s) for s in skills), '', 'Education']
+  lines.append(f'{rng.choice(_UNIVERSITIES)}, B.Sc. Computer Science, {year - rng.randint(0, 3)}')
+  return Document('resume', size, name, '\n'.join(lines), [s[0] for s in skills])
+
+
+def generate_jd(rng: random.Random, size: str) -> Document:
+  spec = SIZES[size]
+  skills = _pick(rng, SKILLS, spec['jd_skills'])
+  split = max(1, len(skills) * 2 // 3)
+  required, preferred = skills[:split], skills[split:]
+  title = rng.choice(_TITLES)
+  lines = [
+    title,
+    f'Location: {rng.choice(_CITIES)}',
+    f'We are hiring a {title} to work on {rng.choice(_OBJECTS)} and {rng.choice(_OBJECTS)}.',
+    '',
+    'Requirements:',
+  ]
+  lines += [f'- {rng.randint(2, 8)}+ years experience with {_mention(rng, s)}' for s in required[:3]]
+  lines.append(f"Must have: {', '.join(_mention(rng, s) for s in required)}.")
+  if preferred:
+    lines.append(f"Nice to have: {', '.join(_mention(rng, s) for s in preferred)}.")
+  lines += ['', 'Responsibilities:']
+  lines += [f'- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}.' for _ in range(spec['bullets'])]
+  return Document('jd', size, title, '\n'.join(lines), [s[0] for s in skills])
+
+
+def build_corpus(seed: int = 7, sizes: Sequence[str] = tuple(SIZES), per_size: int = 5) -> Dict[str, List[tuple]]:
+  """``{size: [(resume, jd), ...]}``, identical for identical arguments."""
+  rng = random.Random(seed)
+  return {size: [(generate_resume(rng, size), generate_jd(rng, size)) for _ in range(per_size)] for size in sizes}
+
+
+def build_ontology(entries: int, seed: int = 7) -> List[dict]:
+  """Ontology with the real skill list first, padded with synthetic skills up to ``entries``."""
+  rng = random.Random(seed)
+  rows = [
+    {'canonicalId': name.lower().replace(' ', '-'), 'displayName': name, 'aliases': list(aliases), 'category': category}
+    for name, category, aliases in SKILLS[:entries]
+  ]
+  for idx in range(len(rows), entries):
+    stem = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+    name = f'{stem.capitalize()}{idx}'
+    rows.append({
+      'canonicalId': f'synthetic-{idx}',
+      'displayName': name,
+      'aliases': [name.lower(), f'{stem} {idx}'],
+      'category': rng.choice(('language', 'framework', 'database', 'tool', 'cloud')),
+    })
+  return rows
+
+
+def write_ontology(path: Path, entries: int, seed: int = 7) -> Path:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(build_ontology(entries, seed)), encoding='utf-8')
+  return path
+
+
+def _pdf_escape(line: str) -> str:
+  return line.encode('latin-1', 'replace').decode('latin-1').replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: Path, text: str, lines_per_page: int = 60) -> Path:
+  """Write ``text`` as a plain Helvetica text PDF (one text line per source line)."""
+  lines = text.splitlines() or ['']
+  pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+  objects: List[bytes] = [b'', b'', b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+  page_ids = []
+  for page in pages:
+    body = ['BT', '/F1 10 Tf', '12 TL', '50 760 Td']
+    body += [f'({_pdf_escape(line)}) Tj T*' for line in page]
+    body.append('ET')
+    stream = '\n'.join(body).encode('latin-1')
+    objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    content_id = len(objects)
+    objects.append(
+      b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> '
+      b'/Contents %d 0 R >>' % content_id
+    )
+    page_ids.append(len(objects))
+  objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+  objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+    ' '.join(f'{pid} 0 R' for pid in page_ids).encode('ascii'), len(page_ids)
+  )
+
+  out = bytearray(b'%PDF-1.4\n')
+  offsets = []
+  for number, obj in enumerate(objects, start=1):
+    offsets.append(len(out))
+    out += b'%d 0 obj\n' % number + obj + b'\nendobj\n'
+  xref = len(out)
+  out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+  out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+  out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+  path.write_bytes(bytes(out))
+  return path
+
+
+def write_docx(path: Path, text: str) -> Path:
+  from docx import Document as DocxDocument  # type: ignore
+
+  document = DocxDocument()
+  for line in text.splitlines():
+    document.add_paragraph(line)
+  document.save(str(path))
+  return path
+
+
+def write_document(directory: Path, name: str, text: str, fmt: str) -> Path:
+  directory.mkdir(parents=True, exist_ok=True)
+  path = directory / f'{name}.{fmt}'
+  if fmt == 'pdf':
+    return write_pdf(path, text)
+  if fmt == 'docx':
+    return write_docx(path, text)
+  path.write_text(text, encoding='utf-8')
+  return path
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--out', required=True, help='directory to write the corpus into')
+  parser.add_argument('--formats', default='txt', help=f"comma-separated subset of {','.join(FORMATS)}")
+  parser.add_argument('--per-size', type=int, default=5)
+  parser.add_argument('--seed', type=int, default=7)
+  args = parser.parse_args()
+
+  out = Path(args.out)
+  formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+  count = 0
+  for size, pairs in build_corpus(args.seed, per_size=args.per_size).items():
+    for idx, (resume, jd) in enumerate(pairs):
+      for fmt in formats:
+        write_document(out / size, f'resume-{idx}', resume.text, fmt)
+        count += 1
+      write_document(out / size, f'jd-{idx}', jd.text, 'txt')
+      count += 1
+  print(f'wrote {count} files to {out}')
+
+
+if __name__ == '__main__':
+  main()
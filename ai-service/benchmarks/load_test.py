@@ -0,0 +1,357 @@
+"""Open-loop load test of the HTTP API with a mixed traffic profile.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.load_test --rps 20 --duration 30
+  python -m benchmarks.load_test --ramp 5,10,20,40,80 --duration 20 --json load.json
+  python -m benchmarks.load_test --spawn 4 --ramp 10,20,40   # uvicorn main:app --workers 4
+  python -m benchmarks.load_test --url http://127.0.0.1:8000 --rps 30
+
+Requests are issued at the target rate regardless of how fast responses come
+back (open loop), following ``--arrival`` (Poisson by default). Each request
+picks a route according to ``--mix``. Arrivals are dropped on the client and
+counted when ``--max-in-flight`` requests are already outstanding, so an
+overloaded server shows up as drops, 503s and latency rather than a silently
+lower rate.
+
+Targets:
+
+- default: the ASGI app in this process, lifespan included. Client and server
+  share one event loop and core, so treat results as relative.
+- ``--spawn N``: starts ``uvicorn main:app --workers N`` on a free local port
+  with the current environment (``AI_CPU_WORKERS``, ``AI_IO_WORKERS``, ...).
+- ``--url``: an already running service on this machine. ``/ai/parse-resume``
+  reads files from a temporary directory here.
+
+Payloads come from ``benchmarks.corpus`` and providers default to mock mode.
+
+With ``--ramp`` each rate runs for ``--duration`` seconds. A step is saturated
+when achieved throughput falls below 90% of target, the error rate (non-2xx,
+transport errors and drops) exceeds ``--max-error-rate``, or p95 exceeds
+``--slo-ms``. The first saturated rate is reported as the saturation point and
+the ramp stops there unless ``--full-ramp`` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+import httpx  # noqa: E402
+
+from benchmarks.corpus import SIZES, build_corpus, write_document  # noqa: E402
+from benchmarks.run_suite import percentile  # noqa: E402
+from utils.embeddings_client import get_embeddings_client  # noqa: E402
+
+ROUTES = {
+  'parse_resume': '/ai/parse-resume',
+  'parse_jd': '/ai/parse-jd',
+  'match': '/ai/match',
+  'recommend': '/ai/recommend',
+  'ats_scan': '/ai/ats-scan',
+}
+DEFAULT_MIX = 'parse_resume=1,parse_jd=2,match=4,recommend=2,ats_scan=1'
+RECOMMEND_JOBS = 50
+SATURATION_THROUGHPUT = 0.9
+
+
+@dataclass
+class RouteStats:
+  latencies_ms: List[float] = field(default_factory=list)
+  statuses: Counter = field(default_factory=Counter)
+  transport_errors: int = 0
+  dropped: int = 0
+
+  def summary(self) -> Dict[str, Any]:
+    ordered = sorted(self.latencies_ms)
+    sent = sum(self.statuses.values()) + self.transport_errors + self.dropped
+    ok = sum(count for code, count in self.statuses.items() if 200 <= code < 300)
+    return {
+      'sent': sent,
+      'ok': ok,
+      'error_rate': (sent - ok) / sent if sent else 0.0,
+      'rejected_503': self.statuses.get(503, 0),
+      'transport_errors': self.transport_errors,
+      'dropped': self.dropped,
+      'statuses': {str(code): count for code, count in sorted(self.statuses.items())},
+      'p50_ms': percentile(ordered, 50),
+      'p95_ms': percentile(ordered, 95),
+      'p99_ms': percentile(ordered, 99),
+      'max_ms': ordered[-1] if ordered else 0.0,
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+  weights: Dict[str, float] = {}
+  for part in value.split(','):
+    if not part.strip():
+      continue
+    name, _, weight = part.partition('=')
+    name = name.strip()
+    if name not in ROUTES:
+      raise ValueError(f'unknown route {name!r}; expected one of {", ".join(ROUTES)}')
+    weights[name] = float(weight or 1)
+  if not any(weight > 0 for weight in weights.values()):
+    raise ValueError('traffic mix needs at least one positive weight')
+  return weights
+
+
+def build_payloads(seed: int, size: str, per_size: int, workdir: Path) -> Dict[str, List[dict]]:
+  """Request bodies per route, built from the synthetic benchmark corpus."""
+  pairs = build_corpus(seed, [size], per_size)[size]
+  embed = get_embeddings_client()
+  jds = [jd for _, jd in pairs]
+  jd_vectors = embed.embed([jd.text for jd in jds])
+  jobs = [
+    {
+      'job_id': f'job-{idx}',
+      'title': jds[idx % len(jds)].title,
+      'required_skills': jds[idx % len(jds)].skills,
+      'embeddings': jd_vectors[idx % len(jds)],
+    }
+    for idx in range(RECOMMEND_JOBS)
+  ]
+  payloads: Dict[str, List[dict]] = {name: [] for name in ROUTES}
+  for idx, (resume, jd) in enumerate(pairs):
+    path = write_document(workdir, f'resume-{idx}', resume.text, ('txt', 'pdf', 'docx')[idx % 3])
+    payloads['parse_resume'].append({'file_path': str(path), 'file_name': path.name, 'user_id': f'load-{idx}'})
+    payloads['parse_jd'].append({'job_title': jd.title, 'job_description': jd.text})
+    payloads['match'].append({'resume_text': resume.text, 'job_summary': jd.text})
+    payloads['recommend'].append({
+      'candidate': {'id': f'load-{idx}', 'skills': resume.skills, 'embeddings': embed.embed([resume.text])[0]},
+      'jobs': jobs,
+    })
+    payloads['ats_scan'].append({
+      'job_title': jd.title, 'job_description': jd.text, 'user_id': f'load-{idx}', 'resume_text': resume.text
+    })
+  return payloads
+
+
+async def run_step(
+  client: httpx.AsyncClient,
+  payloads: Dict[str, List[dict]],
+  weights: Dict[str, float],
+  rps: float,
+  duration: float,
+  max_in_flight: int,
+  arrival: str,
+  rng: random.Random
+) -> Dict[str, Any]:
+  names = list(weights)
+  route_weights = [weights[name] for name in names]
+  stats = {name: RouteStats() for name in names}
+  pending: set = set()
+  peak_in_flight = 0
+
+  async def fire(name: str, body: dict) -> None:
+    started = time.perf_counter()
+    try:
+      response = await client.post(ROUTES[name], json=body)
+    except httpx.HTTPError:
+      stats[name].transport_errors += 1
+      return
+    stats[name].latencies_ms.append((time.perf_counter() - started) * 1000)
+    stats[name].statuses[response.status_code] += 1
+
+  loop = asyncio.get_running_loop()
+  started = loop.time()
+  next_at = started
+  while next_at - started < duration:
+    delay = next_at - loop.time()
+    if delay > 0:
+      await asyncio.sleep(delay)
+    name = rng.choices(names, weights=route_weights)[0]
+    if len(pending) >= max_in_flight:
+      stats[name].dropped += 1
+    else:
+      task = asyncio.ensure_future(fire(name, rng.choice(payloads[name])))
+      pending.add(task)
+      task.add_done_callback(pending.discard)
+      peak_in_flight = max(peak_in_flight, len(pending))
+    next_at += rng.expovariate(rps) if arrival == 'poisson' else 1 / rps
+  if pending:
+    await asyncio.gather(*pending)
+  elapsed = loop.time() - started
+
+  total = RouteStats()
+  for route in stats.values():
+    total.latencies_ms.extend(route.latencies_ms)
+    total.statuses.update(route.statuses)
+    total.transport_errors += route.transport_errors
+    total.dropped += route.dropped
+  overall = total.summary()
+  return {
+    'target_rps': rps,
+    'achieved_rps': overall['ok'] / elapsed if elapsed else 0.0,
+    'elapsed_s': elapsed,
+    'peak_in_flight': peak_in_flight,
+    'overall': overall,
+    'routes': {name: route.summary() for name, route in stats.items()},
+  }
+
+
+def is_saturated(step: Dict[str, Any], max_error_rate: float, slo_ms: Optional[float]) -> bool:
+  overall = step['overall']
+  return (
+    step['achieved_rps'] < SATURATION_THROUGHPUT * step['target_rps']
+    or overall['error_rate'] > max_error_rate
+    or (slo_ms is not None and overall['p95_ms'] > slo_ms)
+  )
+
+
+def _free_port() -> int:
+  with socket.socket() as sock:
+    sock.bind(('127.0.0.1', 0))
+    return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def _target(url: Optional[str], spawn: int, timeout: float, max_in_flight: int) -> AsyncIterator[httpx.AsyncClient]:
+  limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+  if url is None and not spawn:
+    import main  # the app under test, imported late so --url runs do not load it
+
+    async with main.app.router.lifespan_context(main.app):
+      transport = httpx.ASGITransport(app=main.app)
+      async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=timeout) as client:
+        yield client
+    return
+
+  process = None
+  if spawn:
+    port = _free_port()
+    url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen(
+      [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--workers', str(spawn), '--log-level', 'warning'],
+      cwd=Path(__file__).resolve().parents[1]
+    )
+  try:
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+      await _wait_ready(client, process)
+      yield client
+  finally:
+    if process is not None:
+      process.terminate()
+      process.wait(timeout=30)
+
+
+async def _wait_ready(client: httpx.AsyncClient, process: Optional[subprocess.Popen], timeout: float = 180.0) -> None:
+  deadline = time.monotonic() + timeout
+  while time.monotonic() < deadline:
+    if process is not None and process.poll() is not None:
+      raise RuntimeError(f'uvicorn exited with status {process.returncode}')
+    try:
+      if (await client.get('/health')).status_code == 200:
+        return
+    except httpx.HTTPError:
+      pass
+    await asyncio.sleep(0.5)
+  raise RuntimeError('service did not become ready in time')
+
+
+def _print_step(step: Dict[str, Any], saturated: bool) -> None:
+  overall = step['overall']
+  print(
+    f"target={step['target_rps']:.1f} rps achieved={step['achieved_rps']:.1f} rps "
+    f"p50={overall['p50_ms']:.1f}ms p95={overall['p95_ms']:.1f}ms p99={overall['p99_ms']:.1f}ms "
+    f"errors={overall['error_rate']:.1%} peak_in_flight={step['peak_in_flight']}"
+    f"{'  SATURATED' if saturated else ''}",
+    flush=True
+  )
+  for name, route in step['routes'].items():
+    print(
+      f"  {name:>12} sent={route['sent']:<5} p50={route['p50_ms']:>8.1f}ms p95={route['p95_ms']:>8.1f}ms "
+      f"p99={route['p99_ms']:>8.1f}ms errors={route['error_rate']:.1%} "
+      f"503={route['rejected_503']} dropped={route['dropped']}",
+      flush=True
+    )
+
+
+async def run(args: argparse.Namespace, rates: Sequence[float], weights: Dict[str, float], workdir: Path) -> Dict[str, Any]:
+  payloads = build_payloads(args.seed, args.size, args.per_size, workdir)
+  # Keep skills seen by an in-process or spawned service out of data/unknown_skills.json.
+  os.environ.setdefault('UNKNOWN_SKILLS_PATH', str(workdir / 'unknown_skills.json'))
+  rng = random.Random(args.seed)
+  steps: List[Dict[str, Any]] = []
+  saturation_rps = None
+  async with _target(args.url, args.spawn, args.timeout, args.max_in_flight) as client:
+    for rps in rates:
+      step = await run_step(client, payloads, weights, rps, args.duration, args.max_in_flight, args.arrival, rng)
+      saturated = is_saturated(step, args.max_error_rate, args.slo_ms)
+      step['saturated'] = saturated
+      steps.append(step)
+      _print_step(step, saturated)
+      if saturated and saturation_rps is None:
+        saturation_rps = rps
+        if not args.full_ramp:
+          break
+  return {
+    'meta': {
+      'target': args.url or (f'uvicorn --workers {args.spawn}' if args.spawn else 'in-process'),
+      'mix': weights,
+      'size': args.size,
+      'arrival': args.arrival,
+      'duration_s': args.duration,
+      'max_in_flight': args.max_in_flight,
+      'seed': args.seed,
+      'env': {key: value for key, value in os.environ.items() if key.startswith('AI_')},
+      'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    },
+    'steps': steps,
+    'saturation_rps': saturation_rps,
+  }
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  target = parser.add_mutually_exclusive_group()
+  target.add_argument('--url', help='base URL of a running service')
+  target.add_argument('--spawn', type=int, default=0, metavar='WORKERS', help='start uvicorn with this many workers')
+  parser.add_argument('--mix', default=DEFAULT_MIX, help='route=weight pairs')
+  parser.add_argument('--rps', type=float, default=10.0)
+  parser.add_argument('--ramp', help='comma-separated request rates to step through; overrides --rps')
+  parser.add_argument('--duration', type=float, default=30.0, help='seconds per rate')
+  parser.add_argument('--arrival', choices=('poisson', 'uniform'), default='poisson')
+  parser.add_argument('--max-in-flight', type=int, default=256)
+  parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout in seconds')
+  parser.add_argument('--max-error-rate', type=float, default=0.01)
+  parser.add_argument('--slo-ms', type=float, help='p95 latency objective for the saturation check')
+  parser.add_argument('--full-ramp', action='store_true', help='keep ramping after the first saturated rate')
+  parser.add_argument('--size', choices=tuple(SIZES), default='medium', help='synthetic document size')
+  parser.add_argument('--per-size', type=int, default=8, help='distinct documents per route')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', help='write results to this file')
+  args = parser.parse_args()
+
+  try:
+    weights = parse_mix(args.mix)
+  except ValueError as exc:
+    parser.error(str(exc))
+  rates = [float(rate) for rate in args.ramp.split(',')] if args.ramp else [args.rps]
+  with tempfile.TemporaryDirectory(prefix='ai-load-') as workdir:
+    report = asyncio.run(run(args, rates, weights, Path(workdir)))
+  if report['saturation_rps'] is not None:
+    print(f"saturation point: {report['saturation_rps']:.1f} rps")
+  else:
+    print('no saturation within the tested rates')
+  if args.json:
+    Path(args.json).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'wrote {args.json}')
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,259 @@
+"""Pipeline throughput, latency percentiles and peak memory on a synthetic corpus.
+
+Run from ``ai-service/``::
+
+  python -m benchmarks.run_suite --json results.json
+  python -m benchmarks.run_suite --pipelines score_match,ats_scan --sizes large --ontology 45,5000
+  python -m benchmarks.compare base.json results.json
+
+Every combination of pipeline x document size x ontology size is run
+``--iterations`` times over the corpus from ``benchmarks.corpus``.
+``parse_resume`` is run once per file format. Each row reports:
+
+- ``ops_per_sec`` and ``p50_ms`` / ``p95_ms`` / ``p99_ms`` from per-call
+  ``perf_counter_ns`` timings
+- ``peak_kib``: the tracemalloc peak above baseline over a separate, shorter
+  pass, so tracing overhead does not skew the timings
+
+Providers run in mock mode and unknown-skill recording is suppressed, so the
+suite is offline and leaves ``data/`` untouched. The embedding cache stays
+on, as in production. After the first pass repeated texts hit it.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+os.environ.setdefault('AI_PROVIDER', 'mock')
+
+from benchmarks.corpus import FORMATS, SIZES, build_corpus, write_document, write_ontology  # noqa: E402
+from models.ats import ATSScanRequest  # noqa: E402
+from models.job import JobDescriptionRequest  # noqa: E402
+from models.match import MatchRequest  # noqa: E402
+from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest  # noqa: E402
+from models.resume import ResumeParseRequest  # noqa: E402
+from services.ats_analyzer import ATSAnalyzer  # noqa: E402
+from services.jd_parser import JobDescriptionParser  # noqa: E402
+from services.matching_service import score_match  # noqa: E402
+from services.recommendation_service import recommend_jobs  # noqa: E402
+from services.resume_parser import ResumeParser  # noqa: E402
+from services.skill_utils import extract_skills  # noqa: E402
+from utils.embeddings_client import get_embeddings_client  # noqa: E402
+from utils.skill_ontology_loader import load_skill_ontology, suppress_unknown_skill_recording  # noqa: E402
+
+PIPELINES = ('extract_skills', 'parse_resume', 'parse_jd', 'score_match', 'recommend_jobs', 'ats_scan')
+RECOMMEND_JOBS = 50
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+  """Nearest-rank percentile of an ascending sequence."""
+  if not sorted_values:
+    return 0.0
+  rank = min(max(1, math.ceil(pct / 100 * len(sorted_values))), len(sorted_values))
+  return sorted_values[rank - 1]
+
+
+def summarize(latencies_ns: Sequence[int]) -> Dict[str, float]:
+  ordered = sorted(ns / 1e6 for ns in latencies_ns)
+  total_s = sum(ordered) / 1000
+  return {
+    'iterations': len(ordered),
+    'ops_per_sec': len(ordered) / total_s if total_s else 0.0,
+    'p50_ms': percentile(ordered, 50),
+    'p95_ms': percentile(ordered, 95),
+    'p99_ms': percentile(ordered, 99),
+    'mean_ms': sum(ordered) / len(ordered) if ordered else 0.0,
+  }
+
+
+def _peak_kib(calls: Sequence[Callable[[], Any]]) -> float:
+  gc.collect()
+  tracemalloc.start()
+  try:
+    baseline = tracemalloc.get_traced_memory()[0]
+    for call in calls:
+      call()
+    peak = tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+  return max(0, peak - baseline) / 1024
+
+
+def _offline_parsers():
+  resume_parser, jd_parser = ResumeParser(), JobDescriptionParser()
+  resume_parser._use_llm = jd_parser._use_llm = False
+  return resume_parser, jd_parser
+
+
+def _recommend_payload(pairs, jd_parser) -> RecommendationRequest:
+  embed = get_embeddings_client()
+  resume = pairs[0][0]
+  jobs = []
+  for idx in range(RECOMMEND_JOBS):
+    jd = pairs[idx % len(pairs)][1]
+    parsed = jd_parser.parse(JobDescriptionRequest(job_title=jd.title, job_description=jd.text))
+    jobs.append(JobRecommendationInput(
+      job_id=f'job-{idx}', title=jd.title, required_skills=parsed.required_skills,
+      nice_to_have_skills=parsed.nice_to_have_skills, embeddings=parsed.embeddings, job_category=parsed.job_category
+    ))
+  candidate = CandidateProfile(
+    id='bench', skills=resume.skills, embeddings=embed.embed([resume.text])[0]
+  )
+  return RecommendationRequest(candidate=candidate, jobs=jobs)
+
+
+def _calls(pipeline: str, pairs, files: Dict[str, List[Path]], fmt: str | None) -> List[Callable[[], Any]]:
+  resume_parser, jd_parser = _offline_parsers()
+  if pipeline == 'extract_skills':
+    return [lambda r=r: extract_skills(r.text) for r, _ in pairs]
+  if pipeline == 'parse_resume':
+    return [
+      lambda p=path: resume_parser.parse(ResumeParseRequest(file_path=str(p), file_name=p.name, user_id='bench'))
+      for path in files[fmt]
+    ]
+  if pipeline == 'parse_jd':
+    return [
+      lambda j=j: jd_parser.parse(JobDescriptionRequest(job_title=j.title, job_description=j.text)) for _, j in pairs
+    ]
+  if pipeline == 'score_match':
+    return [
+      lambda r=r, j=j: score_match(MatchRequest(resume_text=r.text, job_summary=j.text, include_trace=True))
+      for r, j in pairs
+    ]
+  if pipeline == 'recommend_jobs':
+    payload = _recommend_payload(pairs, jd_parser)
+    return [lambda: recommend_jobs(payload)]
+  if pipeline == 'ats_scan':
+    analyzer = ATSAnalyzer(resume_parser=resume_parser, jd_parser=jd_parser)
+    return [
+      lambda r=r, j=j: analyzer.scan(ATSScanRequest(
+        job_title=j.title, job_description=j.text, user_id='bench', resume_text=r.text
+      ))
+      for r, j in pairs
+    ]
+  raise ValueError(f'unknown pipeline {pipeline!r}')
+
+
+def _measure(calls: Sequence[Callable[[], Any]], iterations: int, memory_iterations: int) -> Dict[str, float]:
+  for call in calls:  # warm-up: regex, ontology and embedding caches
+    call()
+  latencies: List[int] = []
+  for idx in range(iterations):
+    call = calls[idx % len(calls)]
+    started = time.perf_counter_ns()
+    call()
+    latencies.append(time.perf_counter_ns() - started)
+  stats = summarize(latencies)
+  stats['peak_kib'] = _peak_kib([calls[idx % len(calls)] for idx in range(memory_iterations)])
+  return stats
+
+
+def _git_sha() -> str | None:
+  try:
+    return subprocess.run(
+      ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, timeout=5
+    ).stdout.strip()
+  except (OSError, subprocess.SubprocessError):
+    return None
+
+
+def run(
+  pipelines: Sequence[str],
+  sizes: Sequence[str],
+  ontology_sizes: Sequence[int],
+  formats: Sequence[str],
+  iterations: int,
+  per_size: int,
+  seed: int,
+  workdir: Path
+) -> Dict[str, Any]:
+  corpus = build_corpus(seed, sizes, per_size)
+  files = {
+    size: {
+      fmt: [write_document(workdir / size, f'resume-{idx}', resume.text, fmt) for idx, (resume, _) in enumerate(pairs)]
+      for fmt in formats
+    }
+    for size, pairs in corpus.items()
+  }
+  results: List[Dict[str, Any]] = []
+  previous_ontology = os.environ.get('SKILL_ONTOLOGY_PATH')
+  try:
+    for entries in ontology_sizes:
+      os.environ['SKILL_ONTOLOGY_PATH'] = str(write_ontology(workdir / f'ontology-{entries}.json', entries, seed))
+      load_skill_ontology(force_reload=True)
+      for pipeline in pipelines:
+        for size in sizes:
+          for fmt in (formats if pipeline == 'parse_resume' else [None]):
+            calls = _calls(pipeline, corpus[size], files[size], fmt)
+            stats = _measure(calls, iterations, memory_iterations=min(iterations, 5))
+            row = {'pipeline': pipeline, 'size': size, 'ontology': entries, 'format': fmt, **stats}
+            results.append(row)
+            print(
+              f"{pipeline:>15} {size:>6} ontology={entries:<6} {fmt or '':>4} "
+              f"{stats['ops_per_sec']:>9.1f} ops/s  p50={stats['p50_ms']:.2f}ms  "
+              f"p95={stats['p95_ms']:.2f}ms  p99={stats['p99_ms']:.2f}ms  peak={stats['peak_kib']:.0f}KiB",
+              flush=True
+            )
+  finally:
+    if previous_ontology is None:
+      os.environ.pop('SKILL_ONTOLOGY_PATH', None)
+    else:
+      os.environ['SKILL_ONTOLOGY_PATH'] = previous_ontology
+    load_skill_ontology(force_reload=True)
+
+  return {
+    'meta': {
+      'git_sha': _git_sha(),
+      'python': platform.python_version(),
+      'platform': platform.platform(),
+      'seed': seed,
+      'iterations': iterations,
+      'per_size': per_size,
+      'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    },
+    'results': results,
+  }
+
+
+def _csv(value: str) -> List[str]:
+  return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--pipelines', default=','.join(PIPELINES))
+  parser.add_argument('--sizes', default=','.join(SIZES))
+  parser.add_argument('--ontology', default='45,1000', help='comma-separated ontology entry counts')
+  parser.add_argument('--formats', default=','.join(FORMATS), help='file formats for parse_resume')
+  parser.add_argument('--iterations', type=int, default=30)
+  parser.add_argument('--per-size', type=int, default=5, help='distinct resume/JD pairs per size')
+  parser.add_argument('--seed', type=int, default=7)
+  parser.add_argument('--json', help='write results to this file')
+  args = parser.parse_args()
+
+  pipelines = _csv(args.pipelines)
+  unknown = set(pipelines) - set(PIPELINES)
+  if unknown:
+    parser.error(f"unknown pipelines: {', '.join(sorted(unknown))}")
+  with tempfile.TemporaryDirectory(prefix='ai-bench-') as workdir, suppress_unknown_skill_recording():
+    report = run(
+      pipelines, _csv(args.sizes), [int(n) for n in _csv(args.ontology)], _csv(args.formats),
+      args.iterations, args.per_size, args.seed, Path(workdir)
+    )
+  if args.json:
+    Path(args.json).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'wrote {args.json}')
+
+
+if __name__ == '__main__':
+  main()
@@ -1,19 +1,48 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from routes.resume_routes import router as resume_router
 from routes.jd_routes import router as job_router
 from routes.match_routes import router as match_router
 from routes.recommendation_routes import router as recommendation_router
 from routes.ats_routes import router as ats_router
+from services.warmup import warm_up
+from utils.executors import prestart_executors, shutdown_executors
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_prometheus
+from utils.profiling import RequestProfilingMiddleware
 from utils.settings import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Workers report ready only after shared state is loaded and every pipeline ran once.
+    app.state.ready = False
+    app.state.warmup_timings = {}
+    if settings.warmup_enabled:
+        try:
+            app.state.warmup_timings = warm_up()
+            prestart_executors()
+            app.state.ready = True
+        except Exception as exc:  # noqa: BLE001
+            logger.exception('warm-up failed: %s', exc)
+    else:
+        app.state.ready = True
+    yield
+    shutdown_executors()
+
 
 app = FastAPI(
     title='AI Screener AI Service',
     version='0.1.0',
-    description='FastAPI microservice that encapsulates all AI/NLP logic for the AI Screener platform.'
+    description='FastAPI microservice that encapsulates all AI/NLP logic for the AI Screener platform.',
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -23,11 +52,28 @@ app.add_middleware(
     allow_headers=['*'],
     allow_credentials=True
 )
+app.add_middleware(RequestProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get('/health')
 def health_check():
-    return {'status': 'ok', 'service': 'ai-service', 'environment': settings.environment}
+    ready = bool(getattr(app.state, 'ready', False))
+    body = {
+        'status': 'ok' if ready else 'warming',
+        'ready': ready,
+        'service': 'ai-service',
+        'environment': settings.environment
+    }
+    if not ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
+
+
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    # Merges the snapshots of every worker process (see utils/metrics.py).
+    return Response(content=render_prometheus(), media_type=METRICS_CONTENT_TYPE)
 
 
 app.include_router(resume_router)
@@ -35,4 +81,3 @@ app.include_router(job_router)
 app.include_router(match_router)
 app.include_router(recommendation_router)
 app.include_router(ats_router)
-
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,7 @@ class ATSScanRequest(BaseModel):
   user_id: str = Field(..., description='Candidate identifier', max_length=100)
   resume_text: Optional[str] = Field(default=None, description='Optional pre-extracted resume text', max_length=20000)
   candidate_name: Optional[str] = Field(default=None, description='Optional candidate name', max_length=200)
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
 
 
 class Finding(BaseModel):
@@ -113,3 +114,4 @@ class ATSScanResponse(BaseModel):
   evidenceGaps: List[EvidenceGap] = Field(default_factory=list)
   sectionFeedback: List[SectionFeedback] = Field(default_factory=list)
   rewritePlan: List[RewriteStep] = Field(default_factory=list)
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
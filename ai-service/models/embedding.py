@@ -0,0 +1,20 @@
+from typing import Annotated, List
+
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+
+from utils.embedding_codec import decode_embedding, serialize_embedding
+
+# Embedding vector accepted as a JSON number array or a base64 string of
+# little-endian float32 (`f16:`-prefixed for float16); see utils/embedding_codec.
+# Validation is a single NumPy conversion rather than per-element float checks.
+EmbeddingVector = Annotated[
+  List[float],
+  PlainValidator(decode_embedding),
+  PlainSerializer(serialize_embedding, when_used='json'),
+  WithJsonSchema({
+    'anyOf': [
+      {'type': 'array', 'items': {'type': 'number'}},
+      {'type': 'string', 'description': 'base64 little-endian float32, or f16:<base64> for float16'}
+    ]
+  })
+]
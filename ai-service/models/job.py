@@ -1,20 +1,32 @@
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from models.embedding import EmbeddingVector
+
 
 class JobDescriptionRequest(BaseModel):
   job_title: str = Field(..., description='Human readable job title')
   job_description: str = Field(..., description='Plain text job description')
   location: Optional[str] = Field(None, description='Optional location metadata')
+  embedding_encoding: Optional[Literal['float', 'base64', 'base64-f16']] = Field(
+    None, description='Encoding for `embeddings` in the response; overrides the X-Embedding-Encoding header'
+  )
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
 
 
 class JobDescriptionResponse(BaseModel):
   required_skills: List[str]
   summary: str
-  embeddings: List[float] = Field(default_factory=list)
+  embeddings: EmbeddingVector = Field(default_factory=list)
+  embedding_input: Optional[str] = Field(
+    None,
+    description="What `embeddings` was computed from: 'summary' (title, summary and description) or 'document' "
+    '(title and description). Vectors of different kinds are not comparable.'
+  )
   nice_to_have_skills: List[str] = Field(default_factory=list)
   seniority_level: Optional[str] = Field(None, description='Detected seniority such as junior/mid/senior')
   job_category: Optional[str] = Field(None, description='High level category e.g. backend, frontend, data')
   warnings: List[str] = Field(default_factory=list)
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, Field
 
@@ -7,9 +7,14 @@ class MatchRequest(BaseModel):
   resume_skills: List[str] = Field(default_factory=list, description='Skills extracted from resume parsing')
   job_required_skills: List[str] = Field(default_factory=list, description='Skills extracted from the job description')
   resume_text: str | None = Field(None, description='Full resume text or synthesized summary for scoring/trace')
+  resume_id: str | None = Field(
+    None,
+    description='Stable resume id; re-matching the same resume against the same job re-scores only what its text edit changed.'
+  )
   resume_summary: str | None = Field(None, description='Optional resume summary for context')
   job_summary: str | None = Field(None, description='Optional job description summary')
   include_trace: bool = Field(default=False, description='Return detailed trace for diagnostics')
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
   scoring_config: dict | None = Field(
     default=None,
     description='Optional scoring configuration provided by the gateway (weights/constraints).'
@@ -45,4 +50,5 @@ class MatchResponse(BaseModel):
   missing_must_have_skills: List[str] | None = Field(default=None)
   missing_nice_to_have_skills: List[str] | None = Field(default=None)
   trace: dict | None = Field(default=None, description='Optional trace payload when include_trace is true')
+  timings: Dict[str, float] | None = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
 
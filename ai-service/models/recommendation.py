@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from models.embedding import EmbeddingVector
+
 
 class CandidateProfile(BaseModel):
   """Minimal candidate context sent by the backend."""
@@ -9,7 +11,7 @@ class CandidateProfile(BaseModel):
   id: Optional[str] = Field(default=None, description='Candidate id for traceability')
   skills: List[str] = Field(default_factory=list)
   preferred_locations: List[str] = Field(default_factory=list)
-  embeddings: List[float] = Field(default_factory=list, description='Primary resume embedding')
+  embeddings: EmbeddingVector = Field(default_factory=list, description='Primary resume embedding')
   location: Optional[str] = None
   summary: Optional[str] = None
   seniority: Optional[str] = None
@@ -23,7 +25,7 @@ class JobRecommendationInput(BaseModel):
   title: str
   required_skills: List[str] = Field(default_factory=list)
   nice_to_have_skills: List[str] = Field(default_factory=list)
-  embeddings: List[float] = Field(default_factory=list)
+  embeddings: EmbeddingVector = Field(default_factory=list)
   location: Optional[str] = None
   seniority: Optional[str] = None
   job_category: Optional[str] = None
@@ -41,8 +43,92 @@ class RecommendedJob(BaseModel):
 class RecommendationRequest(BaseModel):
   candidate: CandidateProfile
   jobs: List[JobRecommendationInput] = Field(default_factory=list)
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
+  issue_ranking_token: bool = Field(
+    default=False, description='Keep this ranking and return a `ranking_token` for later delta refreshes'
+  )
+  ranking_token: Optional[str] = Field(
+    None, description='Delta refresh of an earlier ranking: `jobs` holds only jobs added or changed since'
+  )
+  removed_job_ids: List[str] = Field(default_factory=list, description='Jobs to drop from the ranking in a delta refresh')
 
 
 class RecommendationResponse(BaseModel):
   ranked_jobs: List[RecommendedJob]
   generated_at: str
+  ranking_token: Optional[str] = Field(None, description='Pass back as `ranking_token` to refresh this ranking with a delta')
+  total_matches: Optional[int] = Field(
+    default=None, description='Catalog recommendations only: jobs at or above the threshold before `top_k` is applied'
+  )
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
+
+
+class JobCatalogUpdate(BaseModel):
+  """Jobs to add to (or replace by ``job_id`` in) the service's job catalog, and jobs to drop from it."""
+
+  jobs: List[JobRecommendationInput] = Field(default_factory=list)
+  removed_job_ids: List[str] = Field(default_factory=list, description='Applied before `jobs` are added')
+
+
+class JobCatalogStatus(BaseModel):
+  size: int = Field(..., description='Jobs currently in the shared catalog')
+
+
+class CatalogRecommendationRequest(BaseModel):
+  """One candidate scored against the job catalog instead of a job list sent with the request."""
+
+  candidate: CandidateProfile
+  top_k: int = Field(default=20, ge=1, le=1000, description='Number of jobs to return')
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
+
+
+class CandidateRankingRequest(BaseModel):
+  """One job scored against a pool of candidates (the reverse of ``RecommendationRequest``)."""
+
+  job: JobRecommendationInput
+  candidates: List[CandidateProfile] = Field(default_factory=list)
+  top_k: int = Field(default=20, ge=1, le=1000, description='Number of candidates to return')
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
+
+
+class RankedCandidate(BaseModel):
+  candidate_id: Optional[str] = None
+  index: int = Field(..., description='Position of the candidate in the request')
+  score: float = Field(..., ge=0, le=1)
+  rank: int
+  reason: str
+
+
+class CandidateRankingResponse(BaseModel):
+  job_id: str
+  ranked_candidates: List[RankedCandidate]
+  # Candidates scoring at least the recommendation threshold, of which the top `top_k` are returned.
+  total_matches: int
+  generated_at: str
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
+
+
+class BatchRecommendationRequest(BaseModel):
+  """Many candidates scored against one shared job list: one ``RecommendationRequest`` per candidate, in one call."""
+
+  candidates: List[CandidateProfile] = Field(default_factory=list)
+  jobs: List[JobRecommendationInput] = Field(default_factory=list)
+  top_k: int = Field(default=20, ge=1, le=1000, description='Jobs returned per candidate')
+  stream: bool = Field(
+    default=False, description='Answer with NDJSON, one `CandidateRecommendations` line per candidate as soon as it is scored'
+  )
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds (not streamed)')
+
+
+class CandidateRecommendations(BaseModel):
+  candidate_id: Optional[str] = None
+  index: int = Field(..., description='Position of the candidate in the request')
+  ranked_jobs: List[RecommendedJob]
+  # Jobs scoring at least the recommendation threshold, of which the top `top_k` are returned.
+  total_matches: int
+
+
+class BatchRecommendationResponse(BaseModel):
+  results: List[CandidateRecommendations]
+  generated_at: str
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
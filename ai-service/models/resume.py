@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from models.embedding import EmbeddingVector
+
 
 class ExperienceItem(BaseModel):
   company: str = Field(..., description='Company or organization name')
@@ -23,6 +25,10 @@ class ResumeParseRequest(BaseModel):
   user_id: str = Field(..., description='Candidate identifier')
   resume_text: Optional[str] = Field(None, description='Optional raw text fallback')
   candidate_name: Optional[str] = Field(None, description='Optional candidate name metadata')
+  embedding_encoding: Optional[Literal['float', 'base64', 'base64-f16']] = Field(
+    None, description='Encoding for `embeddings` in the response; overrides the X-Embedding-Encoding header'
+  )
+  include_timings: bool = Field(default=False, description='Return per-stage timings in milliseconds')
 
 
 class ResumeParseResponse(BaseModel):
@@ -31,6 +37,12 @@ class ResumeParseResponse(BaseModel):
   experience: List[ExperienceItem]
   education: List[EducationItem]
   location: Optional[str] = Field(None, description='Detected location or remote status')
-  embeddings: List[float] = Field(default_factory=list, description='Embedding vector for downstream tasks')
+  embeddings: EmbeddingVector = Field(default_factory=list, description='Embedding vector for downstream tasks')
+  embedding_input: Optional[str] = Field(
+    None,
+    description="What `embeddings` was computed from: 'summary' (summary and document) or 'document' (document only). "
+    'Vectors of different kinds are not comparable.'
+  )
   warnings: List[str] = Field(default_factory=list, description='Non-fatal issues encountered during parsing')
+  timings: Optional[Dict[str, float]] = Field(default=None, description='Per-stage wall time in ms when include_timings is true')
 
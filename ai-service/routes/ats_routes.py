@@ -1,12 +1,15 @@
 import hashlib
 import logging
 import os
-import uuid
 
 from fastapi import APIRouter, Body, HTTPException, status
 
 from models.ats import ATSScanRequest, ATSScanResponse
 from services.ats_analyzer import ats_scan
+from services.resume_parser import get_resume_parser
+from utils.executors import CPU, IO, run_workload
+from utils.profiling import current_request_id
+from utils.responses import ModelJSONResponse
 
 router = APIRouter(prefix='/ai', tags=['AI - ATS'])
 logger = logging.getLogger(__name__)
@@ -19,7 +22,7 @@ _MAX_TEXT_LEN = 20000
   summary='ATS scan: analyze JD + resume for ATS readiness',
   response_description='ATS-friendly feedback, keyword coverage, and format findings.'
 )
-def ats_scan_route(
+async def ats_scan_route(
   payload: ATSScanRequest = Body(
     ...,
     example={
@@ -34,11 +37,11 @@ def ats_scan_route(
       'candidate_name': 'Jane Doe'
     }
   )
-) -> ATSScanResponse:
+) -> ModelJSONResponse:
   """Scan a resume against a job description and return ATS-style feedback."""
   _validate_payload(payload)
 
-  request_id = uuid.uuid4().hex[:12]
+  request_id = current_request_id()
   resume_len = len(payload.resume_text or '') if payload.resume_text is not None else 0
   jd_len = len(payload.job_description or '')
   resume_hash = hashlib.sha256((payload.resume_text or '').encode('utf-8')).hexdigest()[:10] if payload.resume_text else ''
@@ -56,8 +59,9 @@ def ats_scan_route(
     }
   )
 
+  workload = IO if get_resume_parser().uses_llm else CPU
   try:
-    return ats_scan(payload)
+    return ModelJSONResponse(await run_workload(workload, ats_scan, payload))
   except HTTPException:
     raise
   except Exception as exc:  # noqa: BLE001
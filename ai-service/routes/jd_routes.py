@@ -1,19 +1,28 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, status
 
 from models.job import JobDescriptionRequest, JobDescriptionResponse
-from services.jd_parser import parse_job_description
+from services.jd_parser import get_jd_parser, parse_job_description
+from utils.embedding_codec import HEADER, negotiate_embedding_encoding
+from utils.executors import CPU, IO, run_workload
+from utils.responses import ModelJSONResponse
 
 router = APIRouter(prefix='/ai', tags=['AI - Job Description'])
 logger = logging.getLogger(__name__)
 
 
 @router.post('/parse-jd', response_model=JobDescriptionResponse)
-def parse_job_description_route(payload: JobDescriptionRequest) -> JobDescriptionResponse:
+async def parse_job_description_route(
+  payload: JobDescriptionRequest,
+  embedding_encoding: Optional[str] = Header(None, alias=HEADER)
+) -> ModelJSONResponse:
   """Parse job descriptions into normalized skills, seniority, and embeddings."""
+  negotiate_embedding_encoding(payload.embedding_encoding, embedding_encoding)
+  workload = IO if get_jd_parser().uses_llm else CPU
   try:
-    return parse_job_description(payload)
+    return ModelJSONResponse(await run_workload(workload, parse_job_description, payload))
   except HTTPException:
     raise
   except Exception as exc:  # noqa: BLE001
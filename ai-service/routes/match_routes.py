@@ -3,17 +3,27 @@ import logging
 from fastapi import APIRouter, HTTPException, status
 
 from models.match import MatchRequest, MatchResponse
-from services.matching_service import score_match
+from services.match_state_cache import get_match_state_cache, match_state_key
+from services.matching_service import score_match, score_match_state
+from utils.executors import CPU, run_workload
+from utils.responses import ModelJSONResponse
 
 router = APIRouter(prefix='/ai', tags=['AI - Matching'])
 logger = logging.getLogger(__name__)
 
 
 @router.post('/match', response_model=MatchResponse)
-def match_resume_to_job(payload: MatchRequest) -> MatchResponse:
+async def match_resume_to_job(payload: MatchRequest) -> ModelJSONResponse:
   """Return a scored match that blends skills and embeddings."""
   try:
-    return score_match(payload)
+    key = match_state_key(payload)
+    if key is None:
+      return ModelJSONResponse(await run_workload(CPU, score_match, payload))
+    # The state is looked up and stored here, not in the executor, so process-pool workers share it.
+    states = get_match_state_cache()
+    response, state = await run_workload(CPU, score_match_state, payload, states.get(key))
+    states.put(key, state)
+    return ModelJSONResponse(response)
   except HTTPException:
     raise
   except Exception as exc:  # noqa: BLE001
@@ -1,19 +1,57 @@
 import logging
+from typing import AsyncIterator
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 
-from models.recommendation import RecommendationRequest, RecommendationResponse
-from services.recommendation_service import recommend_jobs
+from models.recommendation import (
+  BatchRecommendationRequest,
+  BatchRecommendationResponse,
+  CandidateRankingRequest,
+  CandidateRankingResponse,
+  CatalogRecommendationRequest,
+  JobCatalogStatus,
+  JobCatalogUpdate,
+  RecommendationRequest,
+  RecommendationResponse
+)
+from services.job_catalog import CatalogDimensionMismatch, get_job_catalog, recommend_from_catalog
+from services.ranking_cache import get_ranking_cache
+from services.recommendation_service import rank_candidates, recommend_batch, recommend_batch_page, recommend_jobs
+from utils.executors import CPU, INLINE, IO, run_workload
+from utils.responses import ModelJSONResponse
+from utils.settings import get_settings
 
 router = APIRouter(prefix='/ai', tags=['AI - Recommendations'])
 logger = logging.getLogger(__name__)
 
 
+def _ranking_token_expired() -> HTTPException:
+  return HTTPException(
+    status_code=status.HTTP_409_CONFLICT,
+    detail={
+      'error': 'ranking_token_expired',
+      'message': 'Ranking token is unknown, expired or belongs to a different candidate profile. Request a full ranking.'
+    }
+  )
+
+
 @router.post('/recommend', response_model=RecommendationResponse)
-def recommend_jobs_route(payload: RecommendationRequest) -> RecommendationResponse:
-  """Return skill-aligned job suggestions ranked by overlap and location fit."""
+async def recommend_jobs_route(payload: RecommendationRequest) -> ModelJSONResponse:
+  """Return skill-aligned job suggestions ranked by overlap and location fit.
+
+  With ``ranking_token``, only ``jobs`` (added or changed since that ranking)
+  are scored and merged into it, and ``removed_job_ids`` are dropped.
+  """
+  cache = get_ranking_cache()
+  if payload.ranking_token and not await run_workload(IO, cache.contains, payload.ranking_token, payload.candidate):
+    raise _ranking_token_expired()
+
+  # A handful of jobs scores in well under a millisecond, cheaper than a pool round-trip.
+  workload = INLINE if len(payload.jobs) <= get_settings().inline_recommend_max_jobs else CPU
   try:
-    return recommend_jobs(payload)
+    response = await run_workload(workload, recommend_jobs, payload)
   except HTTPException:
     raise
   except Exception as exc:  # noqa: BLE001
@@ -23,3 +61,124 @@ def recommend_jobs_route(payload: RecommendationRequest) -> RecommendationRespon
       detail={'error': 'recommendation_failed', 'message': 'Recommendation generation failed. Please try again.'}
     ) from exc
 
+  if payload.ranking_token:
+    merged = await run_workload(
+      IO,
+      cache.merge,
+      payload.ranking_token,
+      payload.candidate,
+      [job.job_id for job in payload.jobs],
+      payload.removed_job_ids,
+      response.ranked_jobs
+    )
+    if merged is None:
+      raise _ranking_token_expired()
+    response.ranked_jobs = merged
+    response.ranking_token = payload.ranking_token
+  elif payload.issue_ranking_token:
+    response.ranking_token = await run_workload(IO, cache.store, payload.candidate, response.ranked_jobs)
+  return ModelJSONResponse(response)
+
+
+@router.post('/recommend-candidates', response_model=CandidateRankingResponse)
+async def recommend_candidates_route(payload: CandidateRankingRequest) -> ModelJSONResponse:
+  """Return the top ``top_k`` candidates for one job, scored like ``/ai/recommend`` scores jobs."""
+  workload = INLINE if len(payload.candidates) <= get_settings().inline_recommend_max_jobs else CPU
+  try:
+    return ModelJSONResponse(await run_workload(workload, rank_candidates, payload))
+  except HTTPException:
+    raise
+  except Exception as exc:  # noqa: BLE001
+    logger.exception('recommend-candidates failed: %s', exc)
+    raise HTTPException(
+      status_code=status.HTTP_502_BAD_GATEWAY,
+      detail={'error': 'candidate_ranking_failed', 'message': 'Candidate ranking failed. Please try again.'}
+    ) from exc
+
+
+@router.post('/jobs/catalog', response_model=JobCatalogStatus)
+async def update_job_catalog_route(payload: JobCatalogUpdate) -> JobCatalogStatus:
+  """Add, replace or drop jobs in the shared catalog for ``/ai/recommend/catalog``."""
+  # Each worker's index lives in its own process, so catalog work runs on the thread
+  # pool: SQLite writes and index updates block, but a pool process could not update it.
+  try:
+    size = await run_workload(IO, get_job_catalog().upsert, payload.jobs, payload.removed_job_ids)
+  except CatalogDimensionMismatch as exc:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail={'error': 'embedding_dimension_mismatch', 'message': str(exc)}
+    ) from exc
+  except HTTPException:
+    raise
+  except Exception as exc:  # noqa: BLE001
+    logger.exception('catalog update failed: %s', exc)
+    raise HTTPException(
+      status_code=status.HTTP_502_BAD_GATEWAY,
+      detail={'error': 'catalog_update_failed', 'message': 'Catalog update failed. Please try again.'}
+    ) from exc
+  return JobCatalogStatus(size=size)
+
+
+@router.get('/jobs/catalog', response_model=JobCatalogStatus)
+async def job_catalog_status_route() -> JobCatalogStatus:
+  return JobCatalogStatus(size=await run_workload(IO, len, get_job_catalog()))
+
+
+@router.post('/recommend/catalog', response_model=RecommendationResponse)
+async def recommend_from_catalog_route(payload: CatalogRecommendationRequest) -> ModelJSONResponse:
+  """Return the top ``top_k`` catalog jobs for the candidate, scored as ``/ai/recommend`` scores them."""
+  try:
+    # Catching up on updates written by other workers can take a while; keep it off the event loop.
+    return ModelJSONResponse(await run_workload(IO, recommend_from_catalog, payload))
+  except HTTPException:
+    raise
+  except Exception as exc:  # noqa: BLE001
+    logger.exception('recommend from catalog failed: %s', exc)
+    raise HTTPException(
+      status_code=status.HTTP_502_BAD_GATEWAY,
+      detail={'error': 'recommendation_failed', 'message': 'Recommendation generation failed. Please try again.'}
+    ) from exc
+
+
+def _batch_failed() -> HTTPException:
+  return HTTPException(
+    status_code=status.HTTP_502_BAD_GATEWAY,
+    detail={'error': 'batch_recommendation_failed', 'message': 'Batch recommendation failed. Please try again.'}
+  )
+
+
+async def _stream_batch(payload: BatchRecommendationRequest, workload: str) -> AsyncIterator[bytes]:
+  # One executor call per page, so results flow while later pages are scored.
+  page = max(1, get_settings().recommend_batch_stream_page)
+  for start in range(0, len(payload.candidates), page):
+    try:
+      results = await run_workload(
+        workload, recommend_batch_page, payload.candidates[start:start + page], payload.jobs, payload.top_k, start
+      )
+    except Exception as exc:  # noqa: BLE001
+      # The 200 status is already sent; a final error line tells the client the stream is incomplete.
+      logger.exception('recommend-batch stream failed: %s', exc)
+      detail = exc.detail if isinstance(exc, HTTPException) else _batch_failed().detail
+      yield to_json(detail) + b'\n'
+      return
+    yield b''.join(to_json(result) + b'\n' for result in results)
+
+
+@router.post('/recommend-batch', response_model=BatchRecommendationResponse)
+async def recommend_batch_route(payload: BatchRecommendationRequest):
+  """Score every candidate against the same ``jobs``, as one ``/ai/recommend`` call each would.
+
+  With ``stream``, the answer is NDJSON: one ``CandidateRecommendations`` per
+  line, in candidate order.
+  """
+  pairs = len(payload.candidates) * len(payload.jobs)
+  workload = INLINE if pairs <= get_settings().inline_recommend_max_jobs else CPU
+  if payload.stream:
+    return StreamingResponse(_stream_batch(payload, workload), media_type='application/x-ndjson')
+  try:
+    return ModelJSONResponse(await run_workload(workload, recommend_batch, payload))
+  except HTTPException:
+    raise
+  except Exception as exc:  # noqa: BLE001
+    logger.exception('recommend-batch failed: %s', exc)
+    raise _batch_failed() from exc
@@ -1,19 +1,28 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, status
 
 from models.resume import ResumeParseRequest, ResumeParseResponse
-from services.resume_parser import parse_resume
+from services.resume_parser import get_resume_parser, parse_resume
+from utils.embedding_codec import HEADER, negotiate_embedding_encoding
+from utils.executors import CPU, IO, run_workload
+from utils.responses import ModelJSONResponse
 
 router = APIRouter(prefix='/ai', tags=['AI - Resume'])
 logger = logging.getLogger(__name__)
 
 
 @router.post('/parse-resume', response_model=ResumeParseResponse)
-def parse_resume_route(payload: ResumeParseRequest) -> ResumeParseResponse:
+async def parse_resume_route(
+  payload: ResumeParseRequest,
+  embedding_encoding: Optional[str] = Header(None, alias=HEADER)
+) -> ModelJSONResponse:
   """Parse resumes into structured summaries, skills, experience, and embeddings."""
+  negotiate_embedding_encoding(payload.embedding_encoding, embedding_encoding)
+  workload = IO if get_resume_parser().uses_llm else CPU
   try:
-    return parse_resume(payload)
+    return ModelJSONResponse(await run_workload(workload, parse_resume, payload))
   except HTTPException:
     raise
   except Exception as exc:  # noqa: BLE001
@@ -5,10 +5,8 @@ import re
 import hashlib
 import logging
 from dataclasses import dataclass
-from typing import List, Tuple
-
-from docx import Document
-from pypdf import PdfReader
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from models.ats import (
   ATSScanRequest,
@@ -27,9 +25,11 @@ from models.ats import (
 from services.rse_engine import build_requirements, calculate_scores, evaluate_requirements
 from models.job import JobDescriptionRequest
 from models.resume import ResumeParseRequest
-from services.jd_parser import parse_job_description
-from services.resume_parser import ResumeParser
+from services.jd_parser import JobDescriptionParser, get_jd_parser
+from services.resume_parser import ResumeParser, get_resume_parser
 from services.skill_utils import aliases_for, normalize_token, normalize_skill_list
+from utils.document_readers import open_docx, open_pdf
+from utils.timing import collect_timings, span
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +53,23 @@ class _FormatStats:
 
 
 class ATSAnalyzer:
-  def __init__(self) -> None:
-    self._resume_parser = ResumeParser()
+  def __init__(
+    self,
+    resume_parser: Optional[ResumeParser] = None,
+    jd_parser: Optional[JobDescriptionParser] = None
+  ) -> None:
+    self._resume_parser = resume_parser or get_resume_parser()
+    self._jd_parser = jd_parser or get_jd_parser()
+
+  def scan(self, payload: ATSScanRequest, use_llm: bool = True) -> ATSScanResponse:
+    """Scan one resume against one job; ``use_llm=False`` parses both without the LLM."""
+    with collect_timings('ats_scan') as timings:
+      response = self._scan(payload, use_llm)
+    if payload.include_timings:
+      response.timings = timings.as_dict()
+    return response
 
-  def scan(self, payload: ATSScanRequest) -> ATSScanResponse:
+  def _scan(self, payload: ATSScanRequest, use_llm: bool) -> ATSScanResponse:
     resume_len = len(payload.resume_text or '') if payload.resume_text is not None else 0
     jd_len = len(payload.job_description or '')
     resume_hash = hashlib.sha256((payload.resume_text or '').encode('utf-8')).hexdigest()[:10] if payload.resume_text else ''
@@ -74,40 +87,45 @@ class ATSAnalyzer:
     # Parse resume (reuse existing pipeline)
     resume_parse = self._resume_parser.parse(
       ResumeParseRequest(
-        file_path=payload.file_path,
-        file_name=payload.file_name,
+        file_path=payload.file_path or '',
+        file_name=payload.file_name or '',
         user_id=payload.user_id,
         resume_text=payload.resume_text,
         candidate_name=payload.candidate_name
-      )
+      ),
+      use_llm=use_llm
     )
 
     # Parse JD (reuse existing pipeline)
-    jd_parse = parse_job_description(
+    jd_parse = self._jd_parser.parse(
       JobDescriptionRequest(
         job_title=payload.job_title,
         job_description=payload.job_description,
         location=None
-      )
+      ),
+      use_llm=use_llm
     )
 
     resume_text = (payload.resume_text or '')
     if not resume_text:
       # ResumeParser already extracted; use internal method's output by re-extracting.
       # We do a cheap extraction again here to keep code isolated.
-      resume_text = self._extract_text(payload.file_path)
+      with span('ats.extract'):
+        resume_text = self._extract_text(payload.file_path)
 
     jd_text = (payload.job_description or '').strip()
 
     # Format findings
-    format_stats = self._inspect_format(payload.file_path, resume_text)
-    format_findings = self._build_format_findings(format_stats)
-    ats_readability_score = self._score_readability(format_findings, format_stats)
+    with span('ats.format'):
+      format_stats = self._inspect_format(payload.file_path, resume_text)
+      format_findings = self._build_format_findings(format_stats)
+      ats_readability_score = self._score_readability(format_findings, format_stats)
 
     # RSE: build & evaluate requirements once, reuse across outputs
-    requirements = build_requirements(jd_text, jd_parse)
-    requirement_results = evaluate_requirements(requirements, resume_text, resume_parse)
-    jd_score = calculate_scores(requirements, requirement_results)
+    with span('ats.rse'):
+      requirements = build_requirements(jd_text, jd_parse)
+      requirement_results = evaluate_requirements(requirements, resume_text, resume_parse)
+      jd_score = calculate_scores(requirements, requirement_results)
 
     req_index = {req.id: req for req in requirements}
 
@@ -184,9 +202,9 @@ class ATSAnalyzer:
 
     evidence_score = int(round(jd_score.evidenceStrengthScore))
 
-    section_feedback = self._section_feedback(resume_text)
-
-    rewrite_plan = self._rewrite_plan(format_findings, kw_required_bucket, evidence_gaps)
+    with span('ats.feedback'):
+      section_feedback = self._section_feedback(resume_text)
+      rewrite_plan = self._rewrite_plan(format_findings, kw_required_bucket, evidence_gaps)
 
     synonym_notes: List[SynonymNote] = []
 
@@ -200,7 +218,7 @@ class ATSAnalyzer:
         jdFitScore=jd_score.jdFitScore
       ),
       jdScore=jd_score,
-      requirementResults=requirement_results,
+      requirementResults=[res.to_model() for res in requirement_results],
       formatFindings=format_findings,
       keywordAnalysis=KeywordAnalysis(
         required=kw_required_bucket,
@@ -243,10 +261,10 @@ class ATSAnalyzer:
     ext = os.path.splitext(file_path)[1].lower()
     try:
       if ext == '.pdf':
-        reader = PdfReader(file_path)
+        reader = open_pdf(file_path)
         return '\n'.join((p.extract_text() or '') for p in reader.pages).strip()
       if ext == '.docx':
-        doc = Document(file_path)
+        doc = open_docx(file_path)
         return '\n'.join(p.text for p in doc.paragraphs).strip()
       with open(file_path, 'r', encoding='utf-8', errors='ignore') as handle:
         return handle.read().strip()
@@ -270,7 +288,7 @@ class ATSAnalyzer:
       scanned_pdf_suspected = extracted_chars < 250
     elif ext == '.docx':
       try:
-        doc = Document(file_path)
+        doc = open_docx(file_path)
         docx_tables = len(doc.tables)
         # Detect any non-empty header/footer content.
         for section in doc.sections:
@@ -677,5 +695,10 @@ class ATSAnalyzer:
     return plan[:10]
 
 
+@lru_cache(maxsize=1)
+def get_ats_analyzer() -> ATSAnalyzer:
+  return ATSAnalyzer()
+
+
 def ats_scan(payload: ATSScanRequest) -> ATSScanResponse:
-  return ATSAnalyzer().scan(payload)
+  return get_ats_analyzer().scan(payload)
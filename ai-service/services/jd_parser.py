@@ -3,13 +3,16 @@ from __future__ import annotations
 import json
 import logging
 import re
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
+from utils.async_bridge import submit_blocking
 from utils.embeddings_client import get_embeddings_client
 from utils.llm_client import get_llm_client
 from models.job import JobDescriptionRequest, JobDescriptionResponse
-from services.skill_utils import extract_skills, normalize_skill_list
+from services.skill_utils import Categories, extract_skills, normalize_skill_list, skill_categories_for_role
 from utils.settings import get_settings
+from utils.timing import collect_timings, span
 
 logger = logging.getLogger(__name__)
 
@@ -49,31 +52,63 @@ class JobDescriptionParser:
     provider = self._settings.ai_provider.lower().strip()
     self._use_llm = provider != 'mock' and bool(self._settings.openai_api_key)
 
-  def parse(self, payload: JobDescriptionRequest) -> JobDescriptionResponse:
+  @property
+  def uses_llm(self) -> bool:
+    return self._use_llm
+
+  def parse(self, payload: JobDescriptionRequest, use_llm: bool = True) -> JobDescriptionResponse:
+    """Parse one job description; ``use_llm=False`` keeps this call on the heuristics even when an LLM is configured."""
+    with collect_timings('jd_parse') as timings:
+      response = self._parse(payload, self._use_llm and use_llm)
+    if payload.include_timings:
+      response.timings = timings.as_dict()
+    return response
+
+  def _parse(self, payload: JobDescriptionRequest, use_llm: bool) -> JobDescriptionResponse:
     warnings: List[str] = []
     text = (payload.job_description or '').strip()
     if not text:
       warnings.append('Job description text was empty.')
 
+    structured_call = None
+    if use_llm and text:
+      structured_call = submit_blocking(self._extract_structured_with_llm, payload.job_title, payload.location, text)
+    embed_document = self._settings.embedding_input == 'document'
+    if embed_document:
+      # Without the summary the embedding does not depend on the LLM, so it overlaps the extraction.
+      with span('jd.embeddings'):
+        embeddings = self._build_embeddings(payload.job_title, text)
+
     structured = None
-    if self._use_llm and text:
+    if structured_call is not None:
       try:
-        structured = self._extract_structured_with_llm(payload.job_title, payload.location, text)
+        with span('jd.llm_wait'):
+          structured = structured_call.result()
       except Exception as exc:  # noqa: BLE001
         warnings.append('LLM JD parsing unavailable, falling back to heuristics.')
         logger.warning('LLM JD parsing failed: %s', exc)
 
     summary = structured.get('summary') if structured else None
     if not summary:
-      summary = self._generate_summary(payload.job_title, text, payload.location)
+      summary = self._generate_summary(payload.job_title, text, payload.location, use_llm)
+    if not embed_document:
+      with span('jd.embeddings'):
+        embeddings = self._build_embeddings(payload.job_title, text, summary or '')
+
+    job_category = structured.get('job_category') if structured else None
+    if not job_category:
+      job_category = self._detect_category(payload.job_title, text)
+    # The role narrows which ontology categories fuzzy skill matches are tried in first.
+    hints = skill_categories_for_role(job_category)
 
-    required_skills = normalize_skill_list(structured.get('required_skills', [])) if structured else []
-    if not required_skills:
-      required_skills = self._extract_skills(text)
+    with span('jd.skills'):
+      required_skills = normalize_skill_list(structured.get('required_skills', []), hints) if structured else []
+      if not required_skills:
+        required_skills = self._extract_skills(text, hints)
 
-    nice_to_have_skills = normalize_skill_list(structured.get('nice_to_have_skills', [])) if structured else []
-    if not nice_to_have_skills:
-      nice_to_have_skills = self._extract_preferred_skills(text)[0]
+      nice_to_have_skills = normalize_skill_list(structured.get('nice_to_have_skills', []), hints) if structured else []
+      if not nice_to_have_skills:
+        nice_to_have_skills = self._extract_preferred_skills(text, hints)[0]
 
     # Remove overlap so we don't double-count
     preferred_set = {skill.lower() for skill in nice_to_have_skills}
@@ -83,24 +118,19 @@ class JobDescriptionParser:
     if not seniority_level:
       seniority_level = self._detect_seniority(payload.job_title, text)
 
-    job_category = structured.get('job_category') if structured else None
-    if not job_category:
-      job_category = self._detect_category(payload.job_title, text)
-
-    embeddings = self._build_embeddings(payload.job_title, text, summary or '')
-
     return JobDescriptionResponse(
       required_skills=required_skills,
       summary=summary,
       embeddings=embeddings,
+      embedding_input='document' if embed_document else 'summary',
       nice_to_have_skills=nice_to_have_skills,
       seniority_level=seniority_level,
       job_category=job_category,
       warnings=warnings
     )
 
-  def _generate_summary(self, job_title: str, description: str, location: Optional[str]) -> str:
-    if not self._use_llm:
+  def _generate_summary(self, job_title: str, description: str, location: Optional[str], use_llm: bool) -> str:
+    if not use_llm:
       base = description.splitlines()
       snippet = ' '.join(base[:4])
       return f"{job_title} role based in {location or 'any location'}. {snippet[:200]}".strip()
@@ -117,10 +147,10 @@ class JobDescriptionParser:
     except Exception as exc:  # noqa: BLE001
       return f'{job_title} opportunity summary unavailable (LLM failed: {exc}).'
 
-  def _extract_skills(self, text: str) -> List[str]:
-    return normalize_skill_list(extract_skills(text))
+  def _extract_skills(self, text: str, categories: Categories = None) -> List[str]:
+    return normalize_skill_list(extract_skills(text, categories=categories), categories)
 
-  def _extract_preferred_skills(self, text: str) -> Tuple[List[str], set[str]]:
+  def _extract_preferred_skills(self, text: str, categories: Categories = None) -> Tuple[List[str], set[str]]:
     preferred = {}
     lines = text.splitlines()
     for idx, line in enumerate(lines):
@@ -129,7 +159,7 @@ class JobDescriptionParser:
         block = lower
         if idx + 1 < len(lines):
           block += ' ' + lines[idx + 1].lower()
-        for skill in extract_skills(block):
+        for skill in extract_skills(block, categories=categories):
           if skill not in preferred:
             preferred[skill] = idx
 
@@ -160,8 +190,12 @@ class JobDescriptionParser:
         best_category = category
     return best_category
 
-  def _build_embeddings(self, job_title: str, description: str, summary: str) -> List[float]:
-    combined = f'{job_title}\n{summary}\n{description[:4000]}'
+  def _build_embeddings(self, job_title: str, description: str, summary: Optional[str] = None) -> List[float]:
+    # ``summary`` None leaves it out (AI_EMBEDDING_INPUT=document, the default).
+    if summary is None:
+      combined = f'{job_title}\n{description[:4000]}'
+    else:
+      combined = f'{job_title}\n{summary}\n{description[:4000]}'
     try:
       vectors = self._embeddings_client.embed([combined])
       return vectors[0] if vectors else []
@@ -178,7 +212,8 @@ class JobDescriptionParser:
       f"Location: {location or 'unspecified'}\n"
       f"Description:\n{description[:6000]}"
     )
-    raw = self._llm_client.run(prompt, temperature=0.1, system_prompt='You convert job descriptions into JSON.')
+    with span('jd.llm'):
+      raw = self._llm_client.run(prompt, temperature=0.1, system_prompt='You convert job descriptions into JSON.')
     return self._parse_json_response(raw)
 
   def _parse_json_response(self, content: str) -> dict:
@@ -197,8 +232,12 @@ class JobDescriptionParser:
     return data
 
 
+@lru_cache(maxsize=1)
+def get_jd_parser() -> JobDescriptionParser:
+  return JobDescriptionParser()
+
+
 def parse_job_description(payload: JobDescriptionRequest) -> JobDescriptionResponse:
-  parser = JobDescriptionParser()
-  return parser.parse(payload)
+  return get_jd_parser().parse(payload)
 
 
@@ -0,0 +1,433 @@
+"""Jobs kept between calls, indexed by skill, for ``/ai/recommend/catalog``.
+
+``/ai/recommend`` scores every job it is sent. With a large job board most of
+them share no skill with the candidate. ``JobCatalog`` keeps upserted jobs
+pre-encoded instead:
+
+- per skill id (``utils.skill_sets``), the rows that list it as required or
+  nice-to-have (an inverted index, appended to on every upsert);
+- unit-normalized embeddings in one float32 matrix;
+- location and seniority as small integer codes.
+
+Scoring a candidate reads only the postings of the candidate's own skills.
+Overlap counts therefore exist only for jobs that share a skill; every other
+job has zero overlap without being looked at. Embedding, location and
+seniority are per-row columns, so a job with no shared skill costs one dot
+product and two lookups. The scores are the ones ``recommend_jobs`` gives
+for the same jobs, listed in upsert order.
+
+Upserting a known ``job_id`` retires its row and appends a new one, and
+removing a job only retires its row. Retired rows are dropped by a rebuild
+once they outnumber live ones. Skill ids come from a vocabulary owned by the
+catalog, so they grow only with the catalog's own skills and are reset on
+rebuild.
+
+The jobs themselves are kept in a SQLite change log (``AI_JOB_CATALOG_PATH``)
+that every worker on the host opens: one row per live job in upsert order,
+plus a tombstone per removal. The index above is each worker's copy. Before
+scoring, a worker applies the log rows written since its last look, so an
+update sent to any worker is seen by all of them and survives restarts. A
+worker that fell behind pruned tombstones rebuilds from the live rows.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from models.recommendation import (
+  CandidateProfile,
+  CatalogRecommendationRequest,
+  JobRecommendationInput,
+  RecommendationResponse,
+  RecommendedJob,
+)
+from services.recommendation_service import (
+  MIN_SCORE_THRESHOLD,
+  _code,
+  _location_matrix,
+  _normalize_location,
+  _normalized,
+  _reason,
+  _seniority_matrix,
+  _settle_edges,
+  _settled_similarity,
+  _shared_skills,
+  _top_k,
+  _weighted,
+)
+from utils.embedding_codec import as_array, stack_embeddings
+from utils.mock_data import timestamp
+from utils.settings import get_settings
+from utils.skill_sets import SkillSets, SkillVocabulary
+from utils.timing import collect_timings, span
+from utils.vector_ops import NormalizedMatrix, cosine_one_to_many, l2_normalize
+
+_MIN_CAPACITY = 1024
+
+
+class CatalogDimensionMismatch(ValueError):
+  """An upserted job's embedding does not have the catalog's dimension."""
+
+
+def _grown(column: np.ndarray, size: int) -> np.ndarray:
+  """``column`` with room for at least ``size`` rows, doubling its capacity when it is full."""
+  if size <= len(column):
+    return column
+  grown = np.zeros((max(size, 2 * len(column), _MIN_CAPACITY),) + column.shape[1:], dtype=column.dtype)
+  grown[:len(column)] = column
+  return grown
+
+
+def _dimension(jobs: Sequence[JobRecommendationInput], dim: int) -> int:
+  """The catalog dimension after adding ``jobs``; raises ``CatalogDimensionMismatch`` if one does not fit."""
+  dim = dim or next((len(job.embeddings) for job in jobs if job.embeddings), 0)
+  for job in jobs:
+    if job.embeddings and len(job.embeddings) != dim:
+      raise CatalogDimensionMismatch(
+        f'Job {job.job_id!r} has a {len(job.embeddings)}-dimensional embedding; the catalog holds {dim}.'
+      )
+  return dim
+
+
+class _CatalogStore:
+  """The SQLite change log behind every worker's ``JobCatalog``.
+
+  ``jobs`` holds the latest row per live job and a tombstone (``job`` NULL)
+  per removal, keyed by an ever-increasing ``change``. Superseded rows are
+  deleted, so the live rows in ``change`` order are the upsert order.
+  Tombstones are pruned once they outnumber live jobs; ``horizon`` records
+  the last pruned change, and a reader older than it must start over.
+  Embeddings are stored as float64 bytes, so reloaded jobs score exactly as sent.
+  """
+
+  _SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS jobs ('
+    ' change INTEGER PRIMARY KEY AUTOINCREMENT,'
+    ' job_id TEXT NOT NULL,'
+    ' job BLOB,'
+    ' embedding BLOB)',
+    'CREATE INDEX IF NOT EXISTS jobs_job_id ON jobs (job_id)',
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+  )
+
+  def __init__(self, path: str) -> None:
+    self._lock = threading.Lock()
+    if path != ':memory:':
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    if path != ':memory:':
+      self._conn.execute('PRAGMA journal_mode=WAL')
+      self._conn.execute('PRAGMA synchronous=NORMAL')
+    for statement in self._SCHEMA:
+      self._conn.execute(statement)
+
+  def _meta(self, key: str) -> int:
+    row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else 0
+
+  def _set_meta(self, key: str, value: int) -> None:
+    self._conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+  def size(self) -> int:
+    with self._lock:
+      return self._conn.execute('SELECT COUNT(*) FROM jobs WHERE job IS NOT NULL').fetchone()[0]
+
+  def _last_change(self) -> int:
+    row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'jobs'").fetchone()
+    return row[0] if row else 0
+
+  def last_change(self) -> int:
+    with self._lock:
+      return self._last_change()
+
+  def write(self, jobs: Sequence[JobRecommendationInput], removed_job_ids: Iterable[str]) -> None:
+    """Log ``removed_job_ids``, then ``jobs``, in one transaction; nothing is written on a dimension mismatch."""
+    with self._lock:
+      # IMMEDIATE takes the write lock up front, so updates from several workers serialize.
+      self._conn.execute('BEGIN IMMEDIATE')
+      try:
+        self._set_meta('dim', _dimension(jobs, self._meta('dim')))
+        for job_id in removed_job_ids:
+          if self._conn.execute('DELETE FROM jobs WHERE job_id = ? AND job IS NOT NULL', (job_id,)).rowcount:
+            self._conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+            self._conn.execute('INSERT INTO jobs (job_id) VALUES (?)', (job_id,))
+        for job in jobs:
+          self._conn.execute('DELETE FROM jobs WHERE job_id = ?', (job.job_id,))
+          self._conn.execute(
+            'INSERT INTO jobs (job_id, job, embedding) VALUES (?, ?, ?)',
+            (job.job_id, job.model_dump_json(exclude={'embeddings'}), np.asarray(job.embeddings, dtype=np.float64).tobytes())
+          )
+        self._prune()
+      except BaseException:
+        self._conn.execute('ROLLBACK')
+        raise
+      self._conn.execute('COMMIT')
+
+  def _prune(self) -> None:
+    tombstones, horizon = self._conn.execute('SELECT COUNT(*), MAX(change) FROM jobs WHERE job IS NULL').fetchone()
+    live = self._conn.execute('SELECT COUNT(*) FROM jobs WHERE job IS NOT NULL').fetchone()[0]
+    if tombstones > max(live, _MIN_CAPACITY):
+      self._conn.execute('DELETE FROM jobs WHERE job IS NULL')
+      self._set_meta('horizon', horizon)
+
+  def read_since(self, change: int) -> Tuple[bool, List[Tuple[str, Optional[JobRecommendationInput]]], int]:
+    """``(restart, rows, last)``: ``(job_id, job or None)`` log rows after ``change``, in order.
+
+    With ``restart`` the rows are every live job instead. ``last`` is the
+    change the rows bring the reader up to.
+    """
+    with self._lock:
+      # One read transaction, so rows, horizon and last change come from the same snapshot.
+      self._conn.execute('BEGIN')
+      try:
+        restart = change < self._meta('horizon')
+        rows = self._conn.execute(
+          'SELECT job_id, job, embedding FROM jobs WHERE job IS NOT NULL ORDER BY change' if restart
+          else 'SELECT job_id, job, embedding FROM jobs WHERE change > ? ORDER BY change',
+          () if restart else (change,)
+        ).fetchall()
+        last = self._last_change()
+      finally:
+        self._conn.execute('COMMIT')
+    return restart, [(row[0], _load_job(row[1], row[2])) for row in rows], last
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
+
+
+def _load_job(job: Optional[bytes], embedding: Optional[bytes]) -> Optional[JobRecommendationInput]:
+  if job is None:
+    return None
+  return JobRecommendationInput.model_validate({**json.loads(job), 'embeddings': np.frombuffer(embedding).tolist()})
+
+
+class JobCatalog:
+  """Upserted jobs with a skill-id -> rows inverted index; see the module docstring.
+
+  Instances opened on the same ``path`` (one per worker) hold the same jobs.
+  """
+
+  def __init__(self, path: str = ':memory:') -> None:
+    self._lock = threading.Lock()
+    self._store = _CatalogStore(path)
+    # The last log change this worker's index includes.
+    self._applied = 0
+    self._clear()
+
+  def _clear(self) -> None:
+    self._jobs: List[Optional[JobRecommendationInput]] = []
+    self._row_of: Dict[str, int] = {}
+    self._alive = np.zeros(0, dtype=bool)
+    self._vocabulary = SkillVocabulary()
+    self._required_sizes = np.zeros(0, dtype=np.int64)
+    self._nice_sizes = np.zeros(0, dtype=np.int64)
+    # Postings: skill id -> rows listing it (once per listing, so duplicates count twice as in the scorer).
+    self._required: Dict[int, array] = {}
+    self._nice: Dict[int, array] = {}
+    self._location_codes: Dict[str, int] = {}
+    self._locations = np.zeros(0, dtype=np.int64)
+    self._seniority_codes: Dict[str, int] = {}
+    self._seniorities = np.zeros(0, dtype=np.int64)
+    self._dim = 0
+    self._has_embedding = np.zeros(0, dtype=bool)
+    self._embeddings = np.zeros((0, 0), dtype=np.float32)
+    self._norms = np.zeros(0, dtype=np.float32)
+
+  def __len__(self) -> int:
+    """Live jobs in the shared store, whether or not this worker has applied them yet."""
+    return self._store.size()
+
+  def upsert(self, jobs: Sequence[JobRecommendationInput], removed_job_ids: Iterable[str] = ()) -> int:
+    """Drop ``removed_job_ids``, then add ``jobs`` (replacing any with the same ``job_id``). Returns the size.
+
+    Raises ``CatalogDimensionMismatch``, leaving the catalog unchanged, if a
+    job's embedding has a different dimension from the catalog's.
+    """
+    self._store.write(jobs, removed_job_ids)
+    with self._lock:
+      self._sync()
+      return len(self._row_of)
+
+  def _sync(self) -> None:
+    """Apply the log rows other writers (or this one) added since the last call. Holds ``_lock``."""
+    if self._store.last_change() == self._applied:
+      return
+    restart, rows, self._applied = self._store.read_since(self._applied)
+    if restart:
+      self._clear()
+    pending: List[JobRecommendationInput] = []
+    for job_id, job in rows:
+      if job is not None:
+        pending.append(job)
+        continue
+      self._append(pending)
+      pending = []
+      self._retire(job_id)
+    self._append(pending)
+    if len(self._jobs) - len(self._row_of) > max(len(self._row_of), _MIN_CAPACITY):
+      live = [job for job in self._jobs if job is not None]
+      self._clear()
+      self._append(live)
+
+  def _retire(self, job_id: str) -> None:
+    row = self._row_of.pop(job_id, None)
+    if row is not None:
+      self._jobs[row] = None
+      self._alive[row] = False
+
+  def _append(self, jobs: Sequence[JobRecommendationInput]) -> None:
+    if not jobs:
+      return
+    start, end = len(self._jobs), len(self._jobs) + len(jobs)
+    required, nice = self._vocabulary.encode(
+      [job.required_skills for job in jobs], [job.nice_to_have_skills for job in jobs], grow=True
+    )
+    self._jobs.extend(jobs)
+    self._alive = _grown(self._alive, end)
+    self._alive[start:end] = True
+    # A job_id repeated within the batch retires its earlier row like any other replacement.
+    for row, job in enumerate(jobs, start=start):
+      self._retire(job.job_id)
+      self._row_of[job.job_id] = row
+
+    self._required_sizes = _grown(self._required_sizes, end)
+    self._required_sizes[start:end] = required.sizes
+    self._nice_sizes = _grown(self._nice_sizes, end)
+    self._nice_sizes[start:end] = nice.sizes
+    _index(self._required, required, start)
+    _index(self._nice, nice, start)
+
+    self._locations = _grown(self._locations, end)
+    self._locations[start:end] = [_code(self._location_codes, _normalize_location(job.location)) for job in jobs]
+    self._seniorities = _grown(self._seniorities, end)
+    self._seniorities[start:end] = [
+      _code(self._seniority_codes, job.seniority.lower() if job.seniority else None) for job in jobs
+    ]
+
+    self._has_embedding = _grown(self._has_embedding, end)
+    embedded = [idx for idx, job in enumerate(jobs) if job.embeddings]
+    if not embedded:
+      return
+    if not self._dim:
+      self._dim = len(jobs[embedded[0]].embeddings)
+      self._embeddings = np.zeros((0, self._dim), dtype=np.float32)
+    unit, norms = l2_normalize(stack_embeddings([jobs[idx].embeddings for idx in embedded], self._dim))
+    rows = np.asarray(embedded, dtype=np.int64) + start
+    self._embeddings = _grown(self._embeddings, end)
+    self._norms = _grown(self._norms, end)
+    self._embeddings[rows] = unit
+    self._norms[rows] = norms
+    self._has_embedding[rows] = True
+
+  def top(self, candidate: CandidateProfile, k: int) -> Tuple[List[Tuple[JobRecommendationInput, float, float]], int]:
+    """``(job, rounded score, embedding score)`` for the ``k`` best jobs, and how many clear the threshold."""
+    with self._lock:
+      self._sync()
+      size = len(self._jobs)
+      if not self._row_of:
+        return [], 0
+      own = {self._vocabulary.lookup(skill) for skill in candidate.skills} - {-1}
+      skill = _counts(self._required, own, size) / np.maximum(self._required_sizes[:size], 1)
+      nice = _counts(self._nice, own, size) / np.maximum(self._nice_sizes[:size], 1)
+      embedding = self._embedding_column(candidate, size).astype(np.float64)
+      location = _location_matrix([candidate], self._locations[:size], self._location_codes)[0]
+      seniority = _seniority_matrix([candidate], self._seniorities[:size], self._seniority_codes)[0]
+      total = np.clip(_weighted(skill, nice, embedding, location, seniority), 0.0, 1.0)
+      _settle_edges(total, embedding, (skill, nice, location, seniority), self._pair(candidate), len(candidate.embeddings))
+      eligible = np.flatnonzero(self._alive[:size] & (total >= MIN_SCORE_THRESHOLD))
+      top = []
+      for pos, score in _top_k(total[eligible], k):
+        job = self._jobs[int(eligible[pos])]
+        similarity = _settled_similarity(float(embedding[eligible[pos]]), candidate.embeddings, job.embeddings)
+        top.append((job, score, similarity))
+      return top, len(eligible)
+
+  def _pair(self, candidate: CandidateProfile) -> Callable[[int], Tuple[Sequence[float], Sequence[float]]]:
+    """``_settle_edges``' (candidate, job) embeddings per row; retired rows have none."""
+    def pair(row: int) -> Tuple[Sequence[float], Sequence[float]]:
+      job = self._jobs[row]
+      return candidate.embeddings, job.embeddings if job is not None else ()
+    return pair
+
+  def _embedding_column(self, candidate: CandidateProfile, size: int) -> np.ndarray:
+    """``_embedding_similarity`` per row: jobs without an embedding, or a candidate of another dimension, score 0."""
+    scores = np.zeros(size, dtype=np.float32)
+    if not candidate.embeddings or len(candidate.embeddings) != self._dim:
+      return scores
+    cosine = cosine_one_to_many(as_array(candidate.embeddings), NormalizedMatrix(self._embeddings[:size], self._norms[:size]))
+    has = self._has_embedding[:size]
+    scores[has] = np.clip((cosine[has] + 1) / 2, 0.0, 1.0)
+    return scores
+
+
+def _index(postings: Dict[int, array], sets: SkillSets, start: int) -> None:
+  """Append row ``start + i`` to the postings of every id in row ``i`` of ``sets``."""
+  if not len(sets.ids):
+    return
+  order = np.argsort(sets.ids, kind='stable')
+  ids = sets.ids[order]
+  rows = (sets.row_index() + start)[order]
+  distinct, first = np.unique(ids, return_index=True)
+  bounds = first.tolist()
+  for skill_id, lo, hi in zip(distinct.tolist(), bounds, chain(bounds[1:], [len(ids)])):
+    postings.setdefault(skill_id, array('q')).frombytes(rows[lo:hi].tobytes())
+
+
+def _counts(postings: Dict[int, array], own: Set[int], size: int) -> np.ndarray:
+  """Per row, how many of its listed skills are in ``own``; only the postings of ``own`` are read."""
+  hits = [np.frombuffer(postings[skill_id], dtype=np.int64) for skill_id in own if skill_id in postings]
+  if not hits:
+    return np.zeros(size, dtype=np.int64)
+  return np.bincount(np.concatenate(hits), minlength=size)
+
+
+def recommend_from_catalog(payload: CatalogRecommendationRequest) -> RecommendationResponse:
+  with collect_timings('recommend_catalog') as timings:
+    response = _recommend_from_catalog(payload)
+  if payload.include_timings:
+    response.timings = timings.as_dict()
+  return response
+
+
+def _recommend_from_catalog(payload: CatalogRecommendationRequest) -> RecommendationResponse:
+  candidate = payload.candidate
+  with span('recommend_catalog.scoring'):
+    top, total_matches = get_job_catalog().top(candidate, payload.top_k)
+
+  candidate_skills = set(_normalized(candidate.skills))
+  ranked = [
+    RecommendedJob(
+      job_id=job.job_id,
+      title=job.title,
+      location=job.location,
+      score=score,
+      rank=rank,
+      reason=_reason(_shared_skills(candidate_skills, job), embedding_score, job),
+    )
+    for rank, (job, score, embedding_score) in enumerate(top, start=1)
+  ]
+  return RecommendationResponse(ranked_jobs=ranked, total_matches=total_matches, generated_at=timestamp())
+
+
+_CATALOG: Optional[JobCatalog] = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def _default_catalog_path() -> str:
+  return str(Path(__file__).resolve().parents[1] / 'data' / 'job_catalog.sqlite3')
+
+
+def get_job_catalog() -> JobCatalog:
+  global _CATALOG
+  with _CATALOG_LOCK:
+    if _CATALOG is None:
+      _CATALOG = JobCatalog(get_settings().job_catalog_path or _default_catalog_path())
+    return _CATALOG
@@ -0,0 +1,77 @@
+"""RSE evaluation states kept between ``/ai/match`` calls, so re-scoring an edited resume is incremental.
+
+A match request that carries ``resume_id`` stores the ``EvaluationState`` of
+its resume text under the resume id and the job fields the requirements are
+built from. The next match of that resume against the same job diffs the new
+text against the stored one (``diff_text``) and re-scores with
+``reevaluate_requirements``; an unchanged text reuses the previous results.
+This is what the backend's rescoring of a corrected resume goes through.
+
+The re-evaluated results equal a full evaluation, so this is a cache only: a
+miss (evicted, another worker, a restart) costs one full evaluation and
+changes nothing in the response. States are bounded by count, least recently
+used first out.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from models.match import MatchRequest
+from services.rse_engine import EvaluationState
+from utils.settings import get_settings
+
+
+def match_state_key(payload: MatchRequest) -> Optional[bytes]:
+  """Cache key for ``payload``'s resume against its job, or None without a ``resume_id``."""
+  if not payload.resume_id:
+    return None
+  job = payload.model_dump_json(include={'job_summary', 'job_required_skills', 'scoring_config'})
+  return hashlib.blake2b(f'{payload.resume_id}\0{job}'.encode('utf-8'), digest_size=16).digest()
+
+
+class MatchStateCache:
+  """LRU of ``EvaluationState`` by ``match_state_key``."""
+
+  def __init__(self, max_entries: int = 256) -> None:
+    self.max_entries = max(0, max_entries)
+    self.hits = 0
+    self.misses = 0
+    self._entries: 'OrderedDict[bytes, EvaluationState]' = OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(self, key: bytes) -> Optional[EvaluationState]:
+    with self._lock:
+      state = self._entries.get(key)
+      if state is None:
+        self.misses += 1
+        return None
+      self.hits += 1
+      self._entries.move_to_end(key)
+      return state
+
+  def put(self, key: bytes, state: EvaluationState) -> None:
+    if not self.max_entries:
+      return
+    with self._lock:
+      self._entries[key] = state
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+
+_CACHE: Optional[MatchStateCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_match_state_cache() -> MatchStateCache:
+  global _CACHE
+  with _CACHE_LOCK:
+    if _CACHE is None:
+      _CACHE = MatchStateCache(get_settings().match_state_cache_size)
+    return _CACHE
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import hashlib
-from typing import List
+from typing import List, Optional, Tuple
 
 from models.job import JobDescriptionResponse
 from models.match import MatchRequest, MatchResponse
-from models.rse import JDRequirement
-from services.rse_engine import build_requirements, calculate_scores, evaluate_requirements
+from services.rse_engine import (
+  EvaluationState,
+  Requirement,
+  build_requirements,
+  calculate_scores,
+  diff_text,
+  evaluate_requirements_state,
+  reevaluate_requirements,
+)
 from services.skill_utils import extract_skills, normalize_skill_list
+from utils.timing import collect_timings, span
 
 def _normalize(skills: List[str]) -> List[str]:
   return sorted(set(normalize_skill_list(skills)))
@@ -38,7 +46,7 @@ def _build_jd_payload(payload: MatchRequest) -> tuple[str, JobDescriptionRespons
   return job_text, jd_resp
 
 
-def _requirement_index(requirements: List[JDRequirement]) -> dict:
+def _requirement_index(requirements: List[Requirement]) -> dict:
   return {req.id: req for req in requirements}
 
 
@@ -47,15 +55,43 @@ def _hash_text(text: str) -> str:
 
 
 def score_match(payload: MatchRequest) -> MatchResponse:
-  job_text, jd_resp = _build_jd_payload(payload)
-  requirements = build_requirements(job_text, jd_resp)
+  return score_match_state(payload)[0]
+
+
+def score_match_state(
+  payload: MatchRequest,
+  previous: Optional[EvaluationState] = None
+) -> Tuple[MatchResponse, EvaluationState]:
+  """``score_match`` plus the RSE state behind it.
+
+  With the ``previous`` state of the same resume against the same job, only
+  what the text edit since then can affect is re-evaluated; the response is
+  the same as without it.
+  """
+  with collect_timings('match') as timings:
+    response, state = _score_match(payload, previous)
+  if payload.include_timings:
+    response.timings = timings.as_dict()
+  return response, state
+
+
+def _score_match(payload: MatchRequest, previous: Optional[EvaluationState]) -> Tuple[MatchResponse, EvaluationState]:
+  with span('match.jd'):
+    job_text, jd_resp = _build_jd_payload(payload)
+    requirements = build_requirements(job_text, jd_resp)
 
   resume_text = (payload.resume_text or payload.resume_summary or '').strip()
-  resume_skills = normalize_skill_list(payload.resume_skills or [])
-  if resume_text:
-    resume_skills = normalize_skill_list(resume_skills + extract_skills(resume_text))
-  results = evaluate_requirements(requirements, resume_text)
-  breakdown = calculate_scores(requirements, results)
+  with span('match.skills'):
+    resume_skills = normalize_skill_list(payload.resume_skills or [])
+    if resume_text:
+      resume_skills = normalize_skill_list(resume_skills + extract_skills(resume_text))
+  with span('match.rse'):
+    if previous is None:
+      state = evaluate_requirements_state(requirements, resume_text)
+    else:
+      state = reevaluate_requirements(requirements, previous, diff_text(previous.segments.text, resume_text))
+    results = state.results
+    breakdown = calculate_scores(requirements, results)
 
   req_index = _requirement_index(requirements)
   matched = [
@@ -82,7 +118,8 @@ def score_match(payload: MatchRequest) -> MatchResponse:
     'preferredScore': breakdown.preferredScore,
     'evidenceStrengthScore': breakdown.evidenceStrengthScore,
     'counts': breakdown.counts,
-    'requirements': [res.dict() for res in results]
+    # Slotted Evaluation dataclasses; they serialize with the response like RequirementResult.
+    'requirements': results
   }
 
   score_breakdown = {
@@ -101,7 +138,8 @@ def score_match(payload: MatchRequest) -> MatchResponse:
       'resumeSha': _hash_text(resume_text),
       'jobSha': _hash_text(job_text),
       'requirementCounts': breakdown.counts,
-      'requirementsEvaluated': len(results)
+      'requirementsEvaluated': len(results),
+      'requirementsRescored': state.evaluated
     }
 
   model_metadata = {
@@ -115,7 +153,7 @@ def score_match(payload: MatchRequest) -> MatchResponse:
     }
   }
 
-  return MatchResponse(
+  response = MatchResponse(
     match_score=match_score,
     matched_skills=matched,
     missing_critical_skills=missing,
@@ -129,4 +167,5 @@ def score_match(payload: MatchRequest) -> MatchResponse:
     missing_nice_to_have_skills=[],
     trace=trace
   )
+  return response, state
 
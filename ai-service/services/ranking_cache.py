@@ -0,0 +1,229 @@
+"""Per-candidate rankings kept between ``/ai/recommend`` calls for delta refreshes.
+
+A full ``/ai/recommend`` call with ``issue_ranking_token`` stores its ranking
+under a new token. A later call that sends the token, the jobs added or
+changed since and ``removed_job_ids`` scores only those jobs and merges them
+into the stored ranking. The result is the ranking a full call would return
+for the updated job list: the previous jobs in their previous order, followed
+by the delta jobs.
+
+Rankings are stored in a SQLite file (``AI_RECOMMEND_CACHE_PATH``) shared by
+every worker on the host, so a token issued by one worker refreshes on any
+other. Every ranked job is its own row, so a merge is one write transaction
+that touches only the delta's rows; the merged ranking is read back in rank
+order through an index. Rankings are bounded by count and idle time. A token that is expired, evicted or issued for a different
+candidate profile cannot be refreshed; the route answers 409
+``ranking_token_expired`` and the caller falls back to a full request. Cache
+errors are logged and treated the same way.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from models.recommendation import CandidateProfile, RecommendedJob
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _candidate_key(candidate: CandidateProfile) -> bytes:
+  return hashlib.blake2b(candidate.model_dump_json().encode('utf-8'), digest_size=16).digest()
+
+
+class RankingCache:
+  """Rankings by token in SQLite, least recently used evicted first, each expiring ``ttl_seconds`` after its last use.
+
+  Instances opened on the same ``path`` (one per worker) see the same rankings.
+  """
+
+  _SCHEMA = (
+    # Earlier releases kept each ranking as one JSON blob; those tokens are simply dropped.
+    'DROP TABLE IF EXISTS rankings',
+    'CREATE TABLE IF NOT EXISTS ranking_tokens ('
+    ' token TEXT PRIMARY KEY,'
+    ' candidate_key BLOB NOT NULL,'
+    ' expires_at REAL NOT NULL,'
+    ' used INTEGER NOT NULL,'
+    ' next_seq INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS ranking_tokens_used ON ranking_tokens (used)',
+    # ``seq`` grows with insertion, so (-score, seq) order keeps ties in input order, as a full ranking does.
+    'CREATE TABLE IF NOT EXISTS ranked_jobs ('
+    ' token TEXT NOT NULL,'
+    ' seq INTEGER NOT NULL,'
+    ' job_id TEXT NOT NULL,'
+    ' score REAL NOT NULL,'
+    ' reason TEXT NOT NULL,'
+    ' title TEXT,'
+    ' location TEXT,'
+    ' PRIMARY KEY (token, seq))',
+    'CREATE INDEX IF NOT EXISTS ranked_jobs_order ON ranked_jobs (token, score DESC, seq)',
+    'CREATE INDEX IF NOT EXISTS ranked_jobs_job_id ON ranked_jobs (token, job_id)',
+  )
+
+  def __init__(self, max_entries: int = 256, ttl_seconds: float = 1800.0, path: str = ':memory:') -> None:
+    self.max_entries = max(0, max_entries)
+    self.ttl_seconds = ttl_seconds
+    self.path = path
+    self._lock = threading.Lock()
+    if path != ':memory:':
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    if path != ':memory:':
+      self._conn.execute('PRAGMA journal_mode=WAL')
+      self._conn.execute('PRAGMA synchronous=NORMAL')
+    for statement in self._SCHEMA:
+      self._conn.execute(statement)
+
+  def __len__(self) -> int:
+    with self._lock:
+      return self._conn.execute('SELECT COUNT(*) FROM ranking_tokens').fetchone()[0]
+
+  @contextmanager
+  def _transaction(self) -> Iterator[sqlite3.Connection]:
+    # IMMEDIATE takes the write lock up front, so concurrent merges from other workers serialize.
+    with self._lock:
+      self._conn.execute('BEGIN IMMEDIATE')
+      try:
+        yield self._conn
+      except BaseException:
+        self._conn.execute('ROLLBACK')
+        raise
+      self._conn.execute('COMMIT')
+
+  @staticmethod
+  def _next_use(conn: sqlite3.Connection) -> int:
+    return conn.execute('SELECT COALESCE(MAX(used), 0) + 1 FROM ranking_tokens').fetchone()[0]
+
+  @staticmethod
+  def _insert(conn: sqlite3.Connection, token: str, first_seq: int, jobs: Sequence[RecommendedJob]) -> None:
+    conn.executemany(
+      'INSERT INTO ranked_jobs VALUES (?, ?, ?, ?, ?, ?, ?)',
+      [
+        (token, seq, job.job_id, job.score, job.reason, job.title, job.location)
+        for seq, job in enumerate(jobs, start=first_seq)
+      ]
+    )
+
+  @staticmethod
+  def _drop(conn: sqlite3.Connection, tokens: Sequence[str]) -> None:
+    rows = [(token,) for token in tokens]
+    conn.executemany('DELETE FROM ranked_jobs WHERE token = ?', rows)
+    conn.executemany('DELETE FROM ranking_tokens WHERE token = ?', rows)
+
+  def store(self, candidate: CandidateProfile, ranked_jobs: Sequence[RecommendedJob]) -> Optional[str]:
+    """Keep ``ranked_jobs`` (already in rank order) and return its token, or None when caching is disabled."""
+    if not self.max_entries:
+      return None
+    token = secrets.token_urlsafe(16)
+    now = time.time()
+    try:
+      with self._transaction() as conn:
+        conn.execute(
+          'INSERT INTO ranking_tokens VALUES (?, ?, ?, ?, ?)',
+          (token, _candidate_key(candidate), now + self.ttl_seconds, self._next_use(conn), len(ranked_jobs))
+        )
+        self._insert(conn, token, 0, ranked_jobs)
+        stale = conn.execute(
+          'SELECT token FROM ranking_tokens WHERE expires_at <= ?'
+          ' UNION SELECT token FROM (SELECT token FROM ranking_tokens ORDER BY used DESC LIMIT -1 OFFSET ?)',
+          (now, self.max_entries)
+        ).fetchall()
+        self._drop(conn, [row[0] for row in stale])
+    except sqlite3.Error as exc:
+      logger.warning('ranking_cache_error', extra={'event': 'ranking_cache_error', 'op': 'store', 'error': str(exc)})
+      return None
+    return token
+
+  def _live(self, row: Optional[tuple], candidate: CandidateProfile) -> bool:
+    """Whether a ``(candidate_key, expires_at, ...)`` row is unexpired and belongs to ``candidate``."""
+    return row is not None and row[1] > time.time() and row[0] == _candidate_key(candidate)
+
+  def contains(self, token: str, candidate: CandidateProfile) -> bool:
+    try:
+      with self._lock:
+        # A plain autocommit read: no write lock, so it never waits on other workers' merges.
+        row = self._conn.execute(
+          'SELECT candidate_key, expires_at FROM ranking_tokens WHERE token = ?', (token,)
+        ).fetchone()
+    except sqlite3.Error as exc:
+      logger.warning('ranking_cache_error', extra={'event': 'ranking_cache_error', 'op': 'contains', 'error': str(exc)})
+      return False
+    return self._live(row, candidate)
+
+  def merge(
+    self,
+    token: str,
+    candidate: CandidateProfile,
+    delta_job_ids: Iterable[str],
+    removed_job_ids: Iterable[str],
+    ranked_delta: Sequence[RecommendedJob]
+  ) -> Optional[List[RecommendedJob]]:
+    """Apply a delta to the ranking behind ``token`` and return the new full ranking, or None if it is gone.
+
+    ``delta_job_ids`` are every job sent in the delta, ``ranked_delta`` the
+    ones that cleared the score threshold, in rank order. Delta jobs already
+    in the ranking are replaced (or dropped if they no longer qualify). Only
+    the rows of those jobs and of ``removed_job_ids`` are written.
+    """
+    try:
+      with self._transaction() as conn:
+        row = conn.execute(
+          'SELECT candidate_key, expires_at, next_seq FROM ranking_tokens WHERE token = ?', (token,)
+        ).fetchone()
+        if not self._live(row, candidate):
+          if row is not None and row[1] <= time.time():
+            self._drop(conn, [token])
+          return None
+        gone = [(token, job_id) for job_id in {*removed_job_ids, *delta_job_ids}]
+        conn.executemany('DELETE FROM ranked_jobs WHERE token = ? AND job_id = ?', gone)
+        # Rank order lists equal scores in input order, so new sequence numbers keep that order too.
+        self._insert(conn, token, row[2], ranked_delta)
+        conn.execute(
+          'UPDATE ranking_tokens SET expires_at = ?, used = ?, next_seq = ? WHERE token = ?',
+          (time.time() + self.ttl_seconds, self._next_use(conn), row[2] + len(ranked_delta), token)
+        )
+        ranked = conn.execute(
+          'SELECT job_id, score, reason, title, location FROM ranked_jobs WHERE token = ? ORDER BY score DESC, seq',
+          (token,)
+        ).fetchall()
+    except sqlite3.Error as exc:
+      logger.warning('ranking_cache_error', extra={'event': 'ranking_cache_error', 'op': 'merge', 'error': str(exc)})
+      return None
+    # The rows were validated when they were stored.
+    return [
+      RecommendedJob.model_construct(job_id=job_id, score=score, rank=rank, reason=reason, title=title, location=location)
+      for rank, (job_id, score, reason, title, location) in enumerate(ranked, start=1)
+    ]
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
+
+
+def _default_cache_path() -> str:
+  return str(Path(__file__).resolve().parents[1] / 'data' / 'ranking_cache.sqlite3')
+
+
+_CACHE: Optional[RankingCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_ranking_cache() -> RankingCache:
+  global _CACHE
+  with _CACHE_LOCK:
+    if _CACHE is None:
+      settings = get_settings()
+      _CACHE = RankingCache(
+        settings.recommend_cache_size,
+        settings.recommend_cache_ttl_seconds,
+        settings.recommend_cache_path or _default_cache_path()
+      )
+    return _CACHE
@@ -1,16 +1,31 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
+
+from utils.embedding_codec import as_array, stack_embeddings
 from utils.embeddings_client import cosine_similarity
+from utils.vector_ops import cosine_one_to_many, l2_normalize
 from models.recommendation import (
+  BatchRecommendationRequest,
+  BatchRecommendationResponse,
   CandidateProfile,
+  CandidateRankingRequest,
+  CandidateRankingResponse,
+  CandidateRecommendations,
   JobRecommendationInput,
+  RankedCandidate,
   RecommendationRequest,
   RecommendationResponse,
   RecommendedJob,
 )
 from utils.mock_data import timestamp
+from utils.settings import get_settings
+from utils.skill_sets import SkillSets, SkillVocabulary, get_skill_vocabulary
+from utils.timing import collect_timings, span
 
 SKILL_WEIGHT = 0.45
 NICE_TO_HAVE_WEIGHT = 0.1
@@ -51,6 +66,89 @@ def _embedding_similarity(candidate: CandidateProfile, job: JobRecommendationInp
   return _clamp01((cosine_similarity(candidate.embeddings, job.embeddings) + 1) / 2)
 
 
+def _embedding_scores(query: Sequence[float], others: Sequence[Sequence[float]]) -> np.ndarray:
+  """``_embedding_similarity`` of ``query`` against every vector in ``others`` in one pass.
+
+  The vectors are stacked into a float32 matrix once per request. Empty
+  vectors, or ones with a different dimension than ``query``, score 0.
+  """
+  scores = np.zeros(len(others), dtype=np.float32)
+  if not query or not others:
+    return scores
+  dim = len(query)
+  rows = [idx for idx, vector in enumerate(others) if vector and len(vector) == dim]
+  if not rows:
+    return scores
+
+  matrix = stack_embeddings([others[idx] for idx in rows], dim)
+  cosine = cosine_one_to_many(as_array(query), matrix)
+  # zero-norm vectors keep the scalar path's (0 + 1) / 2 midpoint
+  scores[rows] = np.clip((cosine + 1) / 2, 0.0, 1.0)
+  return scores
+
+
+def _float32_drift(dim: int) -> float:
+  """Bound on how far a float32 ``_embedding_scores`` value moves a total from the float64 ``_score_job`` one.
+
+  A float32 dot product of unit vectors is within ``dim * 2**-24`` of the
+  exact cosine (the standard summation bound, plus a few ulps for the
+  normalization). The similarity halves that and ``EMBEDDING_WEIGHT`` scales it.
+  """
+  return EMBEDDING_WEIGHT / 2 * (dim + 4) * 2.0 ** -24
+
+
+def _near_edges(total: np.ndarray, drift: float) -> np.ndarray:
+  """Positions whose score could round to another 3-place value, or cross ``MIN_SCORE_THRESHOLD``, within ``drift``."""
+  scaled = total * 1e3
+  to_half = np.abs(scaled - np.floor(scaled) - 0.5) / 1e3
+  return np.flatnonzero((to_half <= drift) | (np.abs(total - MIN_SCORE_THRESHOLD) <= drift))
+
+
+def _settle_edges(
+  total: np.ndarray,
+  embedding: np.ndarray,
+  columns: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+  pair: Callable[[int], Tuple[Sequence[float], Sequence[float]]],
+  dim: int
+) -> None:
+  """Recompute, in place and in float64, the scores float32 drift could round differently.
+
+  ``columns`` are the skill, nice-to-have, location and seniority scores and
+  ``pair(pos)`` the (candidate, job) embeddings behind ``total[pos]``. The
+  recomputed total is ``_score_job``'s, so every rounded score, the threshold
+  cut and therefore the ranking equal the per-pair path.
+  """
+  if not dim:
+    return
+  for pos in _near_edges(total, _float32_drift(dim)).tolist():
+    query, vector = pair(pos)
+    if not query or not vector or len(query) != len(vector):
+      continue  # scored 0 exactly, as the per-pair path does
+    exact = _clamp01((cosine_similarity(query, vector) + 1) / 2)
+    skill, nice, location, seniority = (float(column[pos]) for column in columns)
+    embedding[pos] = exact
+    total[pos] = _clamp01(_weighted(skill, nice, exact, location, seniority))
+
+
+def _settled_similarity(score: float, query: Sequence[float], vector: Sequence[float]) -> float:
+  """``score``, or its float64 ``_embedding_similarity`` when float32 drift could move it across a ``_reason`` cut.
+
+  ``_settle_edges`` only recomputes scores whose total is near an edge, so a
+  similarity near 0.5 or 0.75 can still be a float32 value.
+  """
+  if not query or not vector or len(query) != len(vector):
+    return score  # scored 0 exactly, as the per-pair path does
+  drift = _float32_drift(len(query)) / EMBEDDING_WEIGHT
+  if all(abs(score - cut) > drift for cut in _REASON_CUTS):
+    return score
+  return _clamp01((cosine_similarity(query, vector) + 1) / 2)
+
+
+def _embedding_similarities(candidate: CandidateProfile, jobs: Sequence[JobRecommendationInput]) -> np.ndarray:
+  """Vectorized ``_embedding_similarity`` for every job."""
+  return _embedding_scores(candidate.embeddings, [job.embeddings for job in jobs])
+
+
 def _location_alignment(candidate: CandidateProfile, job: JobRecommendationInput) -> float:
   preferred = {_normalize_location(loc) for loc in candidate.preferred_locations if loc}
   job_loc = _normalize_location(job.location)
@@ -79,6 +177,10 @@ def _clamp01(value: float) -> float:
   return max(0.0, min(1.0, value))
 
 
+# Similarity levels that change the reason text (see ``_reason`` and ``_candidate_reason``).
+_REASON_CUTS = (0.5, 0.75)
+
+
 def _reason(overlap: List[str], embedding_score: float, job: JobRecommendationInput) -> str:
   parts = []
   if overlap:
@@ -92,46 +194,468 @@ def _reason(overlap: List[str], embedding_score: float, job: JobRecommendationIn
   return '; '.join(parts) or 'Recommended based on your skills and profile'
 
 
-def _score_job(candidate: CandidateProfile, job: JobRecommendationInput) -> Tuple[float, List[str], float, float, float]:
+def _score_job(
+  candidate: CandidateProfile,
+  job: JobRecommendationInput,
+  embedding_score: Optional[float] = None
+) -> Tuple[float, List[str], float, float, float]:
   skill_score, overlap = _skill_overlap(candidate.skills, job.required_skills)
   nice_score, nice_overlap = _nice_to_have_overlap(candidate.skills, job.nice_to_have_skills)
-  embedding_score = _embedding_similarity(candidate, job)
+  if embedding_score is None:
+    embedding_score = _embedding_similarity(candidate, job)
   location_score = _location_alignment(candidate, job)
   seniority_score = _seniority_alignment(candidate, job)
 
-  total = (
-    SKILL_WEIGHT * skill_score
-    + NICE_TO_HAVE_WEIGHT * nice_score
-    + EMBEDDING_WEIGHT * embedding_score
-    + LOCATION_WEIGHT * location_score
-    + SENIORITY_WEIGHT * seniority_score
-  )
+  total = _weighted(skill_score, nice_score, embedding_score, location_score, seniority_score)
   combined_overlap = overlap or nice_overlap
   return _clamp01(total), combined_overlap, embedding_score, location_score, seniority_score
 
 
+def _weighted(skill, nice, embedding, location, seniority):
+  """Unclamped total; works on floats and on NumPy columns alike."""
+  return (
+    SKILL_WEIGHT * skill
+    + NICE_TO_HAVE_WEIGHT * nice
+    + EMBEDDING_WEIGHT * embedding
+    + LOCATION_WEIGHT * location
+    + SENIORITY_WEIGHT * seniority
+  )
+
+
+def _skill_coverages(candidate: CandidateProfile, jobs: Sequence[JobRecommendationInput]) -> Tuple[np.ndarray, np.ndarray]:
+  """``_skill_overlap`` and ``_nice_to_have_overlap`` coverage of the candidate for every job.
+
+  Job skill lists become rows of skill ids and the candidate a membership
+  mask, so both coverages are a gather plus a per-row count.
+  """
+  required, nice, own = get_skill_vocabulary().encode(
+    [job.required_skills for job in jobs], [job.nice_to_have_skills for job in jobs], [candidate.skills]
+  )
+  members = own.mask()
+  return (
+    required.count_in(members) / np.maximum(required.sizes, 1),
+    nice.count_in(members) / np.maximum(nice.sizes, 1)
+  )
+
+
+def _shared_skills(candidate_skills: Set[str], job: JobRecommendationInput) -> List[str]:
+  """The overlap ``_score_job`` reports: required skills the candidate has, else nice-to-have ones."""
+  overlap = [skill for skill in _normalized(job.required_skills) if skill in candidate_skills]
+  if not overlap:
+    overlap = [skill for skill in _normalized(job.nice_to_have_skills) if skill in candidate_skills]
+  return overlap
+
+
 def recommend_jobs(payload: RecommendationRequest) -> RecommendationResponse:
-  candidate = payload.candidate
+  with collect_timings('recommend') as timings:
+    response = _recommend_jobs(payload)
+  if payload.include_timings:
+    response.timings = timings.as_dict()
+  return response
+
+
+def _recommend_jobs(payload: RecommendationRequest) -> RecommendationResponse:
+  candidate, jobs = payload.candidate, payload.jobs
   ranked: List[RecommendedJob] = []
 
-  for job in payload.jobs:
-    score, overlap, embedding_score, _, _ = _score_job(candidate, job)
-    if score < MIN_SCORE_THRESHOLD:
-      continue
+  with span('recommend.embeddings'):
+    embedding = _embedding_similarities(candidate, jobs).astype(np.float64)
+  with span('recommend.scoring'):
+    skill, nice = _skill_coverages(candidate, jobs)
+    location = np.array([_location_alignment(candidate, job) for job in jobs], dtype=np.float64)
+    seniority = np.array([_seniority_alignment(candidate, job) for job in jobs], dtype=np.float64)
+    total = np.clip(_weighted(skill, nice, embedding, location, seniority), 0.0, 1.0)
+    _settle_edges(
+      total,
+      embedding,
+      (skill, nice, location, seniority),
+      lambda pos: (candidate.embeddings, jobs[pos].embeddings),
+      len(candidate.embeddings)
+    )
 
-    ranked.append(
-      RecommendedJob(
-        job_id=job.job_id,
-        title=job.title,
-        location=job.location,
-        score=round(score, 3),
-        rank=0,  # temporary, assigned after sorting
-        reason=_reason(overlap, embedding_score, job),
+    candidate_skills = set(_normalized(candidate.skills))
+    for idx in np.flatnonzero(total >= MIN_SCORE_THRESHOLD).tolist():
+      job = jobs[idx]
+      ranked.append(
+        RecommendedJob(
+          job_id=job.job_id,
+          title=job.title,
+          location=job.location,
+          score=round(float(total[idx]), 3),
+          rank=0,  # temporary, assigned after sorting
+          reason=_reason(
+            _shared_skills(candidate_skills, job),
+            _settled_similarity(float(embedding[idx]), candidate.embeddings, job.embeddings),
+            job
+          ),
+        )
       )
-    )
 
   ranked = sorted(ranked, key=lambda item: item.score, reverse=True)
   for idx, job in enumerate(ranked, start=1):
     job.rank = idx
 
   return RecommendationResponse(ranked_jobs=ranked, generated_at=timestamp())
+
+
+def _coverage_columns(
+  job: JobRecommendationInput,
+  candidates: Sequence[CandidateProfile]
+) -> Tuple[np.ndarray, np.ndarray]:
+  """``_skill_overlap`` and ``_nice_to_have_overlap`` coverage of ``job`` for every candidate.
+
+  Each candidate becomes one row of a membership matrix over the job's skill
+  ids, so both coverages are a mat-vec with per-id counts. Duplicates in the
+  job's lists count twice, as in the scalar path.
+  """
+  required, nice, pool = get_skill_vocabulary().encode(
+    [job.required_skills], [job.nice_to_have_skills], [candidate.skills for candidate in candidates]
+  )
+  terms = np.unique(np.concatenate([required.ids, nice.ids]))
+  required_counts = np.bincount(required.ids, minlength=pool.universe)[terms].astype(np.float64)
+  nice_counts = np.bincount(nice.ids, minlength=pool.universe)[terms].astype(np.float64)
+
+  # Scattering into a matrix counts a skill a candidate lists twice only once, as the scalar path's set does.
+  column_of = np.full(pool.universe, -1, dtype=np.int64)
+  column_of[terms] = np.arange(len(terms))
+  cols = column_of[pool.ids]
+  hit = cols >= 0
+  membership = np.zeros((len(candidates), len(terms)), dtype=np.float64)
+  membership[pool.row_index()[hit], cols[hit]] = 1.0
+  return (
+    membership @ required_counts / max(len(required.ids), 1),
+    membership @ nice_counts / max(len(nice.ids), 1)
+  )
+
+
+def _location_column(job: JobRecommendationInput, candidates: Sequence[CandidateProfile]) -> np.ndarray:
+  """``_location_alignment`` of ``job`` for every candidate."""
+  job_loc = _normalize_location(job.location)
+  remote = job_loc == 'remote'
+  # 0: no preference, 1: job location preferred, 2: other preferences; memoized per distinct preference list.
+  kind_of: Dict[Tuple[str, ...], int] = {}
+
+  def kind(preferences: Tuple[str, ...]) -> int:
+    preferred = {_normalize_location(loc) for loc in preferences if loc}
+    return 0 if not preferred else 1 if job_loc in preferred else 2
+
+  kinds = np.fromiter(
+    (
+      kind_of[key] if key in kind_of else kind_of.setdefault(key, kind(key))
+      for key in map(tuple, (candidate.preferred_locations for candidate in candidates))
+    ),
+    dtype=np.int64,
+    count=len(candidates)
+  )
+  return np.array([0.6 if remote else 0.4, 1.0, 0.7 if remote else 0.2])[kinds]
+
+
+def _seniority_column(job: JobRecommendationInput, candidates: Sequence[CandidateProfile]) -> np.ndarray:
+  """``_seniority_alignment`` of ``job`` for every candidate."""
+  if not job.seniority:
+    return np.full(len(candidates), 0.5)
+  wanted = job.seniority.lower()
+  return np.fromiter(
+    (0.5 if not c.seniority else 1.0 if c.seniority.lower() == wanted else 0.3 for c in candidates),
+    dtype=np.float64,
+    count=len(candidates)
+  )
+
+
+def _code(codes: Dict[str, int], value: Optional[str]) -> int:
+  """Small integer code for a normalized location or seniority; -1 when there is none."""
+  return -1 if value is None else codes.setdefault(value, len(codes))
+
+
+def _location_matrix(candidates: Sequence[CandidateProfile], job_codes: np.ndarray, codes: Dict[str, int]) -> np.ndarray:
+  """``_location_alignment`` for every candidate (rows) and job (columns), jobs given as ``_code`` values."""
+  remote = job_codes == codes.get('remote', -2)
+  # Column ``len(codes)`` stands for jobs without a location, which no preference matches.
+  preferred = np.zeros((len(candidates), len(codes) + 1), dtype=bool)
+  has_preference = np.zeros(len(candidates), dtype=bool)
+  for row, candidate in enumerate(candidates):
+    wanted = {_normalize_location(loc) for loc in candidate.preferred_locations if loc}
+    has_preference[row] = bool(wanted)
+    preferred[row, [codes[loc] for loc in wanted if loc in codes]] = True
+  hit = preferred[:, np.where(job_codes < 0, len(codes), job_codes)]
+  return np.where(
+    has_preference[:, None],
+    np.where(hit, 1.0, np.where(remote, 0.7, 0.2)),
+    np.where(remote, 0.6, 0.4)
+  )
+
+
+def _seniority_matrix(candidates: Sequence[CandidateProfile], job_codes: np.ndarray, codes: Dict[str, int]) -> np.ndarray:
+  """``_seniority_alignment`` for every candidate (rows) and job (columns), jobs given as ``_code`` values."""
+  wanted = np.fromiter(
+    (codes.get(c.seniority.lower(), -2) if c.seniority else -1 for c in candidates),
+    dtype=np.int64,
+    count=len(candidates)
+  )
+  return np.where(
+    (wanted[:, None] == -1) | (job_codes[None, :] < 0),
+    0.5,
+    np.where(job_codes[None, :] == wanted[:, None], 1.0, 0.3)
+  )
+
+
+# Two scores that round to the same 3-place value are less than 1e-3 apart, so
+# anything that can tie with the k-th best lies within 1e-3 below it. Twice
+# that keeps the shortlist exact whichever way a half-way value rounds.
+_TIE_MARGIN = 2e-3
+
+
+def _top_k(scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+  """``(position, rounded score)`` of the ``k`` best ``scores``, ranked as ``recommend_jobs`` ranks jobs.
+
+  That is a stable sort on the score rounded to 3 places, so ties keep
+  request order. Rounding is monotonic, so only scores within rounding
+  distance of the k-th best raw score can tie with it. Only those are
+  rounded and sorted.
+  """
+  if len(scores) > k:
+    cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+    shortlist = np.flatnonzero(scores >= cutoff - _TIE_MARGIN)
+  else:
+    shortlist = np.arange(len(scores))
+  rounded = [round(value, 3) for value in scores[shortlist].tolist()]
+  order = sorted(range(len(rounded)), key=lambda pos: -rounded[pos])[:k]
+  return [(int(shortlist[pos]), rounded[pos]) for pos in order]
+
+
+def _candidate_reason(overlap: List[str], embedding_score: float, candidate: CandidateProfile) -> str:
+  parts = []
+  if overlap:
+    parts.append(f"Skill overlap: {', '.join(overlap[:3])}")
+  if embedding_score >= 0.75:
+    parts.append('High semantic similarity to the job')
+  elif embedding_score >= 0.5:
+    parts.append('Moderate semantic similarity')
+  if candidate.location:
+    parts.append(f"Location: {candidate.location}")
+  return '; '.join(parts) or 'Ranked by skills and profile fit'
+
+
+def rank_candidates(payload: CandidateRankingRequest) -> CandidateRankingResponse:
+  with collect_timings('recommend_candidates') as timings:
+    response = _rank_candidates(payload)
+  if payload.include_timings:
+    response.timings = timings.as_dict()
+  return response
+
+
+def _rank_candidates(payload: CandidateRankingRequest) -> CandidateRankingResponse:
+  """Score one job against every candidate with ``_score_job``'s weights, one column per component."""
+  job, candidates = payload.job, payload.candidates
+
+  with span('recommend_candidates.embeddings'):
+    embedding = _embedding_scores(job.embeddings, [candidate.embeddings for candidate in candidates]).astype(np.float64)
+  with span('recommend_candidates.scoring'):
+    skill, nice = _coverage_columns(job, candidates)
+    location = _location_column(job, candidates)
+    seniority = _seniority_column(job, candidates)
+    total = np.clip(_weighted(skill, nice, embedding, location, seniority), 0.0, 1.0)
+    _settle_edges(
+      total,
+      embedding,
+      (skill, nice, location, seniority),
+      lambda pos: (candidates[pos].embeddings, job.embeddings),
+      len(job.embeddings)
+    )
+    eligible = np.flatnonzero(total >= MIN_SCORE_THRESHOLD)
+    top = _top_k(total[eligible], payload.top_k)
+
+  ranked: List[RankedCandidate] = []
+  for rank, (pos, score) in enumerate(top, start=1):
+    idx = int(eligible[pos])
+    candidate = candidates[idx]
+    _, overlap = _skill_overlap(candidate.skills, job.required_skills)
+    if not overlap:
+      _, overlap = _nice_to_have_overlap(candidate.skills, job.nice_to_have_skills)
+    ranked.append(
+      RankedCandidate(
+        candidate_id=candidate.id,
+        index=idx,
+        score=score,
+        rank=rank,
+        reason=_candidate_reason(
+          overlap, _settled_similarity(float(embedding[idx]), candidate.embeddings, job.embeddings), candidate
+        )
+      )
+    )
+  return CandidateRankingResponse(
+    job_id=job.job_id, ranked_candidates=ranked, total_matches=len(eligible), generated_at=timestamp()
+  )
+
+
+@dataclass(frozen=True)
+class _JobSet:
+  """The jobs of a batch request, encoded once and shared by every candidate block."""
+
+  jobs: Sequence[JobRecommendationInput]
+  # Request-local ids for the jobs' skills; a candidate skill no job lists has no id.
+  vocabulary: SkillVocabulary
+  required: Tuple[np.ndarray, np.ndarray, np.ndarray]
+  nice: Tuple[np.ndarray, np.ndarray, np.ndarray]
+  location_codes: Dict[str, int]
+  locations: np.ndarray
+  seniority_codes: Dict[str, int]
+  seniorities: np.ndarray
+  # Embedding dimension -> (job positions, unit-normalized rows).
+  embeddings: Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+
+def _postings(sets: SkillSets) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  """``(row sizes, postings, posting offsets)``: the rows listing skill id ``i`` are ``postings[offsets[i]:offsets[i + 1]]``."""
+  order = np.argsort(sets.ids, kind='stable')
+  offsets = np.zeros(sets.universe + 1, dtype=np.int64)
+  np.cumsum(np.bincount(sets.ids, minlength=sets.universe), out=offsets[1:])
+  return sets.sizes, sets.row_index()[order], offsets
+
+
+def _prepare_jobs(jobs: Sequence[JobRecommendationInput]) -> _JobSet:
+  vocabulary = SkillVocabulary()
+  required, nice = vocabulary.encode(
+    [job.required_skills for job in jobs], [job.nice_to_have_skills for job in jobs], grow=True
+  )
+  location_codes: Dict[str, int] = {}
+  seniority_codes: Dict[str, int] = {}
+  locations = np.array([_code(location_codes, _normalize_location(job.location)) for job in jobs], dtype=np.int64)
+  seniorities = np.array(
+    [_code(seniority_codes, job.seniority.lower() if job.seniority else None) for job in jobs], dtype=np.int64
+  )
+  by_dim: Dict[int, List[int]] = {}
+  for idx, job in enumerate(jobs):
+    if job.embeddings:
+      by_dim.setdefault(len(job.embeddings), []).append(idx)
+  embeddings = {
+    dim: (np.asarray(rows, dtype=np.int64), l2_normalize(stack_embeddings([jobs[idx].embeddings for idx in rows], dim))[0])
+    for dim, rows in by_dim.items()
+  }
+  return _JobSet(
+    jobs, vocabulary, _postings(required), _postings(nice), location_codes, locations, seniority_codes, seniorities, embeddings
+  )
+
+
+def _coverage_matrix(
+  postings: Tuple[np.ndarray, np.ndarray, np.ndarray],
+  owned: Tuple[np.ndarray, np.ndarray],
+  shape: Tuple[int, int]
+) -> np.ndarray:
+  """Coverage of every job (columns) for each candidate (rows), from ``(candidate row, skill id)`` pairs.
+
+  Only the postings of the candidates' own skills are read. One ``bincount``
+  over ``candidate * n_jobs + job`` yields every count of the block.
+  """
+  sizes, rows, offsets = postings
+  candidate_rows, skill_ids = owned
+  lengths = offsets[skill_ids + 1] - offsets[skill_ids]
+  ends = np.cumsum(lengths)
+  within = np.arange(int(ends[-1]) if len(ends) else 0, dtype=np.int64) - np.repeat(ends - lengths, lengths)
+  jobs = rows[np.repeat(offsets[skill_ids], lengths) + within]
+  counts = np.bincount(np.repeat(candidate_rows, lengths) * shape[1] + jobs, minlength=shape[0] * shape[1])
+  return counts.reshape(shape) / np.maximum(sizes, 1)
+
+
+def _block_scores(
+  job_set: _JobSet, candidates: Sequence[CandidateProfile]
+) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+  """``(total, embedding, (skill, nice, location, seniority))`` score matrices for a block of candidates."""
+  n_jobs = len(job_set.jobs)
+  embedding = np.zeros((len(candidates), n_jobs), dtype=np.float32)
+  for dim, (job_rows, unit) in job_set.embeddings.items():
+    members = [row for row, candidate in enumerate(candidates) if len(candidate.embeddings) == dim]
+    if not members:
+      continue
+    queries = l2_normalize(stack_embeddings([candidates[row].embeddings for row in members], dim))[0]
+    # One blocked product per dimension; zero-norm vectors keep the scalar path's midpoint.
+    embedding[np.ix_(members, job_rows)] = np.clip((queries @ unit.T + 1) / 2, 0.0, 1.0)
+
+  # A candidate listing a skill twice still counts it once, as the scalar path's set does.
+  encoded = job_set.vocabulary.encode([candidate.skills for candidate in candidates])[0]
+  width = max(len(job_set.vocabulary), 1)
+  known = encoded.ids < len(job_set.vocabulary)
+  owned = np.divmod(np.unique(encoded.row_index()[known] * width + encoded.ids[known]), width)
+  skill = _coverage_matrix(job_set.required, owned, embedding.shape)
+  nice = _coverage_matrix(job_set.nice, owned, embedding.shape)
+
+  embedding = embedding.astype(np.float64)
+  location = _location_matrix(candidates, job_set.locations, job_set.location_codes)
+  seniority = _seniority_matrix(candidates, job_set.seniorities, job_set.seniority_codes)
+  total = np.clip(_weighted(skill, nice, embedding, location, seniority), 0.0, 1.0)
+  return total, embedding, (skill, nice, location, seniority)
+
+
+def _block_size(n_jobs: int) -> int:
+  """Candidates per block so one block's score matrices stay near ``recommend_batch_block_mb``."""
+  # About seven float64-sized matrices of shape (block, n_jobs) are alive at once.
+  return max(1, get_settings().recommend_batch_block_mb * 2**20 // (56 * max(n_jobs, 1)))
+
+
+def iter_batch_recommendations(
+  candidates: Sequence[CandidateProfile],
+  jobs: Sequence[JobRecommendationInput],
+  top_k: int,
+  offset: int = 0
+) -> Iterator[CandidateRecommendations]:
+  """``recommend_jobs`` for each candidate against the same ``jobs``, top ``top_k`` only, in candidate order.
+
+  ``offset`` is added to each result's ``index`` when ``candidates`` is a
+  slice of a larger request.
+  """
+  job_set = _prepare_jobs(jobs)
+  step = _block_size(len(jobs))
+  for start in range(0, len(candidates), step):
+    block = candidates[start:start + step]
+    with span('recommend_batch.scoring'):
+      total, embedding, columns = _block_scores(job_set, block)
+    for row, candidate in enumerate(block):
+      _settle_edges(
+        total[row],
+        embedding[row],
+        tuple(column[row] for column in columns),
+        lambda pos: (candidate.embeddings, jobs[pos].embeddings),
+        len(candidate.embeddings)
+      )
+      eligible = np.flatnonzero(total[row] >= MIN_SCORE_THRESHOLD)
+      candidate_skills = set(_normalized(candidate.skills))
+      ranked = []
+      for rank, (pos, score) in enumerate(_top_k(total[row, eligible], top_k), start=1):
+        idx = int(eligible[pos])
+        job = jobs[idx]
+        ranked.append(
+          RecommendedJob(
+            job_id=job.job_id,
+            title=job.title,
+            location=job.location,
+            score=score,
+            rank=rank,
+            reason=_reason(
+              _shared_skills(candidate_skills, job),
+              _settled_similarity(float(embedding[row, idx]), candidate.embeddings, job.embeddings),
+              job
+            ),
+          )
+        )
+      yield CandidateRecommendations(
+        candidate_id=candidate.id, index=offset + start + row, ranked_jobs=ranked, total_matches=len(eligible)
+      )
+
+
+def recommend_batch(payload: BatchRecommendationRequest) -> BatchRecommendationResponse:
+  with collect_timings('recommend_batch') as timings:
+    results = list(iter_batch_recommendations(payload.candidates, payload.jobs, payload.top_k))
+  response = BatchRecommendationResponse(results=results, generated_at=timestamp())
+  if payload.include_timings:
+    response.timings = timings.as_dict()
+  return response
+
+
+def recommend_batch_page(
+  candidates: Sequence[CandidateProfile],
+  jobs: Sequence[JobRecommendationInput],
+  top_k: int,
+  offset: int
+) -> List[CandidateRecommendations]:
+  """One page of a streamed batch; see ``iter_batch_recommendations``."""
+  return list(iter_batch_recommendations(candidates, jobs, top_k, offset))
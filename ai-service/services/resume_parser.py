@@ -5,16 +5,17 @@ import logging
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Optional, Tuple
 
-from docx import Document  # type: ignore
-from pypdf import PdfReader  # type: ignore
-
+from utils.async_bridge import submit_blocking
+from utils.document_readers import open_docx, open_pdf
 from utils.embeddings_client import get_embeddings_client
 from utils.llm_client import get_llm_client
 from models.resume import EducationItem, ExperienceItem, ResumeParseRequest, ResumeParseResponse
-from services.skill_utils import extract_skills, normalize_skill_list
+from services.skill_utils import Categories, categories_from_labels, extract_skills, normalize_skill_list
 from utils.settings import get_settings
+from utils.timing import collect_timings, span
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +38,25 @@ class ResumeParser:
     provider = self._settings.ai_provider.lower().strip()
     self._use_llm = provider != 'mock' and bool(self._settings.openai_api_key)
 
-  def parse(self, payload: ResumeParseRequest) -> ResumeParseResponse:
+  @property
+  def uses_llm(self) -> bool:
+    return self._use_llm
+
+  def parse(self, payload: ResumeParseRequest, use_llm: bool = True) -> ResumeParseResponse:
+    """Parse one resume; ``use_llm=False`` keeps this call on the heuristics even when an LLM is configured."""
+    with collect_timings('resume_parse') as timings:
+      response = self._parse(payload, self._use_llm and use_llm)
+    if payload.include_timings:
+      response.timings = timings.as_dict()
+    return response
+
+  def _parse(self, payload: ResumeParseRequest, use_llm: bool) -> ResumeParseResponse:
     warnings: List[str] = []
     text = (payload.resume_text or '').strip()
 
     if not text:
-      extracted_text, extract_warning = self._extract_text(payload.file_path)
+      with span('resume.extract'):
+        extracted_text, extract_warning = self._extract_text(payload.file_path)
       text = extracted_text
       if extract_warning:
         warnings.append(extract_warning)
@@ -58,42 +72,57 @@ class ResumeParser:
         warnings=warnings
       )
 
-    sections = self._split_sections(text)
+    with span('resume.sections'):
+      sections = self._split_sections(text)
+    structured_call = submit_blocking(self._extract_structured_with_llm, text, sections) if use_llm else None
+    embed_document = self._settings.embedding_input == 'document'
+    if embed_document:
+      # Without the summary the embedding does not depend on the LLM, so it overlaps the extraction.
+      with span('resume.embeddings'):
+        embeddings = self._build_embeddings(text)
+
     structured = None
-    if self._use_llm:
+    if structured_call is not None:
       try:
-        structured = self._extract_structured_with_llm(text, sections)
+        with span('resume.llm_wait'):
+          structured = structured_call.result()
       except Exception as exc:  # noqa: BLE001
         warnings.append('LLM parsing unavailable, falling back to heuristics.')
         logger.warning('LLM resume parsing failed: %s', exc)
 
     summary = structured.get('summary') if structured else None
     if not summary:
-      summary = self._generate_summary(text, payload.candidate_name)
-
-    skills = normalize_skill_list(structured.get('skills', [])) if structured else []
-    if not skills:
-      skills = self._extract_skills(text)
-
-    experience = []
-    if structured:
-      experience = self._coerce_experience_entries(structured.get('experience', []))
-    if not experience:
-      exp_text = sections.get('experience') if sections else text
-      experience = self._extract_experience(exp_text or text)
-
-    education = []
-    if structured:
-      education = self._coerce_education_entries(structured.get('education', []))
-    if not education:
-      education = self._extract_education(text)
+      summary = self._generate_summary(text, payload.candidate_name, use_llm)
+    if not embed_document:
+      with span('resume.embeddings'):
+        embeddings = self._build_embeddings(text, summary or '')
+
+    with span('resume.skills'):
+      # "Languages: ..." style lines hint which ontology categories to search first.
+      hints = categories_from_labels(sections.get('skills') or text)
+      skills = normalize_skill_list(structured.get('skills', []), hints) if structured else []
+      if not skills:
+        skills = self._extract_skills(text, hints)
+
+    with span('resume.experience'):
+      experience = []
+      if structured:
+        experience = self._coerce_experience_entries(structured.get('experience', []))
+      if not experience:
+        exp_text = sections.get('experience') if sections else text
+        experience = self._extract_experience(exp_text or text)
+
+    with span('resume.education'):
+      education = []
+      if structured:
+        education = self._coerce_education_entries(structured.get('education', []))
+      if not education:
+        education = self._extract_education(text)
 
     location = structured.get('location') if structured else None
     if not location:
       location = self._extract_location(text, payload)
 
-    embeddings = self._build_embeddings(text, summary or '')
-
     return ResumeParseResponse(
       summary=summary,
       skills=skills,
@@ -101,6 +130,7 @@ class ResumeParser:
       education=education,
       location=location,
       embeddings=embeddings,
+      embedding_input='document' if embed_document else 'summary',
       warnings=warnings
     )
 
@@ -114,11 +144,11 @@ class ResumeParser:
     try:
       ext = os.path.splitext(file_path)[1].lower()
       if ext in {'.pdf'}:
-        reader = PdfReader(file_path)
+        reader = open_pdf(file_path)
         pages = [page.extract_text() or '' for page in reader.pages]
         return '\n'.join(pages).strip(), None
       if ext in {'.docx'}:
-        document = Document(file_path)
+        document = open_docx(file_path)
         paragraphs = [para.text for para in document.paragraphs]
         return '\n'.join(paragraphs).strip(), None
 
@@ -161,11 +191,11 @@ class ResumeParser:
       sections[current].append(raw)
     return {k: '\n'.join(v).strip() for k, v in sections.items() if v}
 
-  def _generate_summary(self, text: str, candidate_name: str | None) -> str:
+  def _generate_summary(self, text: str, candidate_name: str | None, use_llm: bool) -> str:
     head = text.strip().splitlines()
     first_paragraph = ' '.join(head[:5])[:600]
 
-    if not self._use_llm:
+    if not use_llm:
       if candidate_name:
         return f"{candidate_name} – {first_paragraph[:250]}".strip()
       return first_paragraph or 'Resume summary unavailable.'
@@ -182,8 +212,8 @@ class ResumeParser:
     except Exception as exc:  # noqa: BLE001
       return f'Summary unavailable (LLM failed: {exc}).'
 
-  def _extract_skills(self, text: str) -> List[str]:
-    return normalize_skill_list(extract_skills(text))
+  def _extract_skills(self, text: str, categories: Categories = None) -> List[str]:
+    return normalize_skill_list(extract_skills(text, categories=categories), categories)
 
   def _extract_experience(self, text: str, limit: int = 5) -> List[ExperienceItem]:
     experience: List[ExperienceItem] = []
@@ -290,9 +320,11 @@ class ResumeParser:
         break
     return education
 
-  def _build_embeddings(self, text: str, summary: str) -> List[float]:
+  def _build_embeddings(self, text: str, summary: Optional[str] = None) -> List[float]:
+    # ``summary`` None embeds the document alone (AI_EMBEDDING_INPUT=document, the default).
+    combined = text[:4000] if summary is None else f'{summary}\n{text[:4000]}'
     try:
-      vectors = self._embeddings_client.embed([f'{summary}\n{text[:4000]}'])
+      vectors = self._embeddings_client.embed([combined])
       return vectors[0] if vectors else []
     except Exception:  # noqa: BLE001
       return []
@@ -399,11 +431,12 @@ class ResumeParser:
       "Full resume excerpt for fallback:\n"
       f"{text[:4000]}"
     )
-    raw = self._llm_client.run(
-      prompt,
-      temperature=0.1,
-      system_prompt='You convert resumes into concise structured JSON. Return JSON only.'
-    )
+    with span('resume.llm'):
+      raw = self._llm_client.run(
+        prompt,
+        temperature=0.1,
+        system_prompt='You convert resumes into concise structured JSON. Return JSON only.'
+      )
     return self._parse_json_response(raw)
 
   def _parse_json_response(self, content: str) -> dict[str, Any]:
@@ -512,8 +545,13 @@ class ResumeParser:
     return any(re.search(pattern, lower) for pattern in _CONTACT_PATTERNS)
 
 
+@lru_cache(maxsize=1)
+def get_resume_parser() -> ResumeParser:
+  """Process-wide parser instance; the parser holds no per-request state."""
+  return ResumeParser()
+
+
 def parse_resume(payload: ResumeParseRequest) -> ResumeParseResponse:
   """Module-level helper used by FastAPI routes."""
-  parser = ResumeParser()
-  return parser.parse(payload)
+  return get_resume_parser().parse(payload)
 
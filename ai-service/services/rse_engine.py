@@ -3,12 +3,13 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from typing import Iterable, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from models.job import JobDescriptionResponse
 from models.resume import ResumeParseResponse
 from models.rse import JDRequirement, JDScoreBreakdown, RequirementResult
-from services.skill_utils import normalize_skill_list, normalize_token
+from services.skill_utils import normalize_skill_list, normalize_token, skill_categories_for_role
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,59 @@ _SATISFACTION_MAP = {
 }
 
 
+@dataclass(slots=True)
+class Requirement:
+  """Engine-internal ``JDRequirement``; converted with ``to_model`` at the API boundary."""
+
+  id: str
+  type: str
+  rawText: str
+  normalizedTerms: List[str]
+  weight: float
+  isRequired: bool
+  explicitlyStated: bool = True
+  evidenceRule: Optional[str] = None
+
+  def to_model(self) -> JDRequirement:
+    return JDRequirement.model_construct(
+      id=self.id,
+      type=self.type,
+      rawText=self.rawText,
+      normalizedTerms=self.normalizedTerms,
+      weight=self.weight,
+      isRequired=self.isRequired,
+      explicitlyStated=self.explicitlyStated,
+      evidenceRule=self.evidenceRule
+    )
+
+
+@dataclass(slots=True)
+class Evaluation:
+  """Engine-internal ``RequirementResult``; serializes to the same JSON object."""
+
+  requirementId: str
+  requirementText: str
+  normalizedTerms: List[str]
+  status: str
+  satisfactionScore: float
+  confidence: float
+  evidenceSnippets: List[str] = field(default_factory=list)
+  section: Optional[str] = None
+
+  def to_model(self) -> RequirementResult:
+    # Scores come from _SATISFACTION_MAP and fixed confidences, so they are in range by construction.
+    return RequirementResult.model_construct(
+      requirementId=self.requirementId,
+      requirementText=self.requirementText,
+      normalizedTerms=self.normalizedTerms,
+      status=self.status,
+      satisfactionScore=self.satisfactionScore,
+      confidence=self.confidence,
+      evidenceSnippets=self.evidenceSnippets,
+      section=self.section
+    )
+
+
 def _stable_id(kind: str, terms: Iterable[str]) -> str:
   seed = f'{kind}::{"|".join(sorted({t.lower() for t in terms if t}))}'
   return hashlib.sha1(seed.encode('utf-8')).hexdigest()[:12]
@@ -51,16 +105,17 @@ def _detect_location(text: str) -> List[str]:
 def build_requirements(
   job_text: str,
   parsed_jd: JobDescriptionResponse
-) -> List[JDRequirement]:
+) -> List[Requirement]:
   """Derive explicit requirements from parsed JD output + raw text."""
-  requirements: List[JDRequirement] = []
-  normalized_required = normalize_skill_list(parsed_jd.required_skills or [])
-  normalized_preferred = normalize_skill_list(parsed_jd.nice_to_have_skills or [])
+  requirements: List[Requirement] = []
+  hints = skill_categories_for_role(parsed_jd.job_category)
+  normalized_required = normalize_skill_list(parsed_jd.required_skills or [], hints)
+  normalized_preferred = normalize_skill_list(parsed_jd.nice_to_have_skills or [], hints)
 
   for skill in normalized_required:
-    normalized_terms = normalize_skill_list([skill])
+    normalized_terms = normalize_skill_list([skill], hints)
     requirements.append(
-      JDRequirement(
+      Requirement(
         id=_stable_id('skill', normalized_terms),
         type='skill',
         rawText=skill,
@@ -73,9 +128,9 @@ def build_requirements(
     )
 
   for skill in normalized_preferred:
-    normalized_terms = normalize_skill_list([skill])
+    normalized_terms = normalize_skill_list([skill], hints)
     requirements.append(
-      JDRequirement(
+      Requirement(
         id=_stable_id('skill_pref', normalized_terms),
         type='skill',
         rawText=skill,
@@ -91,7 +146,7 @@ def build_requirements(
   for req in years_requirements:
     terms = normalize_token(req).split()
     requirements.append(
-      JDRequirement(
+      Requirement(
         id=_stable_id('experience', terms),
         type='experience',
         rawText=req,
@@ -107,7 +162,7 @@ def build_requirements(
   for loc in locations:
     terms = normalize_token(loc).split()
     requirements.append(
-      JDRequirement(
+      Requirement(
         id=_stable_id('location', terms),
         type='location',
         rawText=loc,
@@ -182,17 +237,26 @@ def canonicalize_terms_list(terms: List[str]) -> List[str]:
   return [t for t in normalized if t]
 
 
-def _find_evidence_snippets(resume_text: str, terms: List[str], max_len: int = 120) -> Tuple[List[str], str | None]:
-  lower_text = resume_text.lower()
+_SNIPPET_CONTEXT = 40
+_SCORED_SECTIONS = ('experience', 'projects', 'skills', 'summary')
+
+
+def _term_positions(lower_text: str, terms: Sequence[str]) -> List[int]:
+  return [lower_text.find(term.lower()) if term else -1 for term in terms]
+
+
+def _snippets_at(
+  resume_text: str,
+  terms: Sequence[str],
+  positions: Sequence[int],
+  max_len: int = 120
+) -> Tuple[List[str], str | None]:
   snippets: List[str] = []
-  for term in terms:
-    if not term:
+  for term, pos in zip(terms, positions):
+    if not term or pos == -1:
       continue
-    pos = lower_text.find(term.lower())
-    if pos == -1:
-      continue
-    start = max(pos - 40, 0)
-    end = min(pos + len(term) + 40, len(resume_text))
+    start = max(pos - _SNIPPET_CONTEXT, 0)
+    end = min(pos + len(term) + _SNIPPET_CONTEXT, len(resume_text))
     snippet = resume_text[start:end].strip()
     if len(snippet) > max_len:
       snippet = snippet[:max_len]
@@ -208,64 +272,297 @@ def _find_evidence_snippets(resume_text: str, terms: List[str], max_len: int = 1
   return unique[:3], 'Experience' if any(snippets) else None
 
 
+def _find_evidence_snippets(resume_text: str, terms: List[str], max_len: int = 120) -> Tuple[List[str], str | None]:
+  return _snippets_at(resume_text, terms, _term_positions(resume_text.lower(), terms), max_len)
+
+
+@dataclass(slots=True)
+class ResumeSegments:
+  """A resume split into sections, with the canonical text the RSE matches against."""
+
+  text: str
+  raw: Dict[str, str]
+  canonical: Dict[str, str]
+  _full: Optional[str] = None
+
+  @property
+  def full(self) -> str:
+    if self._full is None:
+      self._full = canonicalize_term(self.text)
+    return self._full
+
+
+def segment_resume(resume_text: str, previous: ResumeSegments | None = None) -> ResumeSegments:
+  """Split and canonicalize ``resume_text``, reusing ``previous`` for sections whose text is unchanged."""
+  raw = _split_sections(resume_text or '')
+  canonical: Dict[str, str] = {}
+  for name in _SCORED_SECTIONS:
+    text = raw.get(name, '')
+    if previous is not None and previous.raw.get(name, '') == text:
+      canonical[name] = previous.canonical[name]
+    else:
+      canonical[name] = canonicalize_term(text)
+  return ResumeSegments(resume_text or '', raw, canonical)
+
+
+@dataclass(slots=True)
+class RequirementHits:
+  """What one requirement's evaluation depended on, so an edit can tell whether it still holds."""
+
+  # The requirement fields ``terms`` were canonicalized from.
+  source: Tuple[str, ...]
+  terms: List[str]
+  # First offset of each term in the lowercased resume, -1 if absent.
+  positions: List[int]
+  strong: bool
+  weak: bool
+  snippetMatch: bool
+
+
+@dataclass(slots=True)
+class EvaluationState:
+  """Output of ``evaluate_requirements_state``; feed it to ``reevaluate_requirements`` after an edit."""
+
+  segments: ResumeSegments
+  results: List[Evaluation]
+  hits: Dict[str, RequirementHits]
+  # Requirements whose evidence snippets were (re)computed to produce this state.
+  evaluated: int = 0
+
+
+@dataclass(slots=True)
+class TextEdit:
+  """Replace ``text[start:end]`` of the previous resume with ``replacement``."""
+
+  start: int
+  end: int
+  replacement: str = ''
+
+
+def diff_text(old: str, new: str) -> List[TextEdit]:
+  """Single edit covering everything between the common prefix and suffix of ``old`` and ``new``."""
+  if old == new:
+    return []
+  limit = min(len(old), len(new))
+  # Binary searches over slice comparisons keep the scan in C.
+  low, high = 0, limit
+  while low < high:
+    mid = (low + high + 1) // 2
+    if old[:mid] == new[:mid]:
+      low = mid
+    else:
+      high = mid - 1
+  prefix = low
+  low, high = 0, limit - prefix
+  while low < high:
+    mid = (low + high + 1) // 2
+    if old[len(old) - mid:] == new[len(new) - mid:]:
+      low = mid
+    else:
+      high = mid - 1
+  suffix = low
+  return [TextEdit(prefix, len(old) - suffix, new[prefix:len(new) - suffix])]
+
+
+def apply_edits(text: str, edits: Sequence[TextEdit]) -> str:
+  parts: List[str] = []
+  cursor = 0
+  for edit in sorted(edits, key=lambda e: e.start):
+    if edit.start < cursor or edit.end < edit.start or edit.end > len(text):
+      raise ValueError(f'Invalid or overlapping edit [{edit.start}, {edit.end}) for text of length {len(text)}')
+    parts.append(text[cursor:edit.start])
+    parts.append(edit.replacement)
+    cursor = edit.end
+  parts.append(text[cursor:])
+  return ''.join(parts)
+
+
+def _status(strong: bool, weak: bool, any_hit: bool, snippet_match: bool) -> Tuple[str, float]:
+  if strong:
+    status, confidence = 'STRONG', 0.9
+  elif weak:
+    status, confidence = 'WEAK', 0.65
+  elif any_hit:
+    status, confidence = 'UNCERTAIN', 0.5
+  else:
+    status, confidence = 'MISSING', 0.25
+  if status in ('MISSING', 'UNCERTAIN') and snippet_match:
+    status, confidence = 'WEAK', max(confidence, 0.4)
+  return status, confidence
+
+
+def _evaluate_one(
+  req: Requirement | JDRequirement,
+  terms: List[str],
+  segments: ResumeSegments,
+  strong: bool,
+  weak: bool,
+  positions: List[int],
+  snippets: Tuple[List[str], str | None] | None = None,
+  snippet_match: bool | None = None
+) -> Tuple[Evaluation, RequirementHits]:
+  # ``any_hit`` only matters when neither section check hit, so the full-text scan is skipped otherwise.
+  any_hit = not strong and not weak and any(term in segments.full for term in terms)
+  if snippets is None:
+    snippets = _snippets_at(segments.text, terms, positions)
+  if snippet_match is None:
+    snippet_text = canonicalize_term(' '.join(snippets[0]))
+    snippet_match = any(term in snippet_text for term in terms)
+  status, confidence = _status(strong, weak, any_hit, snippet_match)
+  evaluation = Evaluation(
+    requirementId=req.id,
+    requirementText=req.rawText,
+    normalizedTerms=terms,
+    status=status,
+    satisfactionScore=_SATISFACTION_MAP[status],
+    confidence=confidence,
+    evidenceSnippets=snippets[0],
+    section=snippets[1]
+  )
+  return evaluation, RequirementHits(_term_source(req), terms, positions, strong, weak, snippet_match)
+
+
+def _term_source(req: Requirement | JDRequirement) -> Tuple[str, ...]:
+  return tuple(req.normalizedTerms or [req.rawText])
+
+
+def _requirement_terms(req: Requirement | JDRequirement) -> List[str]:
+  return [t for t in canonicalize_terms_list(list(_term_source(req))) if t]
+
+
+def evaluate_requirements_state(
+  requirements: Sequence[Requirement | JDRequirement],
+  resume_text: str
+) -> EvaluationState:
+  """``evaluate_requirements`` that also keeps what each result depended on."""
+  segments = segment_resume(resume_text or '')
+  canonical = segments.canonical
+  lower_text = segments.text.lower()
+  results: List[Evaluation] = []
+  hits: Dict[str, RequirementHits] = {}
+  for req in requirements:
+    terms = _requirement_terms(req)
+    strong = any(term in canonical['experience'] or term in canonical['projects'] for term in terms)
+    weak = any(term in canonical['skills'] or term in canonical['summary'] for term in terms)
+    evaluation, hit = _evaluate_one(req, terms, segments, strong, weak, _term_positions(lower_text, terms))
+    results.append(evaluation)
+    hits[req.id] = hit
+  return EvaluationState(segments, results, hits, evaluated=len(results))
+
+
 def evaluate_requirements(
-  requirements: List[JDRequirement],
+  requirements: Sequence[Requirement | JDRequirement],
   resume_text: str,
   resume_parse: ResumeParseResponse | None = None
-) -> List[RequirementResult]:
-  canonical_full = canonicalize_term(resume_text or '')
-  sections = _split_sections(resume_text or '')
-  experience_text = canonicalize_term(sections.get('experience', ''))
-  projects_text = canonicalize_term(sections.get('projects', ''))
-  skills_text = canonicalize_term(sections.get('skills', ''))
-  summary_text = canonicalize_term(sections.get('summary', ''))
-  full_text = canonical_full
-
-  results: List[RequirementResult] = []
+) -> List[Evaluation]:
+  return evaluate_requirements_state(requirements, resume_text).results
+
+
+def _shift_position(term: str, pos: int, edits: Sequence[TextEdit], old_len: int, new_lower: str) -> int | None:
+  """New first offset of ``term`` after ``edits``, or None if the edits may have changed its snippet.
+
+  A snippet survives when no edit touches its context window and no edit
+  creates an earlier occurrence; the offset then just moves by the length
+  change of the edits before it.
+  """
+  size = len(term)
+  if pos >= 0:
+    window_start = max(pos - _SNIPPET_CONTEXT, 0)
+    window_end = min(pos + size + _SNIPPET_CONTEXT, old_len)
+  delta = 0
+  for edit in edits:
+    if pos >= 0 and edit.start >= window_start and edit.start > pos:
+      # At or after the occurrence: only the window end matters.
+      if edit.start <= window_end:
+        return None
+      break
+    if pos >= 0 and edit.end >= window_start:
+      return None
+    # The edit sits before the occurrence (or there is none): it may have introduced one.
+    new_start = edit.start + delta
+    new_end = new_start + len(edit.replacement)
+    if new_lower.find(term, max(new_start - size + 1, 0), new_end + size - 1) != -1:
+      return None
+    delta += len(edit.replacement) - (edit.end - edit.start)
+  return pos + delta if pos >= 0 else -1
+
+
+def reevaluate_requirements(
+  requirements: Sequence[Requirement | JDRequirement],
+  state: EvaluationState,
+  edits: Sequence[TextEdit]
+) -> EvaluationState:
+  """Re-score after ``edits`` to the resume in ``state``, redoing only the work the edits can affect.
+
+  Sections whose text is unchanged keep their canonical form. A requirement's
+  section hits are recomputed only if a section it is checked against
+  changed, and its evidence snippets only if an edit touched one or may have
+  created an earlier occurrence of a term. Unaffected results are reused
+  as-is. The output equals ``evaluate_requirements`` on the edited text.
+  """
+  edits = sorted(edits, key=lambda e: e.start)
+  old_text = state.segments.text
+  new_text = apply_edits(old_text, edits)
+  if not edits:
+    return state
+  new_lower = new_text.lower()
+  if len(new_lower) != len(new_text) or len(old_text.lower()) != len(old_text):
+    # Case folding changed string lengths, so offsets cannot be carried over.
+    return evaluate_requirements_state(requirements, new_text)
+
+  segments = segment_resume(new_text, previous=state.segments)
+  old_canonical, canonical = state.segments.canonical, segments.canonical
+  strong_changed = any(canonical[name] != old_canonical[name] for name in ('experience', 'projects'))
+  weak_changed = any(canonical[name] != old_canonical[name] for name in ('skills', 'summary'))
+  previous = {res.requirementId: res for res in state.results}
+
+  results: List[Evaluation] = []
+  hits: Dict[str, RequirementHits] = {}
+  evaluated = 0
   for req in requirements:
-    terms = canonicalize_terms_list(req.normalizedTerms or [req.rawText])
-    terms = [t for t in terms if t]
-    strong_hit = any(term in experience_text or term in projects_text for term in terms)
-    weak_hit = any(term in skills_text or term in summary_text for term in terms)
-    any_hit = any(term in full_text for term in terms)
-
-    if strong_hit:
-      status = 'STRONG'
-      confidence = 0.9
-    elif weak_hit:
-      status = 'WEAK'
-      confidence = 0.65
-    elif any_hit:
-      status = 'UNCERTAIN'
-      confidence = 0.5
-    else:
-      status = 'MISSING'
-      confidence = 0.25
-
-    snippets, section = _find_evidence_snippets(resume_text or '', terms)
-    snippet_text = canonicalize_term(' '.join(snippets))
-    if (status == 'MISSING' or status == 'UNCERTAIN') and any(term in snippet_text for term in terms):
-      status = 'WEAK'
-      confidence = max(confidence, 0.4)
+    hit, prior = state.hits.get(req.id), previous.get(req.id)
+    if hit is None or prior is None or hit.source != _term_source(req) or prior.requirementText != req.rawText:
+      terms = _requirement_terms(req)
+      strong = any(term in canonical['experience'] or term in canonical['projects'] for term in terms)
+      weak = any(term in canonical['skills'] or term in canonical['summary'] for term in terms)
+      evaluation, hit = _evaluate_one(req, terms, segments, strong, weak, _term_positions(new_lower, terms))
+      results.append(evaluation)
+      hits[req.id] = hit
+      evaluated += 1
+      continue
 
-    satisfaction = _SATISFACTION_MAP[status]
+    terms = hit.terms
+    strong = hit.strong
+    if strong_changed:
+      strong = any(term in canonical['experience'] or term in canonical['projects'] for term in terms)
+    weak = hit.weak
+    if weak_changed:
+      weak = any(term in canonical['skills'] or term in canonical['summary'] for term in terms)
+    shifted = [_shift_position(term, pos, edits, len(old_text), new_lower) for term, pos in zip(terms, hit.positions)]
+    snippets_kept = all(pos is not None for pos in shifted)
+
+    if snippets_kept and strong == hit.strong and weak == hit.weak and (strong or weak):
+      # Status is decided by the section hits alone and the evidence text is unchanged.
+      results.append(prior)
+      hits[req.id] = RequirementHits(hit.source, terms, shifted, strong, weak, hit.snippetMatch)
+      continue
 
-    results.append(
-      RequirementResult(
-        requirementId=req.id,
-        requirementText=req.rawText,
-        normalizedTerms=terms,
-        status=status,
-        satisfactionScore=satisfaction,
-        confidence=confidence,
-        evidenceSnippets=snippets,
-        section=section
+    if snippets_kept:
+      evaluation, new_hit = _evaluate_one(
+        req, terms, segments, strong, weak, shifted, (prior.evidenceSnippets, prior.section), hit.snippetMatch
       )
-    )
-  return results
+    else:
+      evaluated += 1
+      evaluation, new_hit = _evaluate_one(req, terms, segments, strong, weak, _term_positions(new_lower, terms))
+    results.append(evaluation)
+    hits[req.id] = new_hit
+  return EvaluationState(segments, results, hits, evaluated)
 
 
-def calculate_scores(requirements: List[JDRequirement], results: List[RequirementResult]) -> JDScoreBreakdown:
+def calculate_scores(
+  requirements: Sequence[Requirement | JDRequirement],
+  results: Sequence[Evaluation | RequirementResult]
+) -> JDScoreBreakdown:
   weight_by_id = {req.id: req.weight for req in requirements}
   required_flags = {req.id: req.isRequired for req in requirements}
   total_weight = sum(weight_by_id.values()) or 1.0
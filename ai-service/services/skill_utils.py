@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from utils.skill_ontology_loader import (
   OntologyEntry,
@@ -13,6 +13,38 @@ from utils.skill_ontology_loader import (
 )
 
 
+# Ontology categories searched first for skills of a JD in each job category
+# (see jd_parser._CATEGORY_KEYWORDS); other categories are searched on a miss.
+ROLE_SKILL_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+  'backend': ('language', 'runtime', 'framework', 'database', 'api'),
+  'frontend': ('language', 'framework', 'tool'),
+  'data': ('language', 'database', 'framework', 'tool', 'cloud'),
+  'devops': ('cloud', 'tool', 'runtime'),
+  'product': ('tool',),
+  'design': ('tool',)
+}
+
+_LABEL_LINE = re.compile(r'^\s*([a-z][a-z /&-]{1,30}?)\s*:', re.MULTILINE)
+
+Categories = Optional[Iterable[str]]
+
+
+def skill_categories_for_role(job_category: Optional[str]) -> Tuple[str, ...]:
+  return ROLE_SKILL_CATEGORIES.get((job_category or '').lower().strip(), ())
+
+
+def categories_from_labels(text: str) -> Tuple[str, ...]:
+  """Ontology categories named by ``Label:`` lines, e.g. ``Languages: Go, Rust`` -> ``('language',)``."""
+  ontology = get_skill_ontology()
+  found: Dict[str, None] = {}
+  for label in _LABEL_LINE.findall((text or '').lower()):
+    for word in re.split(r'[ /&-]+', label):
+      for candidate in (word, word[:-1] if word.endswith('s') else None):
+        if candidate and ontology.has_category(candidate):
+          found[candidate] = None
+  return tuple(found)
+
+
 def normalize_token(token: str) -> str:
   cleaned = re.sub(r'[^a-z0-9+/# .-]+', ' ', token.lower())
   cleaned = cleaned.replace('node.js', 'nodejs').replace('node js', 'nodejs')
@@ -33,21 +65,23 @@ def _dedupe_preserve(items: List[str]) -> List[str]:
   return out
 
 
-def _match_alias_or_ontology(raw: str) -> Tuple[str | None, OntologyEntry | None]:
-  ontology = get_skill_ontology()
+def _match_alias_or_ontology(raw: str, categories: Categories = None) -> Tuple[str | None, OntologyEntry | None]:
   alias_match = resolve_alias_to_canonical(raw)
   if alias_match:
     return alias_match.displayName, alias_match
 
   threshold = float(os.getenv('SKILL_EMBED_THRESHOLD', '0.82'))
-  sim_match = similarity_to_canonical(raw, threshold=threshold)
+  sim_match = similarity_to_canonical(raw, threshold=threshold, categories=categories)
   if sim_match:
     return sim_match.displayName, sim_match
   return None, None
 
 
-def extract_skills(text: str, max_results: int | None = None) -> List[str]:
-  """Return canonicalized skills found within free-form text using open vocabulary."""
+def extract_skills(text: str, max_results: int | None = None, categories: Categories = None) -> List[str]:
+  """Return canonicalized skills found within free-form text using open vocabulary.
+
+  ``categories`` are ontology categories to try first for fuzzy matches.
+  """
 
   normalized_text = normalize_token(text)
   tokens = re.findall(r'[a-z0-9+/#.-]{2,}', normalized_text)
@@ -64,7 +98,7 @@ def extract_skills(text: str, max_results: int | None = None) -> List[str]:
 
   normalized: List[str] = []
   for cand in candidates:
-    canonical, _entry = _match_alias_or_ontology(cand)
+    canonical, _entry = _match_alias_or_ontology(cand, categories)
     if canonical:
       normalized.append(canonical)
     else:
@@ -77,14 +111,14 @@ def extract_skills(text: str, max_results: int | None = None) -> List[str]:
   return ordered
 
 
-def normalize_skill_list(skills: List[str]) -> List[str]:
+def normalize_skill_list(skills: List[str], categories: Categories = None) -> List[str]:
   """Deduplicate and consistently format arbitrary skill strings (ontology + embeddings)."""
 
   normalized: List[str] = []
   seen: Set[str] = set()
 
   for skill in skills:
-    canonical, entry = _match_alias_or_ontology(skill)
+    canonical, entry = _match_alias_or_ontology(skill, categories)
     target = canonical or skill.strip()
     key = target.lower()
     if not key:
@@ -100,8 +134,7 @@ def normalize_skill_list(skills: List[str]) -> List[str]:
 
 
 def aliases_for(canon: str) -> List[str]:
-  ontology = get_skill_ontology()
-  entry = ontology.by_display.get(canon) or ontology.by_id.get(canon)
+  entry = get_skill_ontology().find(canon)
   if not entry:
     return []
   return sorted(set(entry.aliases or []))
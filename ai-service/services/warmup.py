@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from models.ats import ATSScanRequest
+from models.job import JobDescriptionRequest
+from models.match import MatchRequest
+from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest
+from models.resume import ResumeParseRequest
+from services.ats_analyzer import get_ats_analyzer
+from services.jd_parser import get_jd_parser
+from services.matching_service import score_match
+from services.recommendation_service import recommend_jobs
+from services.resume_parser import get_resume_parser
+from utils.document_readers import preload_document_readers
+from utils.settings import get_settings
+from utils.skill_ontology_loader import load_skill_ontology, suppress_unknown_skill_recording
+
+logger = logging.getLogger(__name__)
+
+# Pipelines that open resume files and therefore need pypdf/python-docx loaded.
+_FILE_PIPELINES = {'parse_resume', 'ats_scan'}
+
+_WARMUP_RESUME = """
+Sam Example
+Summary
+Backend engineer building Python and Node.js REST APIs.
+Experience
+Software Engineer at Example Corp (2019 - Present)
+Built REST APIs with Python and MongoDB.
+Skills
+Python, JavaScript, Node.js, MongoDB, REST
+Education
+Example University, B.Sc. Computer Science, 2018
+"""
+
+_WARMUP_JD = """
+Must have: Python, Node.js, REST APIs.
+Nice to have: MongoDB.
+3+ years experience. Location: Remote.
+"""
+
+
+def _warm_pipelines() -> Dict[str, Callable[[], object]]:
+  # The request-serving singletons are warmed; use_llm=False keeps synthetic traffic off a live provider.
+  def _parse_resume():
+    return get_resume_parser().parse(
+      ResumeParseRequest(file_path='', file_name='warmup.txt', user_id='warmup', resume_text=_WARMUP_RESUME),
+      use_llm=False
+    )
+
+  def _parse_jd():
+    return get_jd_parser().parse(
+      JobDescriptionRequest(job_title='Backend Engineer', job_description=_WARMUP_JD, location='Remote'),
+      use_llm=False
+    )
+
+  def _match():
+    return score_match(
+      MatchRequest(
+        resume_skills=['Python', 'Node.js'],
+        job_required_skills=['Python', 'Node.js', 'REST'],
+        resume_text=_WARMUP_RESUME,
+        job_summary=_WARMUP_JD
+      )
+    )
+
+  def _recommend():
+    return recommend_jobs(
+      RecommendationRequest(
+        candidate=CandidateProfile(id='warmup', skills=['Python'], embeddings=[0.1, 0.2, 0.3]),
+        jobs=[
+          JobRecommendationInput(
+            job_id='warmup-job',
+            title='Backend Engineer',
+            required_skills=['Python'],
+            embeddings=[0.1, 0.2, 0.3],
+            location='remote'
+          )
+        ]
+      )
+    )
+
+  def _ats():
+    return get_ats_analyzer().scan(
+      ATSScanRequest(
+        job_title='Backend Engineer',
+        job_description=_WARMUP_JD,
+        file_name='warmup.txt',
+        user_id='warmup',
+        resume_text=_WARMUP_RESUME
+      ),
+      use_llm=False
+    )
+
+  return {
+    'parse_resume': _parse_resume,
+    'parse_jd': _parse_jd,
+    'match': _match,
+    'recommend': _recommend,
+    'ats_scan': _ats,
+  }
+
+
+def warm_up(pipelines: Optional[Iterable[str]] = None) -> Dict[str, float]:
+  """Load shared state and push one synthetic request through the selected pipelines.
+
+  `pipelines` defaults to `AI_WARMUP_PIPELINES` (all pipelines when unset), so
+  workers that only serve e.g. `/ai/recommend` never import the document
+  libraries. Returns the elapsed milliseconds per stage. Any exception
+  propagates so the caller can keep the worker out of rotation.
+  """
+  available = _warm_pipelines()
+  selected = list(pipelines) if pipelines is not None else get_settings().warmup_pipelines
+  unknown = [name for name in selected if name not in available]
+  if unknown:
+    raise ValueError(f'Unknown warm-up pipelines: {", ".join(unknown)}')
+  names = selected or list(available)
+  timings: Dict[str, float] = {}
+
+  started = time.perf_counter()
+  ontology = load_skill_ontology()
+  timings['ontology'] = round((time.perf_counter() - started) * 1000, 2)
+
+  started = time.perf_counter()
+  get_resume_parser()
+  get_jd_parser()
+  timings['singletons'] = round((time.perf_counter() - started) * 1000, 2)
+
+  if _FILE_PIPELINES.intersection(names):
+    started = time.perf_counter()
+    preload_document_readers()
+    timings['document_readers'] = round((time.perf_counter() - started) * 1000, 2)
+
+  with suppress_unknown_skill_recording():
+    for name in names:
+      started = time.perf_counter()
+      available[name]()
+      timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+  logger.info(
+    'warmup_complete',
+    extra={
+      'event': 'warmup_complete',
+      'pipelines': names,
+      'ontology_entries': len(ontology),
+      'ontology_labels': len(ontology.embedding_labels),
+      'timings_ms': timings
+    }
+  )
+  return timings
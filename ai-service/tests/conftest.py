@@ -1,6 +1,16 @@
+import os
 import sys
+import tempfile
 from pathlib import Path
 
+# Run CPU-bound route work on threads during tests so monkeypatches apply to it.
+os.environ.setdefault('AI_CPU_EXECUTOR', 'thread')
+# Keep metric snapshots written during tests out of the shared default directory.
+os.environ.setdefault('AI_METRICS_DIR', tempfile.mkdtemp(prefix='ai-metrics-test-'))
+# Ranking tokens from test runs go to a throwaway SQLite file, not the one under data/.
+os.environ.setdefault('AI_RECOMMEND_CACHE_PATH', os.path.join(tempfile.mkdtemp(prefix='ai-rankings-test-'), 'rankings.sqlite3'))
+os.environ.setdefault('AI_JOB_CATALOG_PATH', os.path.join(tempfile.mkdtemp(prefix='ai-catalog-test-'), 'catalog.sqlite3'))
+
 # Ensure the ai-service root is on the import path so tests can import `models`, `services`, etc.
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -0,0 +1,35 @@
+"""Fake LLM and embeddings clients shared by the parser tests."""
+import threading
+from typing import List, Optional
+
+
+class OverlapProbe:
+  """An LLM and an embeddings client whose calls record whether the other call was in flight.
+
+  Each call announces that it started, then waits (up to ``timeout``) for the
+  other to start. Two calls issued concurrently both see the other, while
+  back-to-back calls leave the first one waiting in vain. The result depends
+  on event ordering, not on wall-clock time.
+  """
+
+  def __init__(self, llm_response: str, vector: List[float], timeout: float = 5.0) -> None:
+    self.llm_response = llm_response
+    self.vector = vector
+    self.timeout = timeout
+    self.prompts: List[str] = []
+    self.embedded: List[str] = []
+    self.overlapped: List[bool] = []
+    self._llm_started = threading.Event()
+    self._embed_started = threading.Event()
+
+  def run(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    self.prompts.append(prompt)
+    self._llm_started.set()
+    self.overlapped.append(self._embed_started.wait(self.timeout))
+    return self.llm_response
+
+  def embed(self, texts: List[str]) -> List[List[float]]:
+    self.embedded.extend(texts)
+    self._embed_started.set()
+    self.overlapped.append(self._llm_started.wait(self.timeout))
+    return [list(self.vector) for _ in texts]
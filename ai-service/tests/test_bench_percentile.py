@@ -0,0 +1,16 @@
+from benchmarks.run_suite import percentile
+
+
+def test_percentile_is_nearest_rank():
+  values = [float(v) for v in range(1, 11)]
+
+  # ceil(0.5 * 10) = 5; rounding 5.0 + 0.5 half-to-even gave rank 6.
+  assert percentile(values, 50) == 5.0
+  assert percentile(values, 90) == 9.0
+  assert percentile(values, 95) == 10.0
+  assert percentile(values, 99) == 10.0
+  assert percentile(values, 0) == 1.0
+  assert percentile(values, 100) == 10.0
+  assert percentile(values, 25) == 3.0
+  assert percentile([7.0], 50) == 7.0
+  assert percentile([], 50) == 0.0
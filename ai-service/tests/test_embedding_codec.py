@@ -0,0 +1,81 @@
+import base64
+import pickle
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import main
+from models.recommendation import CandidateProfile
+from utils.embedding_codec import BASE64, BASE64_F16, EmbeddingList, as_array, decode_embedding, encode_embedding
+
+JD_PAYLOAD = {
+  'job_title': 'Backend Engineer',
+  'job_description': 'Build APIs with Python, FastAPI and PostgreSQL.',
+  'location': 'Remote'
+}
+
+
+def test_base64_float32_round_trip_is_exact():
+  vector = np.random.default_rng(3).normal(size=64).astype(np.float32)
+
+  encoded = encode_embedding(vector, BASE64)
+  decoded = decode_embedding(encoded)
+
+  assert isinstance(encoded, str)
+  assert base64.b64decode(encoded) == vector.astype('<f4').tobytes()
+  assert np.array_equal(as_array(decoded), vector)
+
+
+def test_base64_float16_is_prefixed_and_close():
+  vector = [0.5, -0.25, 0.1234]
+
+  encoded = encode_embedding(vector, BASE64_F16)
+  decoded = decode_embedding(encoded)
+
+  assert encoded.startswith('f16:')
+  assert np.allclose(decoded, vector, atol=1e-3)
+
+
+def test_models_accept_arrays_and_base64():
+  from_list = CandidateProfile(embeddings=[1, 2.5, 3])
+  from_b64 = CandidateProfile(embeddings=encode_embedding([1.0, 2.5, 3.0], BASE64))
+
+  assert from_list.embeddings == [1.0, 2.5, 3.0]
+  assert from_b64.embeddings == [1.0, 2.5, 3.0]
+  assert isinstance(from_b64.embeddings, EmbeddingList)
+  assert from_b64.model_dump()['embeddings'] == [1.0, 2.5, 3.0]
+
+
+@pytest.mark.parametrize('bad', ['not base64!', 'AAA=', [[1.0, 2.0]], ['x']])
+def test_models_reject_malformed_embeddings(bad):
+  with pytest.raises(ValidationError):
+    CandidateProfile(embeddings=bad)
+
+
+def test_embedding_list_pickles_for_process_pools():
+  value = decode_embedding(encode_embedding([0.25, 0.5], BASE64))
+
+  restored = pickle.loads(pickle.dumps(value))
+
+  assert restored == [0.25, 0.5]
+  assert np.array_equal(restored.array, value.array)
+
+
+def test_parse_jd_negotiates_embedding_encoding():
+  with TestClient(main.app) as client:
+    as_floats = client.post('/ai/parse-jd', json=JD_PAYLOAD).json()['embeddings']
+    via_header = client.post('/ai/parse-jd', json=JD_PAYLOAD, headers={'X-Embedding-Encoding': 'base64'}).json()
+    via_field = client.post(
+      '/ai/parse-jd',
+      json={**JD_PAYLOAD, 'embedding_encoding': 'base64-f16'},
+      headers={'X-Embedding-Encoding': 'base64'}
+    ).json()
+    invalid = client.post('/ai/parse-jd', json=JD_PAYLOAD, headers={'X-Embedding-Encoding': 'msgpack'})
+
+  assert isinstance(as_floats, list) and as_floats
+  assert np.allclose(as_array(decode_embedding(via_header['embeddings'])), as_floats, atol=1e-6)
+  assert via_field['embeddings'].startswith('f16:')
+  assert invalid.status_code == 422
+  assert invalid.json()['detail']['error'] == 'invalid_embedding_encoding'
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from utils.embeddings_client import CachedEmbeddingsClient, EmbeddingsClient, get_embeddings_client
+
+
+class _CountingEmbeddings(EmbeddingsClient):
+  def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+    super().__init__()
+    self.delay = delay
+    self.fail = fail
+    self.calls = []
+
+  def embed_array(self, texts):  # noqa: ANN001
+    self.calls.append(list(texts))
+    time.sleep(self.delay)
+    if self.fail:
+      raise RuntimeError('provider down')
+    return super().embed_array(texts)
+
+
+def test_identical_texts_are_embedded_once():
+  inner = _CountingEmbeddings()
+  client = CachedEmbeddingsClient(inner)
+
+  first = client.embed(['python', 'fastapi', 'python'])
+  second = client.embed(['fastapi'])
+
+  assert inner.calls == [['python', 'fastapi']]
+  assert first[0] == first[2] == EmbeddingsClient().embed(['python'])[0]
+  assert second[0] == first[1]
+  assert client.stats_snapshot()['hits'] == 2
+
+
+def test_cache_is_bounded_lru():
+  inner = _CountingEmbeddings()
+  client = CachedEmbeddingsClient(inner, max_entries=2)
+
+  client.embed(['a', 'b'])
+  client.embed(['a'])  # refresh a
+  client.embed(['c'])  # evicts b
+  client.embed(['a', 'b'])
+
+  assert inner.calls[-1] == ['b']
+
+
+def test_concurrent_requests_are_coalesced_into_one_provider_call():
+  inner = _CountingEmbeddings(delay=0.01)
+  client = CachedEmbeddingsClient(inner, window_ms=50, max_batch=64)
+  results = {}
+  barrier = threading.Barrier(6)
+
+  def _worker(idx):
+    barrier.wait()
+    results[idx] = client.embed([f'text-{idx}', 'shared'])
+
+  threads = [threading.Thread(target=_worker, args=(i,)) for i in range(6)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  assert len(inner.calls) == 1
+  assert sorted(inner.calls[0]) == sorted(['shared'] + [f'text-{i}' for i in range(6)])
+  assert all(results[i][1] == results[0][1] for i in range(6))
+  assert client.stats_snapshot()['batches'] == 1
+
+
+def test_batches_respect_max_batch():
+  inner = _CountingEmbeddings()
+  client = CachedEmbeddingsClient(inner, window_ms=5, max_batch=3)
+
+  vectors = client.embed([f't{i}' for i in range(7)])
+
+  assert len(vectors) == 7
+  assert [len(call) for call in inner.calls] == [3, 3, 1]
+
+
+def test_provider_errors_reach_every_waiting_caller():
+  client = CachedEmbeddingsClient(_CountingEmbeddings(fail=True), window_ms=5)
+
+  with pytest.raises(RuntimeError, match='provider down'):
+    client.embed(['x'])
+
+
+def test_embed_array_is_contiguous_float32_and_matches_embed():
+  client = EmbeddingsClient()
+
+  matrix = client.embed_array(['python', 'go', ''])
+
+  assert matrix.shape == (3, 64)
+  assert matrix.dtype == np.float32 and matrix.flags['C_CONTIGUOUS']
+  assert not matrix[:, 32:].any()  # digest is zero padded to dim
+  assert client.embed(['go'])[0] == matrix[1].tolist()
+
+
+def test_default_client_is_shared_and_offline():
+  client = get_embeddings_client()
+
+  assert client is get_embeddings_client()
+  assert len(client.embed(['python'])[0]) == 64
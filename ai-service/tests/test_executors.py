@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils.executors import CPU, IO, BoundedExecutor, ExecutorSaturated, get_executors, run_workload
+
+
+def test_bounded_executor_rejects_when_queue_is_full():
+  release = threading.Event()
+  executor = BoundedExecutor('cpu', ThreadPoolExecutor(max_workers=1), max_pending=1, retry_after=3)
+
+  async def _scenario():
+    first = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    with pytest.raises(ExecutorSaturated) as exc_info:
+      await executor.run(lambda: None)
+    release.set()
+    await first
+    return exc_info.value
+
+  error = asyncio.run(_scenario())
+  executor.shutdown()
+
+  assert error.status_code == 503
+  assert error.headers['Retry-After'] == '3'
+  assert executor.pending == 0
+
+
+def test_run_workload_dispatches_to_named_pool():
+  async def _scenario():
+    cpu_thread = await run_workload(CPU, lambda: threading.current_thread().name)
+    io_thread = await run_workload(IO, lambda: threading.current_thread().name)
+    return cpu_thread, io_thread
+
+  cpu_thread, io_thread = asyncio.run(_scenario())
+
+  assert cpu_thread.startswith('ai-cpu')
+  assert io_thread.startswith('ai-io')
+
+
+def test_saturated_route_returns_503_with_retry_after(monkeypatch):
+  with TestClient(main.app) as client:
+    cpu = get_executors()[CPU]
+    monkeypatch.setattr(cpu, 'max_pending', 0)
+    response = client.post(
+      '/ai/match',
+      json={'resume_skills': ['Python'], 'job_required_skills': ['Python'], 'resume_text': 'Python'}
+    )
+
+  assert response.status_code == 503
+  assert response.headers['retry-after'] == '1'
+  assert response.json()['detail']['error'] == 'service_overloaded'
+
+
+def test_async_routes_still_serve_requests():
+  with TestClient(main.app) as client:
+    match = client.post(
+      '/ai/match',
+      json={'resume_skills': ['Python'], 'job_required_skills': ['Python'], 'resume_text': 'Experience: Python APIs'}
+    )
+    recommend = client.post(
+      '/ai/recommend',
+      json={'candidate': {'skills': ['Python']}, 'jobs': [{'job_id': 'j1', 'title': 'Dev', 'required_skills': ['Python']}]}
+    )
+
+  assert match.status_code == 200
+  assert 0 <= match.json()['match_score'] <= 1
+  assert recommend.status_code == 200
+  assert recommend.json()['ranked_jobs'][0]['job_id'] == 'j1'
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.bench_import import _import_profile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_LAZY_MODULES = ('pypdf', 'docx')
+# ai-service's own import work (``main`` minus the fastapi import) relative to
+# fastapi's, so the bound holds on slow and fast runners alike. Best of _RUNS.
+_BUDGET_RATIO = float(os.getenv('AI_IMPORT_BUDGET_RATIO', '1.5'))
+_RUNS = 3
+
+
+def test_cold_start_does_not_import_document_libraries():
+  # A fresh interpreter, so modules imported by other tests do not count.
+  proc = subprocess.run(
+    [sys.executable, '-c', f'import sys, main; print(",".join(m for m in {_LAZY_MODULES!r} if m in sys.modules))'],
+    cwd=ROOT,
+    capture_output=True,
+    text=True,
+    check=True
+  )
+  loaded = [name for name in proc.stdout.strip().split(',') if name]
+
+  assert loaded == [], f'{loaded} must be imported on first use, not at startup'
+
+
+def test_cold_start_import_time_stays_within_budget():
+  profile = min((_import_profile() for _ in range(_RUNS)), key=lambda profile: profile['main'])
+  framework = profile['fastapi']
+  own = profile['main'] - framework
+
+  assert own <= _BUDGET_RATIO * framework, (
+    f'import main spends {own / 1000:.1f} ms outside fastapi ({framework / 1000:.1f} ms), '
+    f'over {_BUDGET_RATIO}x; slowest: {sorted(profile, key=profile.get, reverse=True)[:10]}'
+  )
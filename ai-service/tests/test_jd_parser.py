@@ -1,5 +1,8 @@
+import json
+
 from models.job import JobDescriptionRequest
 from services.jd_parser import JobDescriptionParser, parse_job_description
+from provider_fakes import OverlapProbe
 
 SAMPLE_JD = """
 We are hiring a Senior Backend Engineer to build resilient APIs and microservices.
@@ -47,3 +50,38 @@ def test_parse_job_description_handles_llm_fallback(monkeypatch):
   assert result.required_skills, 'heuristic parser should still return skills'
   assert result.warnings, 'warnings should note the fallback'
 
+
+def _probed_parser(monkeypatch, embedding_input=None, timeout=5.0):
+  parser = JobDescriptionParser()
+  if embedding_input is not None:
+    monkeypatch.setattr(parser._settings, 'embedding_input', embedding_input)
+  probe = OverlapProbe(json.dumps({'summary': 'Build APIs.', 'required_skills': ['Python']}), [0.5], timeout)
+  parser._use_llm = True
+  parser._llm_client = probe
+  parser._embeddings_client = probe
+  return parser, probe
+
+
+def test_parse_job_description_embeds_title_summary_and_text_when_configured(monkeypatch):
+  parser, probe = _probed_parser(monkeypatch, 'summary', timeout=0.05)
+  payload = JobDescriptionRequest(job_title='Backend Engineer', job_description=SAMPLE_JD, location='Remote')
+
+  result = parser.parse(payload)
+
+  assert result.embedding_input == 'summary'
+  assert probe.embedded == [f'Backend Engineer\nBuild APIs.\n{SAMPLE_JD.strip()}']
+  assert probe.overlapped == [False, True]
+
+
+def test_parse_job_description_embeds_document_by_default_overlapping_llm(monkeypatch):
+  parser, probe = _probed_parser(monkeypatch)
+  payload = JobDescriptionRequest(job_title='Backend Engineer', job_description=SAMPLE_JD, location='Remote')
+
+  result = parser.parse(payload)
+
+  assert result.summary == 'Build APIs.'
+  assert result.embeddings == [0.5]
+  assert result.embedding_input == 'document'
+  assert probe.embedded == [f'Backend Engineer\n{SAMPLE_JD.strip()}']
+  assert probe.overlapped == [True, True], 'provider calls ran sequentially'
+  assert len(probe.prompts) == 1, 'summary call should be skipped'
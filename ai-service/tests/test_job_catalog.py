@@ -0,0 +1,107 @@
+from fastapi.testclient import TestClient
+
+import main
+from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest
+from services import job_catalog
+from services.job_catalog import CatalogDimensionMismatch, JobCatalog
+from services.recommendation_service import recommend_jobs
+from utils.skill_sets import get_skill_vocabulary
+
+CANDIDATE = CandidateProfile(
+  skills=['Python', 'Docker', ' SQL '], preferred_locations=['Berlin'], seniority='Senior', embeddings=[1.0, 0.0, 0.5]
+)
+
+
+def _job(idx, required, nice=(), location='remote', seniority=None, embeddings=(0.5, 0.5, 0.0)):
+  return JobRecommendationInput(
+    job_id=f'job-{idx}',
+    title=f'Job {idx}',
+    required_skills=list(required),
+    nice_to_have_skills=list(nice),
+    location=location,
+    seniority=seniority,
+    embeddings=list(embeddings)
+  )
+
+
+def test_catalog_ranks_like_recommend_jobs_after_upserts_and_removals():
+  first = [
+    _job(0, ['Python', 'python', 'Go']),
+    _job(1, ['Rust'], ['Docker'], location=' berlin ', seniority='senior'),
+    _job(2, ['Java'], location='London', embeddings=()),
+    _job(3, ['Kotlin'], seniority='junior', embeddings=(0.0, 0.0, 0.0)),
+    _job(4, [], ['sql']),
+  ]
+  second = [_job(1, ['Docker', 'Elixir'], location='Berlin'), _job(5, ['Python']), _job(5, ['SQL', 'Go'])]
+  catalog = JobCatalog()
+  catalog.upsert(first)
+  size = catalog.upsert(second, removed_job_ids=['job-3', 'job-404'])
+
+  # Replacements go to the end, as a full request listing the jobs in upsert order would have them.
+  current = [first[0], first[2], first[4], second[0], second[2]]
+  expected = recommend_jobs(RecommendationRequest(candidate=CANDIDATE, jobs=current)).ranked_jobs
+  top, total_matches = catalog.top(CANDIDATE, 3)
+
+  assert size == len(catalog) == 5
+  assert total_matches == len(expected)
+  assert [(job.job_id, score) for job, score, _ in top] == [(job.job_id, job.score) for job in expected[:3]]
+
+
+def _ranking(catalog, k=10):
+  return [(job.job_id, score) for job, score, _ in catalog.top(CANDIDATE, k)[0]]
+
+
+def _expected(jobs, k=10):
+  return [(job.job_id, job.score) for job in recommend_jobs(RecommendationRequest(candidate=CANDIDATE, jobs=jobs)).ranked_jobs[:k]]
+
+
+def test_catalogs_on_one_store_see_each_others_updates(tmp_path, monkeypatch):
+  # Prune tombstones as soon as they outnumber live jobs, so the lagging worker must rebuild.
+  monkeypatch.setattr(job_catalog, '_MIN_CAPACITY', 1)
+  path = str(tmp_path / 'catalog.sqlite3')
+  vocabulary_size = len(get_skill_vocabulary())
+  first, second = JobCatalog(path), JobCatalog(path)
+  jobs = [_job(idx, skills) for idx, skills in enumerate([['Python', 'Catalog-only skill'], ['Docker'], ['Go'], ['SQL']])]
+
+  first.upsert(jobs)
+  assert _ranking(second) == _expected(jobs)
+  second.upsert([_job(1, ['Docker', 'SQL'], embeddings=(1.0, 0.0, 0.5))], removed_job_ids=['job-2'])
+  current = [jobs[0], jobs[3], _job(1, ['Docker', 'SQL'], embeddings=(1.0, 0.0, 0.5))]
+  assert _ranking(first) == _expected(current)
+
+  second.upsert([], removed_job_ids=['job-0', 'job-3'])
+  assert _ranking(first) == _expected(current[2:])
+  # A worker started now rebuilds from the same store.
+  assert _ranking(JobCatalog(path)) == _expected(current[2:])
+  assert len(first) == len(second) == 1
+  assert len(get_skill_vocabulary()) == vocabulary_size
+
+
+def test_mismatched_embedding_dimension_leaves_catalog_unchanged():
+  catalog = JobCatalog()
+  catalog.upsert([_job(0, ['Python'])])
+  try:
+    catalog.upsert([_job(1, ['Go']), _job(2, ['Rust'], embeddings=(1.0, 0.0))], removed_job_ids=['job-0'])
+  except CatalogDimensionMismatch:
+    pass
+  else:
+    raise AssertionError('expected CatalogDimensionMismatch')
+  assert [job.job_id for job, _, _ in catalog.top(CANDIDATE, 5)[0]] == ['job-0']
+
+
+def test_catalog_routes(monkeypatch):
+  monkeypatch.setattr(job_catalog, '_CATALOG', JobCatalog())
+  jobs = [_job(idx, skills).model_dump() for idx, skills in enumerate([['Python', 'Go'], ['Go'], ['Docker', 'SQL']])]
+  with TestClient(main.app) as client:
+    updated = client.post('/ai/jobs/catalog', json={'jobs': jobs})
+    rejected = client.post('/ai/jobs/catalog', json={'jobs': [{**jobs[0], 'embeddings': [1.0]}]})
+    status = client.get('/ai/jobs/catalog')
+    recommended = client.post('/ai/recommend/catalog', json={'candidate': CANDIDATE.model_dump(), 'top_k': 2})
+
+  assert updated.json() == {'size': 3}
+  assert rejected.status_code == 400
+  assert rejected.json()['detail']['error'] == 'embedding_dimension_mismatch'
+  assert status.json() == {'size': 3}
+  body = recommended.json()
+  assert [job['job_id'] for job in body['ranked_jobs']] == ['job-2', 'job-0']
+  assert body['total_matches'] == 3
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.llm_client import (
+  CachedLLMClient,
+  LLMCompletion,
+  LLMResponseCache,
+  MockLLMClient,
+  OpenAILLMClient,
+  get_llm_client
+)
+
+
+class _MockOpenAI:
+  """Tiny OpenAI-compatible chat completions server."""
+
+  def __init__(self, delay: float = 0.0, fail_first: int = 0, status: int = 500) -> None:
+    self.delay = delay
+    self.fail_first = fail_first
+    self.status = status
+    self.requests = 0
+    self.active = 0
+    self.max_active = 0
+    self._lock = threading.Lock()
+    mock = self
+
+    class Handler(BaseHTTPRequestHandler):
+      def log_message(self, *args):  # noqa: D401
+        return
+
+      def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with mock._lock:
+          mock.requests += 1
+          attempt = mock.requests
+          mock.active += 1
+          mock.max_active = max(mock.max_active, mock.active)
+        try:
+          time.sleep(mock.delay)
+          if attempt <= mock.fail_first:
+            self._send(mock.status, {'error': {'message': 'try again'}})
+            return
+          prompt = body['messages'][-1]['content']
+          self._send(200, {
+            'id': f'cmpl-{attempt}',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': body['model'],
+            'choices': [{
+              'index': 0,
+              'finish_reason': 'stop',
+              'message': {'role': 'assistant', 'content': f'echo:{prompt}'}
+            }],
+            'usage': {'prompt_tokens': 7, 'completion_tokens': 3, 'total_tokens': 10}
+          })
+        finally:
+          with mock._lock:
+            mock.active -= 1
+
+      def _send(self, code, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+          self.wfile.write(data)
+        except BrokenPipeError:
+          pass  # client gave up (timeout test)
+
+    self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+    threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+  def close(self):
+    self.server.shutdown()
+
+
+@pytest.fixture
+def mock_server():
+  servers = []
+
+  def _start(**kwargs):
+    server = _MockOpenAI(**kwargs)
+    servers.append(server)
+    return server
+
+  yield _start
+  for server in servers:
+    server.close()
+
+
+def _client(server, **kwargs):
+  return OpenAILLMClient(api_key='test-key', base_url=server.base_url, backoff_base=0.01, **kwargs)
+
+
+def test_run_returns_completion_and_counts_tokens(mock_server):
+  server = mock_server()
+  client = _client(server)
+
+  assert client.run('hello', system_prompt='be brief') == 'echo:hello'
+  assert client.usage_snapshot() == {
+    'calls': 1, 'retries': 0, 'failures': 0, 'prompt_tokens': 7, 'completion_tokens': 3, 'total_tokens': 10
+  }
+
+
+def test_concurrency_is_capped_by_semaphore(mock_server):
+  server = mock_server(delay=0.05)
+  client = _client(server, max_concurrency=2)
+
+  async def _burst():
+    return await asyncio.gather(*(client.arun(f'p{i}') for i in range(8)))
+
+  results = asyncio.run(_burst())
+
+  assert sorted(results) == sorted(f'echo:p{i}' for i in range(8))
+  assert server.max_active <= 2
+  assert client.usage_snapshot()['calls'] == 8
+
+
+def test_retries_transient_errors_with_backoff(mock_server):
+  server = mock_server(fail_first=2, status=503)
+  client = _client(server, max_retries=3)
+
+  assert client.run('again') == 'echo:again'
+  usage = client.usage_snapshot()
+  assert usage['retries'] == 2
+  assert usage['calls'] == 1
+
+
+def test_does_not_retry_client_errors(mock_server):
+  server = mock_server(fail_first=5, status=400)
+  client = _client(server, max_retries=3)
+
+  with pytest.raises(Exception):
+    client.run('bad')
+  assert server.requests == 1
+  assert client.usage_snapshot()['failures'] == 1
+
+
+def test_per_call_timeout(mock_server):
+  server = mock_server(delay=0.5)
+  client = _client(server, timeout=0.1, max_retries=1)
+
+  with pytest.raises(Exception):
+    client.run('slow')
+  assert client.usage_snapshot()['retries'] == 1
+
+
+def test_mock_provider_is_default():
+  client = get_llm_client()
+
+  assert isinstance(client, MockLLMClient)
+  assert client.run('Line one\nLine two') == 'Line one Line two'
+
+
+def _cache(tmp_path, **kwargs):
+  options = {'ttl_seconds': 3600, 'max_bytes': 1_000_000}
+  options.update(kwargs)
+  return LLMResponseCache(str(tmp_path / 'llm_cache.sqlite3'), **options)
+
+
+def test_cached_client_serves_repeat_prompts_without_provider_call(mock_server, tmp_path):
+  server = mock_server()
+  client = CachedLLMClient(inner=_client(server), cache=_cache(tmp_path))
+
+  first = client.run('resume text', temperature=0.1, system_prompt='json')
+  second = client.run('resume text', temperature=0.1, system_prompt='json')
+
+  assert first == second == 'echo:resume text'
+  assert server.requests == 1
+  stats = client.cache_stats()
+  assert (stats['hits'], stats['misses']) == (1, 1)
+  assert stats['hit_rate'] == 0.5
+  assert stats['saved_tokens'] == 10
+
+
+def test_cache_key_includes_temperature_and_system_prompt(mock_server, tmp_path):
+  server = mock_server()
+  client = CachedLLMClient(inner=_client(server), cache=_cache(tmp_path))
+
+  client.run('same', temperature=0.1)
+  client.run('same', temperature=0.2)
+  client.run('same', temperature=0.1, system_prompt='other')
+
+  assert server.requests == 3
+
+
+def test_cache_persists_across_instances(tmp_path):
+  key = LLMResponseCache.make_key('m', None, 'p', 0.1)
+  _cache(tmp_path).put(key, LLMCompletion('stored', 5, 2))
+
+  assert _cache(tmp_path).get(key) == LLMCompletion('stored', 5, 2)
+
+
+def test_cache_entries_expire_after_ttl(tmp_path):
+  cache = _cache(tmp_path, ttl_seconds=0.05)
+  key = cache.make_key('m', None, 'p', 0.1)
+  cache.put(key, LLMCompletion('old'))
+  time.sleep(0.1)
+
+  assert cache.get(key) is None
+  assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used_over_size_limit(tmp_path):
+  cache = _cache(tmp_path, max_bytes=250, evict_every=1)
+  keys = [cache.make_key('m', None, f'p{i}', 0.1) for i in range(3)]
+  cache.put(keys[0], LLMCompletion('a' * 100))
+  cache.put(keys[1], LLMCompletion('b' * 100))
+  time.sleep(0.01)
+  assert cache.get(keys[0]) is not None  # keys[1] is now least recently used
+  cache.put(keys[2], LLMCompletion('c' * 100))
+
+  assert cache.get(keys[1]) is None
+  assert cache.get(keys[0]) is not None
+  assert cache.get(keys[2]) is not None
+  assert cache.stats_snapshot()['evictions'] == 1
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+import main
+from services.jd_parser import get_jd_parser
+from services.resume_parser import get_resume_parser
+from services.warmup import warm_up
+
+
+def test_health_reports_ready_after_warmup():
+  with TestClient(main.app) as client:
+    response = client.get('/health')
+
+  assert response.status_code == 200
+  body = response.json()
+  assert body['ready'] is True
+  assert body['status'] == 'ok'
+
+
+def test_health_not_ready_when_warmup_fails(monkeypatch):
+  def _boom():
+    raise RuntimeError('ontology unavailable')
+
+  monkeypatch.setattr(main, 'warm_up', _boom)
+  with TestClient(main.app) as client:
+    response = client.get('/health')
+
+  assert response.status_code == 503
+  assert response.json()['ready'] is False
+
+
+def test_warm_up_runs_every_pipeline_without_recording_unknown_skills(tmp_path, monkeypatch):
+  unknown_path = tmp_path / 'unknown.json'
+  monkeypatch.setenv('UNKNOWN_SKILLS_PATH', str(unknown_path))
+
+  timings = warm_up()
+
+  for stage in ('ontology', 'parse_resume', 'parse_jd', 'match', 'recommend', 'ats_scan'):
+    assert stage in timings
+  assert not unknown_path.exists()
+
+
+def test_warm_up_warms_parser_singletons_without_calling_the_llm(monkeypatch):
+  prompts = []
+  calls = []
+
+  class _RecordingLLM:
+    def run(self, prompt, temperature=0.2, system_prompt=None):
+      prompts.append(prompt)
+      return '{}'
+
+  for parser in (get_resume_parser(), get_jd_parser()):
+    monkeypatch.setattr(parser, '_use_llm', True)
+    monkeypatch.setattr(parser, '_llm_client', _RecordingLLM())
+    parse = parser.parse
+
+    def _recorded(payload, use_llm=True, _parse=parse, _name=type(parser).__name__):
+      calls.append((_name, use_llm))
+      return _parse(payload, use_llm=use_llm)
+
+    monkeypatch.setattr(parser, 'parse', _recorded)
+
+  warm_up(['parse_resume', 'parse_jd', 'ats_scan'])
+
+  assert prompts == []
+  assert sorted(calls) == [('JobDescriptionParser', False)] * 2 + [('ResumeParser', False)] * 2
+  assert get_resume_parser().uses_llm and get_jd_parser().uses_llm
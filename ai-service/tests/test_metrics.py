@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils import metrics
+from utils.settings import get_settings
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+  monkeypatch.setattr(get_settings(), 'metrics_dir', str(tmp_path))
+  return tmp_path
+
+
+def _dead_pid() -> int:
+  pid = 4_000_000
+  while True:
+    try:
+      os.kill(pid, 0)
+    except ProcessLookupError:
+      return pid
+    except PermissionError:
+      pass
+    pid += 1
+
+
+def _sample(text: str, prefix: str) -> float:
+  lines = [line for line in text.splitlines() if line.startswith(prefix)]
+  assert lines, f'{prefix} not exported'
+  return float(lines[0].rsplit(' ', 1)[1])
+
+
+def test_metrics_endpoint_exports_request_stage_and_cache_metrics(metrics_dir):
+  with TestClient(main.app) as client:
+    response = client.post('/ai/match', json={'resume_text': 'Built APIs with Python.', 'job_required_skills': ['Python']})
+    assert response.status_code == 200
+    scrape = client.get('/metrics')
+
+  assert scrape.status_code == 200
+  assert scrape.headers['content-type'].startswith('text/plain; version=0.0.4')
+  body = scrape.text
+  assert _sample(body, 'ai_http_requests_total{method="POST",route="/ai/match",status="200"}') >= 1
+  assert _sample(body, 'ai_http_request_duration_seconds_count{route="/ai/match"}') >= 1
+  assert 'ai_http_request_duration_seconds_bucket{route="/ai/match",le="+Inf"}' in body
+  assert _sample(body, 'ai_stage_duration_seconds_count{stage="match.rse"}') >= 1
+  assert 'ai_cache_hits_total{cache="ontology"}' in body
+  assert _sample(body, f'ai_process_resident_memory_bytes{{pid="{os.getpid()}"}}') > 0
+  assert (metrics_dir / f'{os.getpid()}.json').exists()
+
+
+def test_snapshots_from_exited_workers_keep_counters_but_drop_gauges(metrics_dir):
+  dead = _dead_pid()
+  (metrics_dir / f'{dead}.json').write_text(json.dumps({
+    'pid': dead,
+    'counters': [['ai_unknown_skills_recorded_total', {}, 7]],
+    'gauges': [['ai_process_resident_memory_bytes', {'pid': str(dead)}, 123]],
+    'histograms': [],
+  }))
+
+  body = metrics.render_prometheus()
+  own = metrics.snapshot()
+  own_recorded = next(v for name, _, v in own['counters'] if name == 'ai_unknown_skills_recorded_total')
+
+  assert _sample(body, 'ai_unknown_skills_recorded_total') == own_recorded + 7
+  assert f'pid="{dead}"' not in body
@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils import profiling
+from utils.settings import get_settings
+
+_MATCH = {'resume_text': 'Experience\nBuilt APIs with Python.', 'job_required_skills': ['Python']}
+
+
+@pytest.fixture
+def profile_settings(tmp_path, monkeypatch):
+  settings = get_settings()
+  monkeypatch.setattr(settings, 'profile_dir', str(tmp_path))
+  monkeypatch.setattr(settings, 'profile_admin_token', 's3cret')
+  monkeypatch.setattr(settings, 'profile_sample_every', 0)
+  return tmp_path
+
+
+def test_admin_header_profiles_request_and_stores_artifacts(profile_settings):
+  with TestClient(main.app) as client:
+    response = client.post(
+      '/ai/match', json=_MATCH, headers={'X-Profile': '1', 'X-Admin-Token': 's3cret', 'X-Request-ID': 'req-42'}
+    )
+
+  assert response.status_code == 200
+  assert response.headers['x-request-id'] == 'req-42'
+  assert response.headers['x-profile-id'] == 'req-42'
+  assert (profile_settings / 'req-42.prof').exists()
+  assert 'evaluate_requirements' in (profile_settings / 'req-42.txt').read_text()
+
+
+def test_profiling_without_valid_token_is_forbidden(profile_settings):
+  with TestClient(main.app) as client:
+    response = client.post('/ai/match?profile=1', json=_MATCH, headers={'X-Admin-Token': 'wrong'})
+
+  assert response.status_code == 403
+  assert response.json()['detail']['error'] == 'profiling_forbidden'
+  assert not list(profile_settings.iterdir())
+
+
+def test_sampling_profiles_one_in_n_ai_requests(profile_settings, monkeypatch):
+  monkeypatch.setattr(get_settings(), 'profile_sample_every', 2)
+  monkeypatch.setattr(profiling, '_SAMPLE_COUNTER', iter(range(1, 100)))
+  with TestClient(main.app) as client:
+    client.get('/health')
+    responses = [client.post('/ai/match', json=_MATCH) for _ in range(4)]
+
+  assert sum('x-profile-id' in r.headers for r in responses) == 2
+  assert len(list(profile_settings.glob('*.prof'))) == 2
+
+
+def test_unsafe_request_ids_are_replaced(profile_settings):
+  with TestClient(main.app) as client:
+    response = client.get('/health', headers={'X-Request-ID': '../../etc/passwd'})
+
+  assert response.headers['x-request-id'] != '../../etc/passwd'
+  assert 'x-profile-id' not in response.headers
@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+import main
+from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest
+from services.ranking_cache import RankingCache
+from services.recommendation_service import recommend_jobs
+
+CANDIDATE = {'id': 'cand-1', 'skills': ['Python', 'Django', 'Docker'], 'preferred_locations': ['remote']}
+
+
+def _job(idx, skills, location='remote'):
+  return {'job_id': f'job-{idx}', 'title': f'Job {idx}', 'required_skills': skills, 'location': location}
+
+
+def _ranking(body):
+  return [(job['job_id'], job['score'], job['rank']) for job in body['ranked_jobs']]
+
+
+def test_delta_refresh_matches_full_ranking():
+  jobs = [
+    _job(0, ['Python']), _job(1, ['Django', 'Go']), _job(2, ['Rust'], 'Berlin'),
+    _job(3, ['Python', 'Docker']), _job(4, ['Python']),
+  ]
+  added = [_job(5, ['Docker']), _job(1, ['Django', 'Python'])]
+  with TestClient(main.app) as client:
+    full = client.post('/ai/recommend', json={'candidate': CANDIDATE, 'jobs': jobs, 'issue_ranking_token': True}).json()
+    token = full['ranking_token']
+    delta = client.post(
+      '/ai/recommend',
+      json={'candidate': CANDIDATE, 'jobs': added, 'removed_job_ids': ['job-3'], 'ranking_token': token}
+    )
+    kept = [job for job in jobs if job['job_id'] not in ('job-1', 'job-3')]
+    expected = client.post('/ai/recommend', json={'candidate': CANDIDATE, 'jobs': kept + added}).json()
+
+  assert token
+  assert delta.status_code == 200
+  assert delta.json()['ranking_token'] == token
+  assert _ranking(delta.json()) == _ranking(expected)
+  assert expected['ranking_token'] is None
+
+
+def test_unknown_or_foreign_token_is_rejected():
+  with TestClient(main.app) as client:
+    token = client.post(
+      '/ai/recommend', json={'candidate': CANDIDATE, 'jobs': [_job(0, ['Python'])], 'issue_ranking_token': True}
+    ).json()['ranking_token']
+    other = client.post('/ai/recommend', json={'candidate': {'skills': ['Go']}, 'jobs': [], 'ranking_token': token})
+    unknown = client.post('/ai/recommend', json={'candidate': CANDIDATE, 'jobs': [], 'ranking_token': 'nope'})
+
+  for response in (other, unknown):
+    assert response.status_code == 409
+    assert response.json()['detail']['error'] == 'ranking_token_expired'
+
+
+def test_cache_evicts_least_recently_used_and_expired():
+  candidate = CandidateProfile(skills=['Python'])
+  ranked = recommend_jobs(RecommendationRequest(
+    candidate=candidate, jobs=[JobRecommendationInput(job_id='a', title='A', required_skills=['Python'])]
+  )).ranked_jobs
+  cache = RankingCache(max_entries=2)
+  first, second = cache.store(candidate, ranked), cache.store(candidate, ranked)
+  assert cache.merge(first, candidate, [], [], []) is not None
+  cache.store(candidate, ranked)
+  assert cache.contains(first, candidate) and not cache.contains(second, candidate)
+
+  expired = RankingCache(ttl_seconds=0)
+  assert not expired.contains(expired.store(candidate, ranked), candidate)
+  assert RankingCache(max_entries=0).store(candidate, ranked) is None
+
+
+def test_token_issued_by_one_worker_refreshes_on_another(tmp_path):
+  candidate = CandidateProfile(skills=['Python', 'Docker'])
+  jobs = [JobRecommendationInput(job_id=f'job-{idx}', title='Job', required_skills=skills)
+          for idx, skills in enumerate([['Python'], ['Docker', 'Go'], ['Python', 'Docker']])]
+  added = JobRecommendationInput(job_id='job-3', title='Job', required_skills=['Docker'])
+  path = str(tmp_path / 'rankings.sqlite3')
+  issuing, refreshing = RankingCache(path=path), RankingCache(path=path)
+
+  token = issuing.store(candidate, recommend_jobs(RecommendationRequest(candidate=candidate, jobs=jobs)).ranked_jobs)
+  delta = recommend_jobs(RecommendationRequest(candidate=candidate, jobs=[added])).ranked_jobs
+  merged = refreshing.merge(token, candidate, ['job-3'], ['job-1'], delta)
+
+  expected = recommend_jobs(RecommendationRequest(candidate=candidate, jobs=[jobs[0], jobs[2], added])).ranked_jobs
+  assert [job.model_dump() for job in merged] == [job.model_dump() for job in expected]
+  # The merge is visible to the issuing worker too.
+  assert [job.job_id for job in issuing.merge(token, candidate, [], [], [])] == [job.job_id for job in expected]
+  assert not refreshing.contains(token, CandidateProfile(skills=['Go']))
@@ -1,5 +1,29 @@
-from models.recommendation import CandidateProfile, JobRecommendationInput, RecommendationRequest
-from services.recommendation_service import recommend_jobs
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import main
+from models.recommendation import (
+  BatchRecommendationRequest,
+  CandidateProfile,
+  CandidateRankingRequest,
+  JobRecommendationInput,
+  RecommendationRequest
+)
+from services.job_catalog import JobCatalog
+from services.recommendation_service import (
+  MIN_SCORE_THRESHOLD,
+  _embedding_scores,
+  _embedding_similarities,
+  _embedding_similarity,
+  _reason,
+  _score_job,
+  rank_candidates,
+  recommend_batch,
+  recommend_jobs
+)
+from utils.settings import get_settings
 
 
 def test_recommend_jobs_prioritizes_overlap_and_similarity():
@@ -79,3 +103,197 @@ def test_embedding_similarity_and_nice_to_have_skills_influence_score():
   assert strong.job_id == 'job-embedding-strong'
   assert strong.score > weak.score
 
+
+
+def test_vectorized_embedding_similarity_matches_per_job_scores():
+  rng = np.random.default_rng(7)
+  candidate = CandidateProfile(skills=[], embeddings=rng.normal(size=16).tolist())
+  jobs = [
+    JobRecommendationInput(job_id=f'job-{i}', title='Engineer', embeddings=rng.normal(size=16).tolist())
+    for i in range(20)
+  ]
+  jobs.append(JobRecommendationInput(job_id='no-vector', title='Engineer'))
+  jobs.append(JobRecommendationInput(job_id='zero-vector', title='Engineer', embeddings=[0.0] * 16))
+
+  vectorized = _embedding_similarities(candidate, jobs)
+
+  expected = [_embedding_similarity(candidate, job) for job in jobs]
+  assert np.allclose(vectorized, expected, atol=1e-6)
+
+
+def test_rank_candidates_matches_per_pair_scoring():
+  job = JobRecommendationInput(
+    job_id='job-1',
+    title='Backend Engineer',
+    required_skills=['Python', 'Docker', 'python'],
+    nice_to_have_skills=['AWS'],
+    embeddings=[0.6, 0.8, 0.0],
+    location='Berlin',
+    seniority='Senior'
+  )
+  candidates = [
+    CandidateProfile(id='a', skills=['python'], embeddings=[0.6, 0.7, 0.1], preferred_locations=['berlin']),
+    CandidateProfile(id='b', skills=['Docker', 'AWS'], seniority='senior'),
+    CandidateProfile(id='c', skills=['Go'], embeddings=[-1.0, 0.0, 0.0], preferred_locations=['Paris']),
+    CandidateProfile(id='d', skills=[' Python ', 'Docker'], embeddings=[0.6, 0.8, 0.0], seniority='junior'),
+    CandidateProfile(id='e', skills=['Python'], embeddings=[0.6, 0.7, 0.1], preferred_locations=['Berlin']),
+  ]
+
+  response = rank_candidates(CandidateRankingRequest(job=job, candidates=candidates, top_k=3))
+
+  embeddings = _embedding_scores(job.embeddings, [candidate.embeddings for candidate in candidates])
+  expected = sorted(
+    ((round(_score_job(candidate, job, float(embeddings[idx]))[0], 3), idx) for idx, candidate in enumerate(candidates)),
+    key=lambda item: -item[0]
+  )
+  assert [(item.score, item.index) for item in response.ranked_candidates] == expected[:3]
+  assert [item.rank for item in response.ranked_candidates] == [1, 2, 3]
+  assert response.ranked_candidates[0].candidate_id == 'd'
+  # 'a' and 'e' tie; request order breaks the tie.
+  assert [item.candidate_id for item in response.ranked_candidates[1:]] == ['a', 'e']
+  assert response.total_matches == 5
+  assert 'Skill overlap: python' in response.ranked_candidates[1].reason
+
+
+def _batch_fixture():
+  rng = np.random.default_rng(3)
+  skills = ['Python', 'Docker', 'Go', 'SQL', 'AWS', 'React']
+  jobs = [
+    JobRecommendationInput(
+      job_id=f'job-{i}',
+      title='Engineer',
+      required_skills=list(rng.choice(skills, size=int(rng.integers(0, 4)))),
+      nice_to_have_skills=list(rng.choice(skills, size=int(rng.integers(0, 2)))),
+      embeddings=rng.normal(size=8).tolist() if i % 5 else [],
+      location=['remote', 'Berlin', None][i % 3],
+      seniority=['senior', None][i % 2]
+    )
+    for i in range(30)
+  ]
+  candidates = [
+    CandidateProfile(
+      id=f'cand-{i}',
+      skills=list(rng.choice(skills + ['python'], size=int(rng.integers(0, 5)))),
+      embeddings=rng.normal(size=8).tolist() if i % 4 else [],
+      preferred_locations=[['berlin'], [], ['Paris']][i % 3],
+      seniority=['Senior', None, 'junior'][i % 3]
+    )
+    for i in range(12)
+  ]
+  return candidates, jobs
+
+
+def _baseline_ranking(scored):
+  """``(rounded score, index)`` above the threshold, stable-sorted as the scalar scorer ranks."""
+  kept = [(round(score, 3), idx) for idx, score in enumerate(scored) if score >= MIN_SCORE_THRESHOLD]
+  return sorted(kept, key=lambda item: -item[0])
+
+
+def test_vectorized_rankings_match_float64_score_job_on_fixed_corpus():
+  rng = np.random.default_rng(11)
+  skills = [f'Skill {i}' for i in range(40)]
+  jobs = [
+    JobRecommendationInput(
+      job_id=f'job-{i}',
+      title='Engineer',
+      required_skills=list(rng.choice(skills, size=int(rng.integers(1, 5)))),
+      nice_to_have_skills=list(rng.choice(skills, size=int(rng.integers(0, 3)))),
+      embeddings=rng.normal(size=384).tolist(),
+      location=['remote', 'Berlin', None][i % 3],
+      seniority=['senior', 'mid', None][i % 3]
+    )
+    for i in range(300)
+  ]
+  candidates = [
+    CandidateProfile(
+      id=f'cand-{i}',
+      skills=list(rng.choice(skills, size=int(rng.integers(2, 8)))),
+      embeddings=rng.normal(size=384).tolist(),
+      preferred_locations=[['Berlin'], []][i % 2],
+      seniority=['senior', None][i % 2]
+    )
+    for i in range(6)
+  ]
+
+  batch = recommend_batch(BatchRecommendationRequest(candidates=candidates, jobs=jobs, top_k=len(jobs))).results
+  for candidate, result in zip(candidates, batch):
+    # No embedding_score passed: the scalar float64 cosine, as before vectorizing.
+    expected = _baseline_ranking([_score_job(candidate, job)[0] for job in jobs])
+    ranked = recommend_jobs(RecommendationRequest(candidate=candidate, jobs=jobs)).ranked_jobs
+    assert [(job.score, job.job_id) for job in ranked] == [(score, jobs[idx].job_id) for score, idx in expected]
+    assert [(job.score, job.job_id) for job in result.ranked_jobs] == [(job.score, job.job_id) for job in ranked]
+
+  for job in jobs[:20]:
+    expected = _baseline_ranking([_score_job(candidate, job)[0] for candidate in candidates])
+    response = rank_candidates(CandidateRankingRequest(job=job, candidates=candidates, top_k=len(candidates)))
+    assert [(item.score, item.index) for item in response.ranked_candidates] == expected
+
+
+def test_recommend_batch_matches_per_candidate_recommend_jobs(monkeypatch):
+  candidates, jobs = _batch_fixture()
+  # Tiny blocks, so several candidate blocks share one job set.
+  monkeypatch.setattr(get_settings(), 'recommend_batch_block_mb', 0)
+
+  response = recommend_batch(BatchRecommendationRequest(candidates=candidates, jobs=jobs, top_k=5))
+
+  assert [result.index for result in response.results] == list(range(len(candidates)))
+  for candidate, result in zip(candidates, response.results):
+    expected = recommend_jobs(RecommendationRequest(candidate=candidate, jobs=jobs)).ranked_jobs
+    assert result.candidate_id == candidate.id
+    assert result.total_matches == len(expected)
+    assert [job.model_dump() for job in result.ranked_jobs] == [job.model_dump() for job in expected[:5]]
+
+
+def test_recommend_batch_route_streams_ndjson(monkeypatch):
+  candidates, jobs = _batch_fixture()
+  monkeypatch.setattr(get_settings(), 'recommend_batch_stream_page', 5)
+  body = {
+    'candidates': [candidate.model_dump() for candidate in candidates],
+    'jobs': [job.model_dump() for job in jobs],
+    'top_k': 3
+  }
+  with TestClient(main.app) as client:
+    whole = client.post('/ai/recommend-batch', json=body)
+    streamed = client.post('/ai/recommend-batch', json={**body, 'stream': True})
+
+  assert streamed.headers['content-type'] == 'application/x-ndjson'
+  lines = [json.loads(line) for line in streamed.text.splitlines()]
+  assert lines == whole.json()['results']
+  assert len(lines) == len(candidates)
+
+
+def _straddling_pair():
+  """Candidate and job embeddings whose float32 similarity rounds across 0.75 but whose float64 one does not."""
+  rng = np.random.default_rng(5)
+  while True:
+    query, other = rng.normal(size=(2, 384))
+    other -= (other @ query) / (query @ query) * query
+    cosine = 0.5 + rng.uniform(-3e-7, 3e-7)
+    vector = cosine * query / np.linalg.norm(query) + np.sqrt(1 - cosine**2) * other / np.linalg.norm(other)
+    candidate = CandidateProfile(id='c', embeddings=query.tolist())
+    job = JobRecommendationInput(job_id='j', title='Engineer', required_skills=[], embeddings=vector.tolist())
+    exact = _embedding_similarity(candidate, job)
+    fast = float(_embedding_scores(query.tolist(), [vector.tolist()])[0])
+    if (exact >= 0.75) != (fast >= 0.75):
+      return query.tolist(), vector.tolist(), exact >= 0.75
+
+
+def test_reasons_use_the_float64_similarity_near_a_reason_cut():
+  query, vector, high = _straddling_pair()
+  expected = 'High semantic similarity' if high else 'Moderate semantic similarity'
+  candidate = CandidateProfile(id='cand-1', skills=['Python', 'Go'], embeddings=query)
+  # A third of the nice-to-haves keeps the total off a rounding edge, so only the reason cut is in play.
+  job = JobRecommendationInput(
+    job_id='job-1', title='Engineer', required_skills=['Python'], nice_to_have_skills=['Go', 'Rust', 'Java'], embeddings=vector
+  )
+  catalog = JobCatalog()
+  catalog.upsert([job])
+
+  reasons = [
+    recommend_jobs(RecommendationRequest(candidate=candidate, jobs=[job])).ranked_jobs[0].reason,
+    recommend_batch(BatchRecommendationRequest(candidates=[candidate], jobs=[job])).results[0].ranked_jobs[0].reason,
+    rank_candidates(CandidateRankingRequest(job=job, candidates=[candidate])).ranked_candidates[0].reason,
+  ]
+
+  assert all(expected in reason for reason in reasons), reasons
+  assert expected in _reason([], catalog.top(candidate, 1)[0][0][2], job)
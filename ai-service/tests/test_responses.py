@@ -0,0 +1,35 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+import main
+from models.match import MatchRequest
+from services.matching_service import score_match
+from utils.responses import ModelJSONResponse
+
+MATCH_PAYLOAD = {
+  'resume_skills': ['Python', 'FastAPI'],
+  'job_required_skills': ['Python', 'FastAPI', 'PostgreSQL'],
+  'resume_text': 'Built Python services with FastAPI for three years.',
+  'job_summary': 'Must have Python, FastAPI and PostgreSQL.'
+}
+
+
+def test_model_response_matches_default_encoder():
+  result = score_match(MatchRequest(**MATCH_PAYLOAD))
+
+  body = json.loads(ModelJSONResponse(result).body)
+
+  assert body == jsonable_encoder(result)
+  assert body['explanation']['requirements'][0]['requirementId']
+
+
+def test_match_route_serializes_requirement_results():
+  with TestClient(main.app) as client:
+    response = client.post('/ai/match', json=MATCH_PAYLOAD)
+
+  assert response.status_code == 200
+  assert response.headers['content-type'] == 'application/json'
+  requirements = response.json()['explanation']['requirements']
+  assert requirements and {'requirementId', 'status', 'satisfactionScore'} <= set(requirements[0])
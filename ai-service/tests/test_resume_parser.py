@@ -1,5 +1,8 @@
+import json
+
 from models.resume import ResumeParseRequest
 from services.resume_parser import ResumeParser, parse_resume
+from provider_fakes import OverlapProbe
 
 SAMPLE_RESUME = """
 Jane Doe
@@ -67,3 +70,39 @@ def test_parse_resume_handles_llm_failure(monkeypatch):
   assert result.skills, 'skills should still be extracted'
   assert result.warnings, 'warnings should mention fallback'
 
+
+def _probed_parser(monkeypatch, embedding_input=None, timeout=5.0):
+  parser = ResumeParser()
+  if embedding_input is not None:
+    monkeypatch.setattr(parser._settings, 'embedding_input', embedding_input)
+  probe = OverlapProbe(json.dumps({'summary': 'Backend engineer.', 'skills': ['Python']}), [0.1, 0.2, 0.3], timeout)
+  parser._use_llm = True
+  parser._llm_client = probe
+  parser._embeddings_client = probe
+  return parser, probe
+
+
+def test_parse_resume_embeds_summary_and_text_when_configured(monkeypatch):
+  # The embedding needs the LLM summary, so the LLM call finds no embedding in flight.
+  parser, probe = _probed_parser(monkeypatch, 'summary', timeout=0.05)
+  payload = ResumeParseRequest(file_path='', file_name='jane.pdf', user_id='user-1', resume_text=SAMPLE_RESUME)
+
+  result = parser.parse(payload)
+
+  assert result.embedding_input == 'summary'
+  assert probe.embedded == [f'Backend engineer.\n{SAMPLE_RESUME.strip()}']
+  assert probe.overlapped == [False, True]
+
+
+def test_parse_resume_embeds_document_by_default_overlapping_llm(monkeypatch):
+  parser, probe = _probed_parser(monkeypatch)
+  payload = ResumeParseRequest(file_path='', file_name='jane.pdf', user_id='user-1', resume_text=SAMPLE_RESUME)
+
+  result = parser.parse(payload)
+
+  assert result.summary == 'Backend engineer.'
+  assert result.embeddings == [0.1, 0.2, 0.3]
+  assert result.embedding_input == 'document'
+  assert probe.embedded == [SAMPLE_RESUME.strip()]
+  assert probe.overlapped == [True, True], 'provider calls ran sequentially'
+  assert len(probe.prompts) == 1, 'summary call should be skipped'
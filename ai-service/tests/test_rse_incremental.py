@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models.match import MatchRequest
+from models.rse import JDRequirement
+from services import match_state_cache
+from services.match_state_cache import MatchStateCache
+from services.matching_service import score_match
+from services.rse_engine import (
+  TextEdit,
+  apply_edits,
+  diff_text,
+  evaluate_requirements,
+  evaluate_requirements_state,
+  reevaluate_requirements
+)
+
+RESUME = """Summary
+Backend engineer building APIs.
+
+Experience
+- Built Node.js services and REST APIs with MongoDB.
+- Ran PostgreSQL migrations for the billing team.
+
+Projects
+- Chat app using WebSockets.
+
+Skills
+Python, Docker, Kubernetes
+"""
+
+
+def _req(idx, term):
+  return JDRequirement(
+    id=f'req{idx}',
+    type='skill',
+    rawText=term,
+    normalizedTerms=[term],
+    weight=1.0,
+    isRequired=True,
+    explicitlyStated=True,
+    evidenceRule='Mentioned in experience'
+  )
+
+
+REQUIREMENTS = [
+  _req(idx, term)
+  for idx, term in enumerate(['Node.js', 'PostgreSQL', 'Docker', 'WebSockets', 'Rust', 'Terraform', 'MongoDB', 'APIs'])
+]
+
+
+@pytest.mark.parametrize('edited', [
+  RESUME.replace('Docker, Kubernetes', 'Docker, Kubernetes, Terraform'),
+  RESUME.replace('PostgreSQL migrations', 'PostgreSQl migratoins'),
+  RESUME.replace('Backend engineer building APIs.', 'Rust engineer.'),
+  RESUME.replace('- Chat app using WebSockets.\n', ''),
+  'Rust and Terraform only.',
+  RESUME,
+])
+def test_reevaluate_matches_full_evaluation(edited):
+  state = evaluate_requirements_state(REQUIREMENTS, RESUME)
+  updated = reevaluate_requirements(REQUIREMENTS, state, diff_text(RESUME, edited))
+  assert updated.results == evaluate_requirements(REQUIREMENTS, edited)
+  # Chained edits start from the updated state.
+  back = reevaluate_requirements(REQUIREMENTS, updated, diff_text(edited, RESUME))
+  assert back.results == state.results
+
+
+def test_reevaluate_skips_untouched_requirements():
+  state = evaluate_requirements_state(REQUIREMENTS, RESUME)
+  edited = RESUME.replace('Docker, Kubernetes', 'Docker, Kubernetes, Terraform')
+  updated = reevaluate_requirements(REQUIREMENTS, state, diff_text(RESUME, edited))
+  assert updated.evaluated < len(REQUIREMENTS)
+  assert updated.results[0] is state.results[0]
+
+
+def test_apply_edits_rejects_overlaps():
+  edits = [TextEdit(0, 5, 'x'), TextEdit(3, 6, 'y')]
+  with pytest.raises(ValueError):
+    apply_edits('abcdefgh', edits)
+  assert apply_edits('abcdefgh', [TextEdit(6, 8, ''), TextEdit(0, 1, 'A')]) == 'Abcdef'
+
+
+def test_match_route_rescores_an_edited_resume_from_its_previous_state(monkeypatch):
+  monkeypatch.setattr(match_state_cache, '_CACHE', MatchStateCache(4))
+  request = {
+    'resume_id': 'resume-1',
+    'resume_text': RESUME,
+    'job_required_skills': ['Node.js', 'PostgreSQL', 'Terraform', 'Rust'],
+    'job_summary': 'Backend engineer with Node.js and PostgreSQL; Terraform a plus.',
+    'include_trace': True,
+  }
+  edited = {**request, 'resume_text': RESUME.replace('Docker, Kubernetes', 'Docker, Kubernetes, Terraform')}
+  with TestClient(main.app) as client:
+    first = client.post('/ai/match', json=request).json()
+    second = client.post('/ai/match', json=edited).json()
+    other_job = client.post('/ai/match', json={**edited, 'job_summary': 'Rust developer'}).json()
+
+  fresh = score_match(MatchRequest(**{key: value for key, value in edited.items() if key != 'resume_id'}))
+  assert second['explanation'] == json.loads(fresh.model_dump_json())['explanation']
+  assert second['match_score'] == fresh.match_score != first['match_score']
+  # Only the requirements the Skills-line edit can affect were rescored; another job starts from scratch.
+  assert second['trace']['requirementsRescored'] < first['trace']['requirementsRescored']
+  assert other_job['trace']['requirementsRescored'] == other_job['trace']['requirementsEvaluated']
+  assert match_state_cache.get_match_state_cache().hits == 1
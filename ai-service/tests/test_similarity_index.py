@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+
+from services.skill_utils import categories_from_labels, normalize_skill_list
+from utils import skill_ontology_loader
+from utils.embeddings_client import get_embeddings_client
+from utils.settings import get_settings
+from utils.similarity_index import SimilarityIndex
+from utils.skill_ontology_loader import load_skill_ontology, similarity_to_canonical
+
+
+def test_flat_index_matches_exact_argmax():
+  rng = np.random.default_rng(1)
+  vectors = rng.normal(size=(200, 16)).astype(np.float32)
+  query = rng.normal(size=16).astype(np.float32)
+  index = SimilarityIndex(vectors, flat_max=1000)
+
+  unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+  expected = int(np.argmax(unit @ (query / np.linalg.norm(query))))
+  assert index.is_flat
+  assert index.search(query)[0] == expected
+  assert SimilarityIndex(np.zeros((0, 0))).search(query) == (-1, 0.0)
+
+
+def test_ivf_index_finds_near_duplicates():
+  rng = np.random.default_rng(2)
+  vectors = rng.normal(size=(5000, 32)).astype(np.float32)
+  index = SimilarityIndex(vectors, flat_max=100, nprobe=8)
+  targets = rng.choice(len(vectors), size=50, replace=False)
+  noisy = vectors[targets] + rng.normal(scale=0.05, size=(50, 32)).astype(np.float32)
+
+  found = [index.search(query)[0] for query in noisy]
+  assert not index.is_flat
+  assert sum(int(row == target) for row, target in zip(found, targets)) >= 48
+  row, score = index.search(vectors[7])
+  assert row == 7 and score > 0.999
+
+
+def test_large_ontology_lookups_use_index(tmp_path, monkeypatch):
+  rows = [{'canonicalId': f'skill-{idx}', 'displayName': f'Skill{idx}', 'aliases': [f'sk {idx}']} for idx in range(3000)]
+  rows.append({'canonicalId': 'nodejs', 'displayName': 'Node.js', 'aliases': ['node js', 'nodejs']})
+  ontology_path = tmp_path / 'ontology.json'
+  ontology_path.write_text(json.dumps(rows))
+  monkeypatch.setenv('SKILL_ONTOLOGY_PATH', str(ontology_path))
+  monkeypatch.setenv('UNKNOWN_SKILLS_PATH', str(tmp_path / 'unknown.json'))
+  monkeypatch.setattr(get_settings(), 'ontology_index_flat_max', 500)
+
+  ontology = load_skill_ontology(force_reload=True)
+  assert not ontology.embedding_index.is_flat
+  assert len(ontology) == 3001
+  assert len(ontology.embedding_labels) == 3001 * 3
+  assert normalize_skill_list(['NODE JS', 'sk 42', 'Skill42']) == ['Node.js', 'Skill42']
+  assert ontology.entry(3000).aliases == ['node js', 'nodejs']
+
+
+def test_group_hints_search_hinted_rows_first():
+  rng = np.random.default_rng(3)
+  vectors = rng.normal(size=(900, 128)).astype(np.float32)
+  groups = ['language'] * 300 + ['database'] * 300 + ['cloud'] * 290 + [None] * 10
+  unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+  blend = 0.6 * unit[5] + 0.8 * unit[700]
+
+  for index in (SimilarityIndex(vectors, groups), SimilarityIndex(vectors, groups, flat_max=100, nprobe=30)):
+    assert index.search(vectors[420], groups=['database'], threshold=0.9)[0] == 420
+    assert index.search(blend)[0] == 700
+    # A hit above the threshold in the hinted group wins...
+    assert index.search(blend, groups=['language'], threshold=0.5)[0] == 5
+    # ...otherwise every row is searched.
+    assert index.search(blend, groups=['language'], threshold=0.7)[0] == 700
+    assert index.search(vectors[895], groups=['unknown'], threshold=0.9)[0] == 895
+
+
+def test_categories_from_labels_map_to_ontology_categories(tmp_path, monkeypatch):
+  rows = [
+    {'canonicalId': 'python', 'displayName': 'Python', 'category': 'language'},
+    {'canonicalId': 'postgres', 'displayName': 'PostgreSQL', 'category': 'Database'},
+  ]
+  ontology_path = tmp_path / 'ontology.json'
+  ontology_path.write_text(json.dumps(rows))
+  monkeypatch.setenv('SKILL_ONTOLOGY_PATH', str(ontology_path))
+  load_skill_ontology(force_reload=True)
+
+  text = 'Languages: Python, Go\nDatabases & Tools: PostgreSQL\nBuilt APIs: fast ones'
+  assert categories_from_labels(text) == ('language', 'database')
+
+
+def test_similarity_memo_is_keyed_on_embedded_text_and_evicts_least_recent(tmp_path, monkeypatch):
+  rows = [{'canonicalId': 'nodejs', 'displayName': 'Node.js', 'aliases': ['node js']}]
+  ontology_path = tmp_path / 'ontology.json'
+  ontology_path.write_text(json.dumps(rows))
+  monkeypatch.setenv('SKILL_ONTOLOGY_PATH', str(ontology_path))
+
+  embedded = []
+
+  class Recording:
+    def embed_array(self, texts):
+      embedded.extend(texts)
+      return get_embeddings_client().embed_array(texts)
+
+  monkeypatch.setattr(skill_ontology_loader, '_embed_client', Recording)
+  spellings = ['Node JS', 'node js', ' Node JS ']
+
+  def outcomes(order):
+    load_skill_ontology(force_reload=True)
+    found = {raw: similarity_to_canonical(raw) for raw in order}
+    return {raw: entry.canonicalId if entry else None for raw, entry in found.items()}
+
+  # Each spelling's match is the same whichever spelling arrives first.
+  assert outcomes(spellings) == outcomes(spellings[::-1])
+
+  ontology = load_skill_ontology(force_reload=True)
+  embedded.clear()
+  monkeypatch.setattr(skill_ontology_loader, '_SIMILAR_MEMO_MAX', 2)
+  for raw in ('node js', 'node js', 'Kafka', 'node js', 'Terraform', 'node js', 'Kafka'):
+    similarity_to_canonical(raw)
+
+  # One embedding per memo miss; 'node js' stays while in use.
+  assert embedded == ['node js', 'Kafka', 'Terraform', 'Kafka']
+  assert [key[0] for key in ontology._similar] == ['node js', 'Kafka']
@@ -0,0 +1,34 @@
+import numpy as np
+
+from utils.skill_sets import SkillVocabulary
+
+
+def test_encode_keeps_duplicates_and_drops_empty_strings():
+  vocab = SkillVocabulary(['python', 'docker'])
+  jobs, candidate = vocab.encode([['Python', ' python', 'Go'], [], ['', 'Docker  ']], [['go', 'PYTHON']])
+
+  assert jobs.sizes.tolist() == [3, 0, 1]
+  assert jobs.row(0).tolist()[:2] == [0, 0]
+  assert jobs.row(2).tolist() == [1]
+  # 'go' is unknown: both groups share one call-local id past the permanent ones.
+  assert jobs.row(0)[2] == candidate.row(0)[0] == 2
+  assert jobs.universe == candidate.universe == 3
+  assert len(vocab) == 2
+  assert jobs.count_in(candidate.mask()).tolist() == [3.0, 0.0, 0.0]
+
+
+def test_grow_registers_unknown_skills():
+  vocab = SkillVocabulary(['python'])
+  (first,) = vocab.encode([['Rust', 'python']], grow=True)
+  (second,) = vocab.encode([['rust']])
+
+  assert len(vocab) == 2 and vocab.lookup(' RUST ') == 1
+  assert first.row(0).tolist() == [1, 0]
+  assert second.row(0).tolist() == [1]
+  assert vocab.lookup('') == -1 and vocab.lookup('elixir') == -1
+
+
+def test_count_in_handles_no_ids():
+  vocab = SkillVocabulary()
+  (rows,) = vocab.encode([[], ['']])
+  assert rows.count_in(np.zeros(rows.universe, dtype=bool)).tolist() == [0.0, 0.0]
@@ -0,0 +1,57 @@
+import contextvars
+import logging
+import threading
+
+from models.match import MatchRequest
+from services.matching_service import score_match
+from utils.timing import collect_timings, histogram_snapshot, reset_histograms, span
+
+
+def test_spans_accumulate_into_collector_and_histograms():
+  reset_histograms()
+  with collect_timings('pipeline') as timings:
+    with span('stage'):
+      pass
+    with span('stage'):
+      pass
+
+  stages = timings.as_dict()
+  assert list(stages) == ['stage', 'pipeline']
+  assert histogram_snapshot()['stage']['count'] == 2
+  assert histogram_snapshot()['pipeline']['count'] == 1
+
+
+def test_spans_from_copied_context_threads_are_collected():
+  with collect_timings('pipeline') as timings:
+    ctx = contextvars.copy_context()
+    worker = threading.Thread(target=ctx.run, args=(_timed_stage,))
+    worker.start()
+    worker.join()
+
+  assert 'worker' in timings.as_dict()
+
+
+def _timed_stage():
+  with span('worker'):
+    pass
+
+
+def test_nested_pipelines_share_collector_and_log_once(caplog):
+  with caplog.at_level(logging.INFO, logger='utils.timing'):
+    with collect_timings('outer') as outer:
+      with collect_timings('inner') as inner:
+        pass
+
+  assert inner is outer
+  assert set(outer.as_dict()) == {'inner', 'outer'}
+  events = [rec for rec in caplog.records if getattr(rec, 'event', None) == 'stage_timings']
+  assert len(events) == 1 and events[0].pipeline == 'outer'
+
+
+def test_match_returns_timings_only_when_requested():
+  base = {'resume_text': 'Experience\nBuilt APIs with Python.', 'job_required_skills': ['Python']}
+
+  assert score_match(MatchRequest(**base)).timings is None
+  timings = score_match(MatchRequest(**base, include_timings=True)).timings
+  assert {'match', 'match.jd', 'match.rse'} <= set(timings)
+  assert all(value >= 0 for value in timings.values())
@@ -0,0 +1,53 @@
+import numpy as np
+
+from utils.embeddings_client import cosine_similarity
+from utils.vector_ops import NormalizedMatrix, cosine_many_to_many, cosine_one_to_many
+
+
+def _legacy_cosine(a, b):
+  va = np.array(a, dtype=float)
+  vb = np.array(b, dtype=float)
+  denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+  return 0.0 if denom == 0.0 else float(np.dot(va, vb) / denom)
+
+
+def test_one_to_many_matches_per_pair_cosine():
+  rng = np.random.default_rng(1)
+  query = rng.normal(size=32)
+  rows = rng.normal(size=(50, 32))
+  rows[3] = 0.0
+
+  scores = cosine_one_to_many(query, NormalizedMatrix.from_vectors(rows))
+
+  assert scores.dtype == np.float32 and scores.shape == (50,)
+  assert np.allclose(scores, [_legacy_cosine(query, row) for row in rows], atol=1e-6)
+  assert scores[3] == 0.0
+
+
+def test_many_to_many_matches_one_to_many():
+  rng = np.random.default_rng(2)
+  queries = rng.normal(size=(4, 16)).astype(np.float32)
+  index = NormalizedMatrix.from_vectors(rng.normal(size=(30, 16)))
+
+  pairwise = cosine_many_to_many(queries, index)
+
+  assert pairwise.shape == (4, 30)
+  for i, query in enumerate(queries):
+    assert np.allclose(pairwise[i], cosine_one_to_many(query, index), atol=1e-6)
+
+
+def test_normalized_matrix_caches_norms_and_is_read_only():
+  index = NormalizedMatrix.from_vectors([[3.0, 4.0], [0.0, 0.0]])
+
+  assert np.allclose(index.norms, [5.0, 0.0])
+  assert np.allclose(index.unit[0], [0.6, 0.8])
+  assert not index.unit.flags.writeable
+
+
+def test_cosine_similarity_accepts_lists_and_arrays():
+  a, b = [1.0, 2.0, 3.0], [2.0, 0.5, 1.0]
+
+  assert abs(cosine_similarity(a, b) - _legacy_cosine(a, b)) < 1e-12
+  assert abs(cosine_similarity(np.array(a, dtype=np.float32), np.array(b, dtype=np.float32)) - _legacy_cosine(a, b)) < 1e-6
+  assert cosine_similarity([], b) == 0.0
+  assert cosine_similarity([0.0, 0.0, 0.0], b) == 0.0
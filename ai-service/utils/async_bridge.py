@@ -0,0 +1,77 @@
+"""Process-wide background event loop for provider I/O.
+
+Provider clients keep their connection pool and concurrency semaphore bound to
+this loop, so synchronous callers (parsers running on executor threads or in
+CPU worker processes) and async callers share the same resources.
+
+``submit_blocking`` lets a synchronous caller overlap several blocking provider
+calls (e.g. structured extraction and the embedding request of one parse).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+T = TypeVar('T')
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOCK = threading.Lock()
+_FANOUT: Optional[ThreadPoolExecutor] = None
+_FANOUT_WORKERS = 32
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+  global _LOOP
+  with _LOCK:
+    if _LOOP is None or _LOOP.is_closed():
+      loop = asyncio.new_event_loop()
+      thread = threading.Thread(target=loop.run_forever, name='ai-provider-loop', daemon=True)
+      thread.start()
+      _LOOP = loop
+    return _LOOP
+
+
+def in_background_loop() -> bool:
+  try:
+    return asyncio.get_running_loop() is _LOOP
+  except RuntimeError:
+    return False
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> 'Future[T]':
+  """Schedule ``coro`` on the background loop and return a thread-safe future."""
+  return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+  """Block the calling thread until ``coro`` finishes on the background loop."""
+  if in_background_loop():
+    coro.close()
+    raise RuntimeError('run_sync() cannot be called from the provider loop; await the coroutine instead.')
+  return submit(coro).result()
+
+
+async def run_async(coro: Coroutine[Any, Any, T]) -> T:
+  """Await ``coro`` on the background loop from any other event loop."""
+  if in_background_loop():
+    return await coro
+  return await asyncio.wrap_future(submit(coro))
+
+
+def _fanout_pool() -> ThreadPoolExecutor:
+  global _FANOUT
+  with _LOCK:
+    if _FANOUT is None:
+      # Threads here only wait on provider responses, so the pool can be wide;
+      # the provider client's semaphore still caps in-flight requests.
+      _FANOUT = ThreadPoolExecutor(max_workers=_FANOUT_WORKERS, thread_name_prefix='ai-provider-call')
+    return _FANOUT
+
+
+def submit_blocking(fn: Callable[..., T], *args: Any) -> 'Future[T]':
+  """Start blocking ``fn(*args)`` on a helper thread and return its future."""
+  ctx = contextvars.copy_context()
+  return _fanout_pool().submit(ctx.run, fn, *args)
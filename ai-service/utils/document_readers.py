@@ -0,0 +1,26 @@
+"""Lazy accessors for the document libraries (pypdf, python-docx).
+
+Both libraries cost tens of milliseconds to import, so they are only loaded
+by workers that actually open resume files.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+
+def open_pdf(file_path: str) -> Any:
+  from pypdf import PdfReader  # type: ignore
+
+  return PdfReader(file_path)
+
+
+def open_docx(file_path: str) -> Any:
+  from docx import Document  # type: ignore
+
+  return Document(file_path)
+
+
+def preload_document_readers() -> None:
+  """Import both libraries up front (used by warm-up for file-parsing workers)."""
+  import docx  # type: ignore  # noqa: F401
+  import pypdf  # type: ignore  # noqa: F401
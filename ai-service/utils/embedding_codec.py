@@ -0,0 +1,138 @@
+"""Wire encodings for embedding vectors.
+
+Vectors travel either as JSON number arrays (``float``, the default) or as
+base64 strings of little-endian floats:
+
+- ``base64``: float32, unprefixed (the same layout as OpenAI's
+  ``encoding_format=base64``)
+- ``base64-f16``: float16, prefixed with ``f16:`` so the string is
+  self-describing when sent back as input
+
+Inputs accept all three forms regardless of what was negotiated for the
+response. The response encoding is chosen per request (request field or
+``X-Embedding-Encoding`` header) and held in a ContextVar that the model
+serializer reads.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+from contextvars import ContextVar
+from itertools import chain
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+from fastapi import HTTPException
+
+FLOAT = 'float'
+BASE64 = 'base64'
+BASE64_F16 = 'base64-f16'
+ENCODINGS = (FLOAT, BASE64, BASE64_F16)
+HEADER = 'X-Embedding-Encoding'
+
+_F16_PREFIX = 'f16:'
+_OUTPUT_ENCODING: ContextVar[str] = ContextVar('embedding_encoding', default=FLOAT)
+
+
+class EmbeddingList(list):
+  """``List[float]`` that keeps the float32 array it was decoded from.
+
+  Treat it as immutable: the cached array is not refreshed on mutation.
+  """
+
+  __slots__ = ('_array',)
+
+  def __init__(self, values: Any = (), array: Optional[np.ndarray] = None) -> None:
+    super().__init__(values)
+    self._array = array
+
+  @property
+  def array(self) -> np.ndarray:
+    if self._array is None:
+      self._array = np.asarray(self, dtype=np.float32)
+    return self._array
+
+  def __reduce__(self):
+    return (EmbeddingList, (list(self),))
+
+
+def as_array(values: Union[EmbeddingList, List[float], np.ndarray]) -> np.ndarray:
+  """float32 view of an embedding without re-parsing an ``EmbeddingList``."""
+  if isinstance(values, EmbeddingList):
+    return values.array
+  return np.asarray(values, dtype=np.float32)
+
+
+def stack_embeddings(vectors: Sequence[Union[EmbeddingList, List[float], np.ndarray]], dim: int) -> np.ndarray:
+  """float32 ``(len(vectors), dim)`` matrix of embeddings that all have ``dim`` values.
+
+  Rows that already hold an array (decoded from base64) are stacked. JSON
+  rows are read in one pass over their floats rather than converted one array
+  at a time, which is several times faster for large batches.
+  """
+  arrays = [vector if isinstance(vector, np.ndarray) else getattr(vector, '_array', None) for vector in vectors]
+  if not vectors:
+    return np.zeros((0, dim), dtype=np.float32)
+  if all(array is not None for array in arrays):
+    return np.stack(arrays).astype(np.float32, copy=False)
+  flat = np.fromiter(chain.from_iterable(vectors), dtype=np.float32, count=len(vectors) * dim)
+  return flat.reshape(len(vectors), dim)
+
+
+def decode_embedding(value: Any) -> EmbeddingList:
+  """Validate an embedding given as a number array or a base64 string."""
+  if isinstance(value, EmbeddingList):
+    return value
+  if isinstance(value, (str, bytes)):
+    text = value.decode('ascii') if isinstance(value, bytes) else value
+    dtype = '<f4'
+    if text.startswith(_F16_PREFIX):
+      text, dtype = text[len(_F16_PREFIX):], '<f2'
+    try:
+      raw = base64.b64decode(text, validate=True)
+    except (binascii.Error, ValueError) as exc:
+      raise ValueError('embedding string must be base64-encoded little-endian floats') from exc
+    itemsize = np.dtype(dtype).itemsize
+    if len(raw) % itemsize:
+      raise ValueError(f'embedding byte length {len(raw)} is not a multiple of {itemsize}')
+    array = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+    return EmbeddingList(array.tolist(), array)
+  try:
+    array = np.asarray(value, dtype=np.float64)
+  except (TypeError, ValueError) as exc:
+    raise ValueError('embedding must be an array of numbers or a base64 string') from exc
+  if array.ndim != 1:
+    raise ValueError('embedding must be a flat array of numbers')
+  # Keep the float32 copy: bulk scoring stacks these instead of re-reading Python floats.
+  return EmbeddingList(array.tolist(), array.astype(np.float32))
+
+
+def encode_embedding(values: Union[List[float], np.ndarray], encoding: str) -> Union[List[float], str]:
+  if encoding == BASE64:
+    return base64.b64encode(as_array(values).astype('<f4', copy=False).tobytes()).decode('ascii')
+  if encoding == BASE64_F16:
+    return _F16_PREFIX + base64.b64encode(as_array(values).astype('<f2').tobytes()).decode('ascii')
+  return list(values)
+
+
+def serialize_embedding(values: Union[List[float], np.ndarray]) -> Union[List[float], str]:
+  return encode_embedding(values, _OUTPUT_ENCODING.get())
+
+
+def negotiate_embedding_encoding(*preferences: Optional[str]) -> str:
+  """Pick the first given encoding and use it for embeddings in this request's response.
+
+  Must be called from the async route handler so the serializer, which runs in
+  the same task after the handler returns, sees the value.
+  """
+  encoding = next((pref.strip().lower() for pref in preferences if pref and pref.strip()), FLOAT)
+  if encoding not in ENCODINGS:
+    raise HTTPException(
+      status_code=422,
+      detail={
+        'error': 'invalid_embedding_encoding',
+        'message': f"Unsupported embedding encoding '{encoding}'. Use one of: {', '.join(ENCODINGS)}."
+      }
+    )
+  _OUTPUT_ENCODING.set(encoding)
+  return encoding
@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-from dataclasses import dataclass
-from typing import List
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import numpy as np
 
+from utils.async_bridge import run_sync, submit_blocking
 from utils.settings import get_settings
 
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-  if not a or not b:
+def cosine_similarity(a: Union[List[float], np.ndarray], b: Union[List[float], np.ndarray]) -> float:
+  """Per-pair cosine. Arrays are used as-is; for many pairs see ``utils.vector_ops``."""
+  if len(a) == 0 or len(b) == 0:
     return 0.0
-  va = np.array(a, dtype=float)
-  vb = np.array(b, dtype=float)
-  denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+  va = a if isinstance(a, np.ndarray) else np.array(a, dtype=float)
+  vb = b if isinstance(b, np.ndarray) else np.array(b, dtype=float)
+  denom = float(np.sqrt(float(va @ va) * float(vb @ vb)))
   if denom == 0.0:
     return 0.0
-  return float(np.dot(va, vb) / denom)
+  return float(va @ vb) / denom
 
 
 @dataclass
@@ -27,19 +35,240 @@ class EmbeddingsClient:
   dim: int = 64
 
   def embed(self, texts: List[str]) -> List[List[float]]:
-    vectors: List[List[float]] = []
-    for t in texts:
-      digest = hashlib.sha256((t or '').encode('utf-8')).digest()
-      arr = np.frombuffer(digest, dtype=np.uint8).astype(float)
-      arr = (arr - 127.5) / 127.5
-      if arr.size < self.dim:
-        arr = np.pad(arr, (0, self.dim - arr.size))
-      else:
-        arr = arr[: self.dim]
-      vectors.append(arr.tolist())
+    return self.embed_array(texts).tolist()
+
+  def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+    """Embed ``texts`` into a contiguous float32 array of shape ``(len(texts), dim)``."""
+    out = np.zeros((len(texts), self.dim), dtype=np.float32)
+    if not texts:
+      return out
+    digests = b''.join(hashlib.sha256((t or '').encode('utf-8')).digest() for t in texts)
+    raw = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), -1)
+    width = min(self.dim, raw.shape[1])
+    out[:, :width] = raw[:, :width]
+    out[:, :width] -= 127.5
+    out[:, :width] /= 127.5
+    return out
+
+
+@dataclass
+class MockEmbeddingsClient(EmbeddingsClient):
+  """Offline client used when no live provider is configured."""
+
+
+@dataclass
+class OpenAIEmbeddingsClient(EmbeddingsClient):
+  """OpenAI embeddings over the shared provider loop (see ``utils.async_bridge``)."""
+
+  model: Optional[str] = None
+  api_key: Optional[str] = None
+  base_url: Optional[str] = None
+  timeout: Optional[float] = None
+
+  def __post_init__(self) -> None:
+    settings = get_settings()
+    self.model = self.model or settings.openai_embedding_model
+    self.api_key = self.api_key or settings.openai_api_key
+    self.base_url = self.base_url or settings.openai_base_url or None
+    self.timeout = self.timeout if self.timeout is not None else settings.embedding_timeout
+    self._client: Any = None
+
+  def embed(self, texts: List[str]) -> List[List[float]]:
+    return self.embed_array(texts).tolist()
+
+  def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+    if not texts:
+      return np.zeros((0, self.dim), dtype=np.float32)
+    return run_sync(self._embed(list(texts)))
+
+  def _ensure_client(self) -> Any:
+    if self._client is None:
+      from openai import AsyncOpenAI
+
+      settings = get_settings()
+      self._client = AsyncOpenAI(
+        api_key=self.api_key,
+        base_url=self.base_url,
+        timeout=self.timeout,
+        max_retries=settings.llm_max_retries
+      )
+    return self._client
+
+  async def _embed(self, texts: List[str]) -> np.ndarray:
+    client = self._ensure_client()
+    response = await asyncio.wait_for(
+      client.embeddings.create(model=self.model, input=[t or ' ' for t in texts]),
+      timeout=self.timeout
+    )
+    ordered = sorted(response.data, key=lambda item: item.index)
+    vectors = np.array([item.embedding for item in ordered], dtype=np.float32)
+    self.dim = vectors.shape[1]
     return vectors
 
 
+@dataclass
+class _PendingEmbed:
+  texts: List[str]
+  future: 'Future[np.ndarray]' = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+  """Coalesce concurrent ``embed`` calls into few provider round trips.
+
+  Callers block on a future while a collector thread gathers requests for up to
+  ``window_ms`` (or until ``max_batch`` texts are waiting), de-duplicates the
+  texts and sends them to ``inner`` as one call. Batches are flushed on helper
+  threads so the next window starts collecting while a call is in flight.
+  """
+
+  def __init__(self, inner: EmbeddingsClient, window_ms: float, max_batch: int) -> None:
+    self.inner = inner
+    self.window = max(0.0, window_ms) / 1000
+    self.max_batch = max(1, max_batch)
+    self.batches = 0
+    self.texts_sent = 0
+    self._queue: 'queue.Queue[_PendingEmbed]' = queue.Queue()
+    self._lock = threading.Lock()
+    self._thread = threading.Thread(target=self._collect, name='ai-embed-batcher', daemon=True)
+    self._thread.start()
+
+  def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+    if not texts:
+      return np.zeros((0, self.inner.dim), dtype=np.float32)
+    pending = _PendingEmbed(list(texts))
+    self._queue.put(pending)
+    return pending.future.result()
+
+  def _collect(self) -> None:
+    while True:
+      batch = [self._queue.get()]
+      count = len(batch[0].texts)
+      deadline = time.monotonic() + self.window
+      while count < self.max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+          break
+        try:
+          item = self._queue.get(timeout=remaining)
+        except queue.Empty:
+          break
+        batch.append(item)
+        count += len(item.texts)
+      submit_blocking(self._flush, batch)
+
+  def _flush(self, batch: List[_PendingEmbed]) -> None:
+    unique = list(dict.fromkeys(text for pending in batch for text in pending.texts))
+    try:
+      chunks = []
+      for start in range(0, len(unique), self.max_batch):
+        chunk = unique[start:start + self.max_batch]
+        chunks.append(self.inner.embed_array(chunk))
+        with self._lock:
+          self.batches += 1
+          self.texts_sent += len(chunk)
+      matrix = np.concatenate(chunks)
+      row = {text: idx for idx, text in enumerate(unique)}
+      results = [matrix[[row[text] for text in pending.texts]] for pending in batch]
+    except Exception as exc:  # noqa: BLE001
+      for pending in batch:
+        pending.future.set_exception(exc)
+      return
+    for pending, result in zip(batch, results):
+      pending.future.set_result(result)
+
+
+class CachedEmbeddingsClient(EmbeddingsClient):
+  """Content-hash LRU cache in front of an (optionally batched) embeddings client.
+
+  Identical texts (ontology labels, common skill tokens, re-parsed documents) are
+  embedded once per process; only cache misses reach the provider. Vectors are
+  kept as read-only float32 rows.
+  """
+
+  def __init__(
+    self,
+    inner: EmbeddingsClient,
+    max_entries: int = 50_000,
+    window_ms: float = 0.0,
+    max_batch: int = 64
+  ) -> None:
+    super().__init__(dim=inner.dim)
+    self.inner = inner
+    self.max_entries = max(1, max_entries)
+    self.hits = 0
+    self.misses = 0
+    self._entries: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+    self._lock = threading.Lock()
+    self._batcher = EmbeddingBatcher(inner, window_ms, max_batch) if window_ms > 0 else None
+
+  @staticmethod
+  def _key(text: str) -> bytes:
+    return hashlib.blake2b((text or '').encode('utf-8'), digest_size=16).digest()
+
+  def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+    keys = [self._key(text) for text in texts]
+    found: List[Optional[np.ndarray]] = [None] * len(texts)
+    missing: Dict[bytes, str] = {}
+    with self._lock:
+      for idx, key in enumerate(keys):
+        vector = self._entries.get(key)
+        if vector is None:
+          missing.setdefault(key, texts[idx])
+          continue
+        self._entries.move_to_end(key)
+        found[idx] = vector
+      self.hits += len(texts) - len(missing)
+      self.misses += len(missing)
+
+    if missing:
+      fresh = self._embed_uncached(list(missing.values()))
+      fresh.setflags(write=False)
+      computed = dict(zip(missing, fresh))
+      with self._lock:
+        for key, vector in computed.items():
+          self._entries[key] = vector
+          self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+          self._entries.popitem(last=False)
+      found = [vector if vector is not None else computed[key] for vector, key in zip(found, keys)]
+
+    if not found:
+      return np.zeros((0, self.inner.dim), dtype=np.float32)
+    self.dim = found[0].shape[0]
+    return np.stack(found)
+
+  def _embed_uncached(self, texts: Sequence[str]) -> np.ndarray:
+    if self._batcher is not None:
+      return self._batcher.embed_array(texts)
+    return self.inner.embed_array(texts)
+
+  def stats_snapshot(self) -> Dict[str, int]:
+    with self._lock:
+      stats = {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+    if self._batcher is not None:
+      stats.update(batches=self._batcher.batches, texts_sent=self._batcher.texts_sent)
+    return stats
+
+
+_CLIENT: Optional[EmbeddingsClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
 def get_embeddings_client() -> EmbeddingsClient:
-  _ = get_settings()
-  return EmbeddingsClient()
+  global _CLIENT
+  settings = get_settings()
+  with _CLIENT_LOCK:
+    if _CLIENT is None:
+      if settings.ai_provider.lower().strip() == 'mock' or not settings.openai_api_key:
+        inner: EmbeddingsClient = MockEmbeddingsClient()
+        window_ms = 0.0  # hashing locally; nothing to coalesce
+      else:
+        inner = OpenAIEmbeddingsClient()
+        window_ms = settings.embedding_batch_window_ms
+      _CLIENT = CachedEmbeddingsClient(
+        inner,
+        max_entries=settings.embedding_cache_size,
+        window_ms=window_ms,
+        max_batch=settings.embedding_batch_max
+      )
+    return _CLIENT
@@ -0,0 +1,167 @@
+"""Workload-aware executors for async route handlers.
+
+Each route declares what kind of work it does and is dispatched accordingly:
+
+- ``CPU``: parsing/RSE work, run on a process pool (or threads when
+  ``AI_CPU_EXECUTOR=thread``) so it cannot starve the event loop.
+- ``IO``: work that blocks on a provider (LLM/embeddings), run on a thread pool.
+- ``INLINE``: cheap work, executed directly on the event loop.
+
+Every pool has a queue-depth limit (running + waiting jobs). Once it is reached
+new work is rejected with ``503 Retry-After`` instead of queueing unboundedly.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from utils.profiling import wrap_if_profiling
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+CPU = 'cpu'
+IO = 'io'
+INLINE = 'inline'
+
+T = TypeVar('T')
+
+
+class ExecutorSaturated(HTTPException):
+  """Raised when a workload pool is at its queue-depth limit."""
+
+  def __init__(self, workload: str, retry_after: int) -> None:
+    super().__init__(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail={'error': 'service_overloaded', 'message': 'Service is busy. Please retry shortly.', 'workload': workload},
+      headers={'Retry-After': str(retry_after)}
+    )
+    self.workload = workload
+
+
+def _init_cpu_worker() -> None:
+  # Child processes load the ontology once instead of on their first request.
+  from utils.skill_ontology_loader import load_skill_ontology
+
+  load_skill_ontology()
+
+
+def _noop() -> None:
+  return None
+
+
+class BoundedExecutor:
+  """Executor wrapper that tracks and caps the number of pending jobs."""
+
+  def __init__(self, name: str, executor: Executor, max_pending: int, retry_after: int) -> None:
+    self.name = name
+    self.max_pending = max(1, max_pending)
+    self.retry_after = retry_after
+    self._executor = executor
+    self._pending = 0
+    self.rejected = 0
+    self._lock = threading.Lock()
+    self._propagate_context = isinstance(executor, ThreadPoolExecutor)
+
+  @property
+  def pending(self) -> int:
+    return self._pending
+
+  def _acquire(self) -> None:
+    with self._lock:
+      if self._pending >= self.max_pending:
+        self.rejected += 1
+        logger.warning(
+          'executor_saturated',
+          extra={'event': 'executor_saturated', 'workload': self.name, 'pending': self._pending}
+        )
+        raise ExecutorSaturated(self.name, self.retry_after)
+      self._pending += 1
+
+  def _release(self) -> None:
+    with self._lock:
+      self._pending -= 1
+
+  async def run(self, fn: Callable[..., T], *args: Any) -> T:
+    self._acquire()
+    try:
+      call = partial(fn, *args)
+      if self._propagate_context:
+        call = partial(contextvars.copy_context().run, call)
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(self._executor, call)
+    finally:
+      self._release()
+
+  def prestart(self, workers: int) -> None:
+    """Spin up pool workers ahead of traffic (process pools start lazily)."""
+    futures = [self._executor.submit(_noop) for _ in range(workers)]
+    for future in futures:
+      future.result()
+
+  def shutdown(self) -> None:
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_EXECUTORS: Dict[str, BoundedExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _build_executors() -> Dict[str, BoundedExecutor]:
+  settings = get_settings()
+  if settings.cpu_executor == 'process':
+    cpu_pool: Executor = ProcessPoolExecutor(
+      max_workers=settings.cpu_workers,
+      mp_context=multiprocessing.get_context('spawn'),
+      initializer=_init_cpu_worker
+    )
+  else:
+    cpu_pool = ThreadPoolExecutor(max_workers=settings.cpu_workers, thread_name_prefix='ai-cpu')
+  io_pool = ThreadPoolExecutor(max_workers=settings.io_workers, thread_name_prefix='ai-io')
+  return {
+    CPU: BoundedExecutor(CPU, cpu_pool, settings.cpu_queue_limit, settings.retry_after_seconds),
+    IO: BoundedExecutor(IO, io_pool, settings.io_queue_limit, settings.retry_after_seconds),
+  }
+
+
+def get_executors() -> Dict[str, BoundedExecutor]:
+  with _EXECUTORS_LOCK:
+    if not _EXECUTORS:
+      _EXECUTORS.update(_build_executors())
+    return _EXECUTORS
+
+
+def get_executor(workload: str) -> Optional[BoundedExecutor]:
+  if workload == INLINE:
+    return None
+  return get_executors()[workload]
+
+
+def prestart_executors() -> None:
+  settings = get_settings()
+  if settings.cpu_executor == 'process':
+    get_executors()[CPU].prestart(settings.cpu_workers)
+
+
+def shutdown_executors() -> None:
+  with _EXECUTORS_LOCK:
+    for executor in _EXECUTORS.values():
+      executor.shutdown()
+    _EXECUTORS.clear()
+
+
+async def run_workload(workload: str, fn: Callable[..., T], *args: Any) -> T:
+  """Run ``fn(*args)`` on the pool that matches ``workload``."""
+  fn, args = wrap_if_profiling(fn, args)
+  executor = get_executor(workload)
+  if executor is None:
+    return fn(*args)
+  return await executor.run(fn, *args)
@@ -1,10 +1,56 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+from utils.async_bridge import run_async, run_sync
 from utils.settings import get_settings
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenUsage:
+  """Cumulative provider usage for one client."""
+
+  calls: int = 0
+  retries: int = 0
+  failures: int = 0
+  prompt_tokens: int = 0
+  completion_tokens: int = 0
+
+  @property
+  def total_tokens(self) -> int:
+    return self.prompt_tokens + self.completion_tokens
+
+  def as_dict(self) -> Dict[str, int]:
+    return {
+      'calls': self.calls,
+      'retries': self.retries,
+      'failures': self.failures,
+      'prompt_tokens': self.prompt_tokens,
+      'completion_tokens': self.completion_tokens,
+      'total_tokens': self.total_tokens
+    }
+
+
+@dataclass
+class LLMCompletion:
+  """Completion text plus the tokens the provider billed for it."""
+
+  text: str
+  prompt_tokens: int = 0
+  completion_tokens: int = 0
+
 
 @dataclass
 class LLMClient:
@@ -18,6 +64,409 @@ class LLMClient:
       return ' '.join(lines[:3])[:300]
     raise RuntimeError('Live LLM calls disabled in this environment.')
 
+  async def arun(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return await asyncio.to_thread(self.run, prompt, temperature, system_prompt)
+
+  def complete(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> LLMCompletion:
+    return LLMCompletion(self.run(prompt, temperature, system_prompt))
+
+  async def acomplete(
+    self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None
+  ) -> LLMCompletion:
+    return await asyncio.to_thread(self.complete, prompt, temperature, system_prompt)
+
+
+@dataclass
+class MockLLMClient(LLMClient):
+  """Deterministic offline client used when no live provider is configured."""
+
+  def run(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    lines = [ln.strip() for ln in prompt.splitlines() if ln.strip()]
+    return ' '.join(lines[:3])[:300]
+
+  async def arun(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return self.run(prompt, temperature, system_prompt)
+
+
+def _http2_available() -> bool:
+  try:
+    import h2  # type: ignore  # noqa: F401
+  except ImportError:
+    return False
+  return True
+
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class OpenAILLMClient(LLMClient):
+  """Async OpenAI chat client behind the sync ``LLMClient.run`` interface.
+
+  All calls execute on the shared provider loop (``utils.async_bridge``) so one
+  HTTP/2 connection pool and one concurrency semaphore serve the whole process.
+  Each call gets a timeout and is retried with full-jitter exponential backoff
+  on timeouts, connection errors, 429 and 5xx.
+  """
+
+  model: Optional[str] = None
+  api_key: Optional[str] = None
+  base_url: Optional[str] = None
+  timeout: Optional[float] = None
+  max_retries: Optional[int] = None
+  max_concurrency: Optional[int] = None
+  max_tokens: Optional[int] = None
+  backoff_base: float = 0.5
+  backoff_cap: float = 8.0
+  usage: TokenUsage = field(default_factory=TokenUsage)
+
+  def __post_init__(self) -> None:
+    settings = get_settings()
+    self.model = self.model or settings.openai_chat_model
+    self.api_key = self.api_key or settings.openai_api_key
+    self.base_url = self.base_url or settings.openai_base_url or None
+    self.timeout = self.timeout if self.timeout is not None else settings.llm_timeout
+    self.max_retries = self.max_retries if self.max_retries is not None else settings.llm_max_retries
+    self.max_concurrency = self.max_concurrency or settings.llm_max_concurrency
+    self.max_tokens = self.max_tokens or settings.llm_max_tokens
+    self._usage_lock = threading.Lock()
+    self._client: Any = None
+    self._semaphore: Optional[asyncio.Semaphore] = None
+
+  def run(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return self.complete(prompt, temperature, system_prompt).text
+
+  async def arun(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return (await self.acomplete(prompt, temperature, system_prompt)).text
+
+  def complete(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> LLMCompletion:
+    return run_sync(self._complete(prompt, temperature, system_prompt))
+
+  async def acomplete(
+    self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None
+  ) -> LLMCompletion:
+    return await run_async(self._complete(prompt, temperature, system_prompt))
+
+  def usage_snapshot(self) -> Dict[str, int]:
+    with self._usage_lock:
+      return self.usage.as_dict()
+
+  async def aclose(self) -> None:
+    if self._client is not None:
+      await run_async(self._client.close())
+      self._client = None
+
+  def _ensure_client(self) -> Any:
+    # Lazily created on the provider loop so the pool and semaphore bind to it.
+    if self._client is None:
+      import httpx
+      from openai import AsyncOpenAI
+
+      http_client = httpx.AsyncClient(
+        http2=_http2_available(),
+        limits=httpx.Limits(
+          max_connections=self.max_concurrency,
+          max_keepalive_connections=self.max_concurrency
+        ),
+        timeout=httpx.Timeout(self.timeout)
+      )
+      self._client = AsyncOpenAI(
+        api_key=self.api_key,
+        base_url=self.base_url,
+        http_client=http_client,
+        max_retries=0
+      )
+      self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    return self._client
+
+  def _is_retryable(self, exc: BaseException) -> bool:
+    import openai
+
+    if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+      return True
+    if isinstance(exc, openai.APIStatusError):
+      return exc.status_code in _RETRYABLE_STATUS
+    return False
+
+  def _backoff(self, attempt: int) -> float:
+    return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+  def _record(self, **deltas: int) -> None:
+    with self._usage_lock:
+      for key, value in deltas.items():
+        setattr(self.usage, key, getattr(self.usage, key) + value)
+
+  async def _complete(self, prompt: str, temperature: float, system_prompt: Optional[str]) -> LLMCompletion:
+    client = self._ensure_client()
+    messages = []
+    if system_prompt:
+      messages.append({'role': 'system', 'content': system_prompt})
+    messages.append({'role': 'user', 'content': prompt})
+
+    attempt = 0
+    while True:
+      try:
+        async with self._semaphore:
+          response = await asyncio.wait_for(
+            client.chat.completions.create(
+              model=self.model,
+              messages=messages,
+              temperature=temperature,
+              max_tokens=self.max_tokens
+            ),
+            timeout=self.timeout
+          )
+      except Exception as exc:  # noqa: BLE001
+        if attempt >= self.max_retries or not self._is_retryable(exc):
+          self._record(failures=1)
+          raise
+        delay = self._backoff(attempt)
+        attempt += 1
+        self._record(retries=1)
+        logger.warning(
+          'llm_retry',
+          extra={'event': 'llm_retry', 'attempt': attempt, 'delay_s': round(delay, 3), 'error': type(exc).__name__}
+        )
+        await asyncio.sleep(delay)
+        continue
+
+      usage = getattr(response, 'usage', None)
+      prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+      completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+      self._record(calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+      choice = response.choices[0] if response.choices else None
+      text = (choice.message.content or '') if choice else ''
+      return LLMCompletion(text, prompt_tokens, completion_tokens)
+
+
+@dataclass
+class CacheStats:
+  hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+  saved_prompt_tokens: int = 0
+  saved_completion_tokens: int = 0
+
+  def as_dict(self) -> Dict[str, Any]:
+    lookups = self.hits + self.misses
+    return {
+      'hits': self.hits,
+      'misses': self.misses,
+      'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+      'evictions': self.evictions,
+      'saved_prompt_tokens': self.saved_prompt_tokens,
+      'saved_completion_tokens': self.saved_completion_tokens,
+      'saved_tokens': self.saved_prompt_tokens + self.saved_completion_tokens
+    }
+
+
+class LLMResponseCache:
+  """SQLite-backed completion cache with TTL expiry and size-bounded LRU eviction.
+
+  Entries expire ``ttl_seconds`` after they were written. When the stored
+  responses exceed ``max_bytes`` the least recently read entries are dropped
+  until the cache is back under 90% of the limit. The size check runs on open
+  and every ``evict_every`` writes. Cache errors are logged and treated as misses
+  so a broken cache file never fails a parse.
+  """
+
+  _SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS completions ('
+    ' key TEXT PRIMARY KEY,'
+    ' text TEXT NOT NULL,'
+    ' prompt_tokens INTEGER NOT NULL,'
+    ' completion_tokens INTEGER NOT NULL,'
+    ' size INTEGER NOT NULL,'
+    ' created_at REAL NOT NULL,'
+    ' accessed_at REAL NOT NULL)'
+  )
+
+  def __init__(self, path: str, ttl_seconds: float, max_bytes: int, evict_every: int = 64) -> None:
+    self.path = path
+    self.ttl_seconds = ttl_seconds
+    self.max_bytes = max_bytes
+    self.evict_every = max(1, evict_every)
+    self.stats = CacheStats()
+    self._writes = 0
+    self._lock = threading.Lock()
+    if path != ':memory:':
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    if path != ':memory:':
+      self._conn.execute('PRAGMA journal_mode=WAL')
+      self._conn.execute('PRAGMA synchronous=NORMAL')
+    self._conn.execute(self._SCHEMA)
+    self._conn.execute('CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed_at)')
+    self.evict()
+
+  @staticmethod
+  def make_key(model: str, system_prompt: Optional[str], prompt: str, temperature: float) -> str:
+    material = json.dumps([model, system_prompt or '', prompt, round(float(temperature), 4)], ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+  def get(self, key: str) -> Optional[LLMCompletion]:
+    now = time.time()
+    with self._lock:
+      try:
+        row = self._conn.execute(
+          'SELECT text, prompt_tokens, completion_tokens, created_at FROM completions WHERE key = ?', (key,)
+        ).fetchone()
+        if row is not None and now - row[3] > self.ttl_seconds:
+          self._conn.execute('DELETE FROM completions WHERE key = ?', (key,))
+          row = None
+        if row is None:
+          self.stats.misses += 1
+          return None
+        self._conn.execute('UPDATE completions SET accessed_at = ? WHERE key = ?', (now, key))
+      except sqlite3.Error as exc:
+        logger.warning('llm_cache_error', extra={'event': 'llm_cache_error', 'op': 'get', 'error': str(exc)})
+        self.stats.misses += 1
+        return None
+      self.stats.hits += 1
+      self.stats.saved_prompt_tokens += row[1]
+      self.stats.saved_completion_tokens += row[2]
+    return LLMCompletion(row[0], row[1], row[2])
+
+  def put(self, key: str, completion: LLMCompletion) -> None:
+    now = time.time()
+    with self._lock:
+      try:
+        self._conn.execute(
+          'INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, ?)',
+          (
+            key,
+            completion.text,
+            completion.prompt_tokens,
+            completion.completion_tokens,
+            len(completion.text.encode('utf-8')),
+            now,
+            now
+          )
+        )
+      except sqlite3.Error as exc:
+        logger.warning('llm_cache_error', extra={'event': 'llm_cache_error', 'op': 'put', 'error': str(exc)})
+        return
+      self._writes += 1
+      due = self._writes % self.evict_every == 0
+    if due:
+      self.evict()
+
+  def evict(self) -> int:
+    """Drop expired entries, then least recently used ones while over ``max_bytes``."""
+    removed = 0
+    with self._lock:
+      try:
+        removed += self._conn.execute(
+          'DELETE FROM completions WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+        ).rowcount
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM completions').fetchone()[0]
+        if total > self.max_bytes:
+          target = total - int(self.max_bytes * 0.9)
+          victims: List[str] = []
+          freed = 0
+          for key, size in self._conn.execute('SELECT key, size FROM completions ORDER BY accessed_at'):
+            if freed >= target:
+              break
+            victims.append(key)
+            freed += size
+          self._conn.executemany('DELETE FROM completions WHERE key = ?', [(key,) for key in victims])
+          removed += len(victims)
+      except sqlite3.Error as exc:
+        logger.warning('llm_cache_error', extra={'event': 'llm_cache_error', 'op': 'evict', 'error': str(exc)})
+        return removed
+      self.stats.evictions += removed
+    return removed
+
+  def __len__(self) -> int:
+    with self._lock:
+      return self._conn.execute('SELECT COUNT(*) FROM completions').fetchone()[0]
+
+  def stats_snapshot(self) -> Dict[str, Any]:
+    with self._lock:
+      return self.stats.as_dict()
+
+  def clear(self) -> None:
+    with self._lock:
+      self._conn.execute('DELETE FROM completions')
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
+
+
+@dataclass
+class CachedLLMClient(LLMClient):
+  """Serve repeated prompts from an ``LLMResponseCache`` before calling ``inner``."""
+
+  inner: Optional[LLMClient] = None
+  cache: Optional[LLMResponseCache] = None
+
+  @property
+  def model(self) -> str:
+    return getattr(self.inner, 'model', None) or type(self.inner).__name__
+
+  def run(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return self.complete(prompt, temperature, system_prompt).text
+
+  async def arun(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> str:
+    return (await self.acomplete(prompt, temperature, system_prompt)).text
+
+  def complete(self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None) -> LLMCompletion:
+    key = self.cache.make_key(self.model, system_prompt, prompt, temperature)
+    cached = self.cache.get(key)
+    if cached is not None:
+      return cached
+    result = self.inner.complete(prompt, temperature, system_prompt)
+    if result.text:
+      self.cache.put(key, result)
+    return result
+
+  async def acomplete(
+    self, prompt: str, temperature: float = 0.2, system_prompt: Optional[str] = None
+  ) -> LLMCompletion:
+    key = self.cache.make_key(self.model, system_prompt, prompt, temperature)
+    cached = await asyncio.to_thread(self.cache.get, key)
+    if cached is not None:
+      return cached
+    result = await self.inner.acomplete(prompt, temperature, system_prompt)
+    if result.text:
+      await asyncio.to_thread(self.cache.put, key, result)
+    return result
+
+  def usage_snapshot(self) -> Dict[str, int]:
+    snapshot = getattr(self.inner, 'usage_snapshot', None)
+    return snapshot() if snapshot else {}
+
+  def cache_stats(self) -> Dict[str, Any]:
+    return self.cache.stats_snapshot()
+
+
+def _default_cache_path() -> str:
+  return str(Path(__file__).resolve().parents[1] / 'data' / 'llm_cache.sqlite3')
+
+
+def build_llm_cache() -> LLMResponseCache:
+  settings = get_settings()
+  return LLMResponseCache(
+    settings.llm_cache_path or _default_cache_path(),
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    max_bytes=int(settings.llm_cache_max_mb * 1024 * 1024)
+  )
+
+
+_LIVE_CLIENT: Optional[LLMClient] = None
+_LIVE_CLIENT_LOCK = threading.Lock()
+
 
 def get_llm_client() -> LLMClient:
-  return LLMClient()
+  global _LIVE_CLIENT
+  settings = get_settings()
+  if settings.ai_provider.lower().strip() == 'mock' or not settings.openai_api_key:
+    return MockLLMClient()
+  with _LIVE_CLIENT_LOCK:
+    if _LIVE_CLIENT is None:
+      client: LLMClient = OpenAILLMClient()
+      if settings.llm_cache_enabled:
+        client = CachedLLMClient(inner=client, cache=build_llm_cache())
+      _LIVE_CLIENT = client
+    return _LIVE_CLIENT
@@ -0,0 +1,293 @@
+"""Prometheus text-format metrics that aggregate across worker processes.
+
+Each process (uvicorn workers and CPU pool children) keeps its counters and
+histograms in memory. It writes them as a JSON snapshot named after its pid to
+``AI_METRICS_DIR``, at most every ``AI_METRICS_FLUSH_SECONDS``. The write
+happens after a request or pipeline finishes. ``/metrics`` flushes the
+serving worker and then merges every snapshot in the directory:
+
+- counters and histograms are summed over all snapshots, including those of
+  exited processes, so totals never go backwards when a worker is recycled
+- gauges (in-flight requests, executor queue depth, RSS) only come from
+  processes that are still alive
+
+No external collector or client library is needed. Point every worker of
+one deployment at the same, initially empty directory.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.settings import get_settings
+from utils.timing import BUCKETS_MS, Histogram, histogram_snapshot
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+# name -> (type, help)
+METRICS: Dict[str, Tuple[str, str]] = {
+  'ai_http_requests_total': (COUNTER, 'HTTP requests by route, method and status code.'),
+  'ai_http_request_duration_seconds': (HISTOGRAM, 'HTTP request latency by route.'),
+  'ai_http_requests_in_flight': (GAUGE, 'HTTP requests currently being served.'),
+  'ai_stage_duration_seconds': (HISTOGRAM, 'Pipeline stage latency (see utils/timing.py).'),
+  'ai_executor_pending': (GAUGE, 'Running plus queued jobs per workload pool.'),
+  'ai_executor_rejected_total': (COUNTER, 'Jobs rejected with 503 because a workload pool was full.'),
+  'ai_cache_hits_total': (COUNTER, 'Cache hits (ontology alias lookups, embeddings, LLM completions).'),
+  'ai_cache_misses_total': (COUNTER, 'Cache misses (ontology alias lookups, embeddings, LLM completions).'),
+  'ai_unknown_skills_recorded_total': (COUNTER, 'Unknown skill mentions recorded for ontology review.'),
+  'ai_unknown_skills': (GAUGE, 'Distinct unknown skills known to the process.'),
+  'ai_process_resident_memory_bytes': (GAUGE, 'Resident set size per process.'),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+  return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Registry:
+  def __init__(self) -> None:
+    self.counters: Dict[Tuple[str, LabelKey], float] = {}
+    self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+    self.in_flight = 0
+    self.lock = threading.Lock()
+    self.last_flush = 0.0
+
+
+_REGISTRY = _Registry()
+
+
+def inc(name: str, value: float = 1.0, **labels: Any) -> None:
+  key = (name, _label_key(labels))
+  with _REGISTRY.lock:
+    _REGISTRY.counters[key] = _REGISTRY.counters.get(key, 0.0) + value
+
+
+def observe(name: str, value_ms: float, **labels: Any) -> None:
+  key = (name, _label_key(labels))
+  with _REGISTRY.lock:
+    histogram = _REGISTRY.histograms.get(key)
+    if histogram is None:
+      histogram = _REGISTRY.histograms[key] = Histogram()
+    histogram.observe(value_ms)
+
+
+def _rss_bytes() -> Optional[int]:
+  try:
+    with open('/proc/self/statm', 'r', encoding='ascii') as handle:
+      return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+  except (OSError, ValueError, IndexError, AttributeError):
+    pass
+  try:
+    import resource
+
+    # Peak rather than current RSS, but the best portable fallback (KiB on Linux).
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
+  except (ImportError, OSError):
+    return None
+
+
+def _cache_counters() -> Iterable[Tuple[str, Dict[str, str], float]]:
+  # Only report clients this process already built; a scrape must not create them.
+  from utils import embeddings_client, llm_client
+  from utils.skill_ontology_loader import alias_lookup_stats
+
+  ontology = alias_lookup_stats()
+  yield 'ai_cache_hits_total', {'cache': 'ontology'}, ontology['hits']
+  yield 'ai_cache_misses_total', {'cache': 'ontology'}, ontology['misses']
+
+  embed = embeddings_client._CLIENT
+  if embed is not None and hasattr(embed, 'stats_snapshot'):
+    stats = embed.stats_snapshot()
+    yield 'ai_cache_hits_total', {'cache': 'embedding'}, stats['hits']
+    yield 'ai_cache_misses_total', {'cache': 'embedding'}, stats['misses']
+
+  llm = llm_client._LIVE_CLIENT
+  if llm is not None and hasattr(llm, 'cache_stats'):
+    stats = llm.cache_stats()
+    yield 'ai_cache_hits_total', {'cache': 'llm'}, stats['hits']
+    yield 'ai_cache_misses_total', {'cache': 'llm'}, stats['misses']
+
+
+def snapshot() -> Dict[str, Any]:
+  """This process's metrics in the on-disk snapshot layout."""
+  from utils import executors
+  from utils.skill_ontology_loader import unknown_skill_stats
+
+  with _REGISTRY.lock:
+    counters = [[name, dict(labels), value] for (name, labels), value in _REGISTRY.counters.items()]
+    histograms = [[name, dict(labels), h.counts[:], h.sum_ms] for (name, labels), h in _REGISTRY.histograms.items()]
+    gauges: List[List[Any]] = [['ai_http_requests_in_flight', {}, _REGISTRY.in_flight]]
+
+  for stage, stats in histogram_snapshot().items():
+    histograms.append(['ai_stage_duration_seconds', {'stage': stage}, stats['counts'], stats['sum_ms']])
+  for name, labels, value in _cache_counters():
+    counters.append([name, labels, value])
+  unknown = unknown_skill_stats()
+  counters.append(['ai_unknown_skills_recorded_total', {}, unknown['recorded']])
+  gauges.append(['ai_unknown_skills', {}, unknown['distinct']])
+
+  for workload, pool in list(executors._EXECUTORS.items()):
+    gauges.append(['ai_executor_pending', {'workload': workload}, pool.pending])
+    counters.append(['ai_executor_rejected_total', {'workload': workload}, pool.rejected])
+  rss = _rss_bytes()
+  if rss is not None:
+    gauges.append(['ai_process_resident_memory_bytes', {'pid': str(os.getpid())}, rss])
+
+  return {'pid': os.getpid(), 'written_at': time.time(), 'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+
+def metrics_dir() -> Path:
+  configured = get_settings().metrics_dir
+  return Path(configured) if configured else Path(tempfile.gettempdir()) / 'ai-service-metrics'
+
+
+def flush(force: bool = False) -> None:
+  """Write this process's snapshot if the flush interval has elapsed (or ``force``)."""
+  now = time.monotonic()
+  if not force and now - _REGISTRY.last_flush < get_settings().metrics_flush_seconds:
+    return
+  _REGISTRY.last_flush = now
+  directory = metrics_dir()
+  target = directory / f'{os.getpid()}.json'
+  try:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+      json.dump(snapshot(), handle)
+    os.replace(tmp, target)
+  except Exception as exc:  # noqa: BLE001
+    # Metrics are best-effort; never fail the request that triggered the flush.
+    logger.warning('metrics flush failed: %s', exc)
+
+
+def _pid_alive(pid: int) -> bool:
+  if pid == os.getpid():
+    return True
+  try:
+    os.kill(pid, 0)
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    return True
+  return True
+
+
+def _load_snapshots() -> List[Dict[str, Any]]:
+  snapshots = []
+  for path in metrics_dir().glob('*.json'):
+    try:
+      snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+    except (OSError, ValueError):
+      continue
+  return snapshots
+
+
+def _escape(value: str) -> str:
+  return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+  pairs = list(labels) + ([extra] if extra else [])
+  if not pairs:
+    return ''
+  return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_number(value: float) -> str:
+  if value == float('inf'):
+    return '+Inf'
+  return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus() -> str:
+  """Merge every process snapshot into Prometheus text exposition format."""
+  flush(force=True)
+  counters: Dict[Tuple[str, LabelKey], float] = {}
+  gauges: Dict[Tuple[str, LabelKey], float] = {}
+  histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+
+  for snap in _load_snapshots():
+    alive = _pid_alive(int(snap.get('pid', 0)))
+    for name, labels, value in snap.get('counters', []):
+      key = (name, _label_key(labels))
+      counters[key] = counters.get(key, 0.0) + value
+    if alive:
+      for name, labels, value in snap.get('gauges', []):
+        key = (name, _label_key(labels))
+        gauges[key] = gauges.get(key, 0.0) + value
+    for name, labels, counts, sum_ms in snap.get('histograms', []):
+      if len(counts) != len(BUCKETS_MS):
+        continue
+      key = (name, _label_key(labels))
+      merged = histograms.setdefault(key, [[0] * len(BUCKETS_MS), 0.0])
+      merged[0] = [a + b for a, b in zip(merged[0], counts)]
+      merged[1] += sum_ms
+
+  lines: List[str] = []
+  for name, (kind, help_text) in METRICS.items():
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+    if kind == HISTOGRAM:
+      for (metric, labels), (counts, sum_ms) in sorted(histograms.items()):
+        if metric != name:
+          continue
+        cumulative = 0
+        for bound, count in zip(BUCKETS_MS, counts):
+          cumulative += count
+          le = _format_number(bound / 1000 if bound != float('inf') else bound)
+          lines.append(f'{name}_bucket{_format_labels(labels, ("le", le))} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(sum_ms / 1000)}')
+        lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+      continue
+    source = counters if kind == COUNTER else gauges
+    for (metric, labels), value in sorted(source.items()):
+      if metric == name:
+        lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+  return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+  """ASGI middleware recording request counts, latency and in-flight requests."""
+
+  def __init__(self, app: Any) -> None:
+    self.app = app
+
+  async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+
+    status_code = 500
+    started = time.perf_counter_ns()
+
+    async def _send(message: Dict[str, Any]) -> None:
+      nonlocal status_code
+      if message['type'] == 'http.response.start':
+        status_code = message['status']
+      await send(message)
+
+    with _REGISTRY.lock:
+      _REGISTRY.in_flight += 1
+    try:
+      await self.app(scope, receive, _send)
+    finally:
+      with _REGISTRY.lock:
+        _REGISTRY.in_flight -= 1
+      route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+      observe('ai_http_request_duration_seconds', (time.perf_counter_ns() - started) / 1e6, route=route)
+      inc('ai_http_requests_total', route=route, method=scope.get('method', ''), status=status_code)
+      flush()
@@ -0,0 +1,183 @@
+"""Request ids and on-demand cProfile capture for production requests.
+
+``RequestProfilingMiddleware`` gives every request an id: the caller's
+``X-Request-ID`` when it is a safe token, otherwise a fresh one. The id is
+echoed in the response. The middleware also decides whether the request is
+profiled:
+
+- explicitly, with ``X-Profile: 1`` (or ``?profile=1``) plus
+  ``X-Admin-Token`` matching ``AI_PROFILE_ADMIN_TOKEN``; a missing or wrong
+  token returns 403
+- automatically, for one in every ``AI_PROFILE_SAMPLE_EVERY`` requests
+
+``run_workload`` picks the decision up from a ContextVar and runs the route's
+work under cProfile wherever the work executes: inline, on a pool thread or in
+a CPU pool child. The worker writes ``<request id>.prof`` (pstats binary) and
+``<request id>.txt`` (top functions by cumulative time) to ``AI_PROFILE_DIR``.
+Profiles contain function names and timings only, never document text.
+Threads started by the work itself (LLM fan-out) are not profiled.
+"""
+from __future__ import annotations
+
+import cProfile
+import hmac
+import io
+import itertools
+import json
+import logging
+import pstats
+import re
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+PROFILE_HEADER = 'X-Profile'
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+_SAFE_ID = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+_REQUEST_ID: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+_PROFILE_ID: ContextVar[Optional[str]] = ContextVar('profile_id', default=None)
+_SAMPLE_COUNTER = itertools.count(1)
+
+
+def current_request_id() -> str:
+  return _REQUEST_ID.get() or uuid.uuid4().hex[:12]
+
+
+def profile_dir() -> Path:
+  configured = get_settings().profile_dir
+  return Path(configured) if configured else Path(__file__).resolve().parents[1] / 'data' / 'profiles'
+
+
+def _prune(directory: Path, max_files: int) -> None:
+  profiles = sorted(directory.glob('*.prof'), key=lambda path: path.stat().st_mtime)
+  for stale in profiles[:max(0, len(profiles) - max_files)]:
+    stale.unlink(missing_ok=True)
+    stale.with_suffix('.txt').unlink(missing_ok=True)
+
+
+def profiled_call(profile_id: str, directory: str, max_files: int, fn: Callable[..., Any], *args: Any) -> Any:
+  """Run ``fn(*args)`` under cProfile and store the artifacts as ``<profile_id>.prof/.txt``.
+
+  Module-level so it can be shipped to CPU pool child processes.
+  """
+  profiler = cProfile.Profile()
+  try:
+    return profiler.runcall(fn, *args)
+  finally:
+    try:
+      target = Path(directory)
+      target.mkdir(parents=True, exist_ok=True)
+      profiler.dump_stats(target / f'{profile_id}.prof')
+      summary = io.StringIO()
+      pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(60)
+      (target / f'{profile_id}.txt').write_text(summary.getvalue(), encoding='utf-8')
+      _prune(target, max_files)
+      logger.info('profile_written', extra={'event': 'profile_written', 'profile_id': profile_id})
+    except Exception as exc:  # noqa: BLE001
+      logger.warning('writing profile %s failed: %s', profile_id, exc)
+
+
+def wrap_if_profiling(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+  """Return ``(fn, args)`` rewritten to run under cProfile when this request is profiled."""
+  profile_id = _PROFILE_ID.get()
+  if profile_id is None:
+    return fn, args
+  # Profile once per request even if the route dispatches several workloads.
+  _PROFILE_ID.set(None)
+  settings = get_settings()
+  return profiled_call, (profile_id, str(profile_dir()), settings.profile_max_files, fn, *args)
+
+
+def _header(scope: Dict[str, Any], name: str) -> Optional[str]:
+  wanted = name.lower().encode('latin-1')
+  for key, value in scope.get('headers') or []:
+    if key.lower() == wanted:
+      return value.decode('latin-1')
+  return None
+
+
+def _profile_requested(scope: Dict[str, Any]) -> bool:
+  if (_header(scope, PROFILE_HEADER) or '').strip().lower() in {'1', 'true', 'yes'}:
+    return True
+  query = parse_qs((scope.get('query_string') or b'').decode('latin-1'))
+  return (query.get('profile') or [''])[-1].strip().lower() in {'1', 'true', 'yes'}
+
+
+def _authorized(scope: Dict[str, Any]) -> bool:
+  expected = get_settings().profile_admin_token
+  supplied = _header(scope, ADMIN_TOKEN_HEADER) or ''
+  return bool(expected) and hmac.compare_digest(supplied.encode('utf-8'), expected.encode('utf-8'))
+
+
+def _sampled(scope: Dict[str, Any]) -> bool:
+  every = get_settings().profile_sample_every
+  # Only AI routes count, so health checks and scrapes do not skew the 1-in-N rate.
+  if every <= 0 or not scope.get('path', '').startswith('/ai/'):
+    return False
+  return next(_SAMPLE_COUNTER) % every == 0
+
+
+class RequestProfilingMiddleware:
+  """ASGI middleware assigning request ids and arming per-request profiling."""
+
+  def __init__(self, app: Any) -> None:
+    self.app = app
+
+  async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+
+    incoming = _header(scope, REQUEST_ID_HEADER)
+    request_id = incoming if incoming and _SAFE_ID.match(incoming) else uuid.uuid4().hex[:12]
+    profile = False
+    if _profile_requested(scope):
+      if not _authorized(scope):
+        await _forbidden(send, request_id)
+        return
+      profile = True
+    elif _sampled(scope):
+      profile = True
+
+    id_token = _REQUEST_ID.set(request_id)
+    profile_token = _PROFILE_ID.set(request_id if profile else None)
+
+    async def _send(message: Dict[str, Any]) -> None:
+      if message['type'] == 'http.response.start':
+        headers = list(message.get('headers') or [])
+        headers.append((REQUEST_ID_HEADER.lower().encode('latin-1'), request_id.encode('latin-1')))
+        if profile:
+          headers.append((PROFILE_ID_HEADER.lower().encode('latin-1'), request_id.encode('latin-1')))
+        message = {**message, 'headers': headers}
+      await send(message)
+
+    try:
+      await self.app(scope, receive, _send)
+    finally:
+      _PROFILE_ID.reset(profile_token)
+      _REQUEST_ID.reset(id_token)
+
+
+async def _forbidden(send: Any, request_id: str) -> None:
+  body = json.dumps({
+    'detail': {'error': 'profiling_forbidden', 'message': 'Profiling requires a valid admin token.'}
+  }).encode('utf-8')
+  await send({
+    'type': 'http.response.start',
+    'status': 403,
+    'headers': [
+      (b'content-type', b'application/json'),
+      (b'content-length', str(len(body)).encode('latin-1')),
+      (REQUEST_ID_HEADER.lower().encode('latin-1'), request_id.encode('latin-1')),
+    ],
+  })
+  await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,22 @@
+"""JSON response rendered by pydantic-core.
+
+Routes return ``ModelJSONResponse(model)`` instead of the model itself. FastAPI
+then skips its response_model pass, which re-validates the model, dumps it to
+a JSON-compatible dict and re-encodes that dict with the stdlib ``json``
+module. ``pydantic_core.to_json`` writes the bytes in one pass in Rust,
+honouring field serializers such as the embedding encoding. Keep
+``response_model=`` on the route so the OpenAPI schema is unchanged.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class ModelJSONResponse(JSONResponse):
+  media_type = 'application/json'
+
+  def render(self, content: Any) -> bytes:
+    return to_json(content)
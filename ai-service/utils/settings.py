@@ -17,6 +17,64 @@ class Settings(BaseModel):
 
   openai_chat_model: str = os.getenv('OPENAI_CHAT_MODEL', 'gpt-4o-mini')
   openai_embedding_model: str = os.getenv('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+  embedding_timeout: float = float(os.getenv('EMBEDDING_TIMEOUT', '30'))
+  embedding_batch_window_ms: float = float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', '5'))
+  embedding_batch_max: int = int(os.getenv('EMBEDDING_BATCH_MAX', '64'))
+  embedding_cache_size: int = int(os.getenv('EMBEDDING_CACHE_SIZE', '50000'))
+  # What parse-resume/parse-jd embed: 'summary' (summary plus document, the stored-vector baseline) or
+  # 'document' (document only, so the embedding overlaps the LLM extraction). The two are not comparable.
+  embedding_input: str = os.getenv('AI_EMBEDDING_INPUT', 'document').lower()
+  openai_base_url: str = os.getenv('OPENAI_BASE_URL', '')
+  llm_timeout: float = float(os.getenv('LLM_TIMEOUT', '30'))
+  llm_max_tokens: int = int(os.getenv('LLM_MAX_TOKENS', '600'))
+  llm_max_retries: int = int(os.getenv('LLM_MAX_RETRIES', '3'))
+  llm_max_concurrency: int = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+  llm_cache_enabled: bool = os.getenv('LLM_CACHE_ENABLED', 'true').lower() not in {'0', 'false', 'no'}
+  # Empty means ai-service/data/llm_cache.sqlite3.
+  llm_cache_path: str = os.getenv('LLM_CACHE_PATH', '')
+  llm_cache_ttl_seconds: float = float(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+  llm_cache_max_mb: float = float(os.getenv('LLM_CACHE_MAX_MB', '64'))
+
+  warmup_enabled: bool = os.getenv('AI_WARMUP_ENABLED', 'true').lower() not in {'0', 'false', 'no'}
+  # Comma separated subset of parse_resume,parse_jd,match,recommend,ats_scan; empty means all.
+  warmup_pipelines: List[str] = [p.strip() for p in os.getenv('AI_WARMUP_PIPELINES', '').split(',') if p.strip()]
+
+  # Ontology similarity index (see utils/similarity_index.py): exact scan up to flat_max labels, IVF above.
+  ontology_index_flat_max: int = int(os.getenv('AI_ONTOLOGY_INDEX_FLAT_MAX', '4096'))
+  ontology_index_nprobe: int = int(os.getenv('AI_ONTOLOGY_INDEX_NPROBE', '8'))
+
+  # Route executors (see utils/executors.py).
+  cpu_executor: str = os.getenv('AI_CPU_EXECUTOR', 'process').lower()
+  cpu_workers: int = int(os.getenv('AI_CPU_WORKERS', '2'))
+  cpu_queue_limit: int = int(os.getenv('AI_CPU_QUEUE_LIMIT', '16'))
+  io_workers: int = int(os.getenv('AI_IO_WORKERS', '16'))
+  io_queue_limit: int = int(os.getenv('AI_IO_QUEUE_LIMIT', '64'))
+  retry_after_seconds: int = int(os.getenv('AI_RETRY_AFTER_SECONDS', '1'))
+  inline_recommend_max_jobs: int = int(os.getenv('AI_INLINE_RECOMMEND_MAX_JOBS', '16'))
+
+  # RSE states kept per (resume_id, job) so /ai/match re-scores edited resumes incrementally; 0 disables.
+  match_state_cache_size: int = int(os.getenv('AI_MATCH_STATE_CACHE_SIZE', '256'))
+  # Rankings kept for /ai/recommend delta refreshes (see services/ranking_cache.py); 0 disables tokens.
+  recommend_cache_size: int = int(os.getenv('AI_RECOMMEND_CACHE_SIZE', '256'))
+  recommend_cache_ttl_seconds: float = float(os.getenv('AI_RECOMMEND_CACHE_TTL_SECONDS', '1800'))
+  # Shared by every worker on the host; empty means ai-service/data/ranking_cache.sqlite3.
+  recommend_cache_path: str = os.getenv('AI_RECOMMEND_CACHE_PATH', '')
+  # Job catalog change log shared by every worker (see services/job_catalog.py); empty means ai-service/data/job_catalog.sqlite3.
+  job_catalog_path: str = os.getenv('AI_JOB_CATALOG_PATH', '')
+  # /ai/recommend-batch: score matrices per candidate block, and candidates per streamed executor call.
+  recommend_batch_block_mb: int = int(os.getenv('AI_RECOMMEND_BATCH_BLOCK_MB', '64'))
+  recommend_batch_stream_page: int = int(os.getenv('AI_RECOMMEND_BATCH_STREAM_PAGE', '1000'))
+
+  # Per-process metric snapshots merged by /metrics (see utils/metrics.py); empty means <tmp>/ai-service-metrics.
+  metrics_dir: str = os.getenv('AI_METRICS_DIR', '')
+  metrics_flush_seconds: float = float(os.getenv('AI_METRICS_FLUSH_SECONDS', '5'))
+
+  # On-demand profiling (see utils/profiling.py); an empty token disables header-triggered profiling.
+  profile_admin_token: str = os.getenv('AI_PROFILE_ADMIN_TOKEN', '')
+  profile_sample_every: int = int(os.getenv('AI_PROFILE_SAMPLE_EVERY', '0'))
+  # Empty means ai-service/data/profiles.
+  profile_dir: str = os.getenv('AI_PROFILE_DIR', '')
+  profile_max_files: int = int(os.getenv('AI_PROFILE_MAX_FILES', '200'))
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,167 @@
+"""Nearest-neighbour search over unit vectors for large label sets.
+
+``SimilarityIndex`` answers "which row is most similar to this query" by
+cosine. Small sets (``<= flat_max`` rows) are scanned exactly with one mat-vec
+product, as before. Larger sets use an inverted-file (IVF) layout:
+
+- rows are clustered with a few rounds of spherical k-means into ``nlist``
+  (about ``sqrt(n)``) lists
+- rows are stored contiguously per list, so probing a list is a slice, not a
+  gather
+- a query scores the centroids, then only the ``nprobe`` closest lists
+
+Per-query cost is ``O((nlist + nprobe * n / nlist) * dim)``, so it grows with
+``sqrt(n)`` instead of ``n``. Results are approximate: a neighbour that
+landed in an unprobed list is missed. Raise ``nprobe`` to trade speed for
+recall.
+
+Rows may carry a group label (the ontology category). Inside every list, and
+in the flat layout, rows are ordered by group, so each (list, group) cell is
+a contiguous slice. A search restricted to some groups scans only their
+slices. ``search(..., groups=..., threshold=...)`` tries the hinted groups
+first and falls back to all rows only when they hold no match at or above
+``threshold``. The vectors are stored once, however many groups there are.
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.vector_ops import MatrixLike, VectorLike, as_matrix, l2_normalize
+
+_ASSIGN_CHUNK = 16_384
+_TRAIN_PER_LIST = 64
+
+
+def _assign(unit: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+  """Index of the closest centroid for every row, in chunks to bound the score matrix."""
+  labels = np.empty(unit.shape[0], dtype=np.int32)
+  for start in range(0, unit.shape[0], _ASSIGN_CHUNK):
+    block = unit[start:start + _ASSIGN_CHUNK]
+    labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+  return labels
+
+
+def _spherical_kmeans(unit: np.ndarray, nlist: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+  sample_size = min(unit.shape[0], nlist * _TRAIN_PER_LIST)
+  sample = unit[rng.choice(unit.shape[0], size=sample_size, replace=False)]
+  centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+  for _ in range(iterations):
+    labels = _assign(sample, centroids)
+    sums = np.zeros_like(centroids)
+    np.add.at(sums, labels, sample)
+    empty = ~sums.any(axis=1)
+    # Re-seed empty lists from random samples so every list stays useful.
+    sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+    centroids, _ = l2_normalize(sums)
+  return centroids
+
+
+def _unit(query: VectorLike) -> Optional[np.ndarray]:
+  vec = np.asarray(query, dtype=np.float32).reshape(-1)
+  norm = float(np.sqrt(vec @ vec))
+  return vec / norm if norm > 0.0 else None
+
+
+class SimilarityIndex:
+  """Top-1 cosine search; exact for small sets, IVF above ``flat_max`` rows."""
+
+  __slots__ = ('unit', 'row_ids', 'centroids', 'cells', 'group_ids', 'nprobe')
+
+  def __init__(
+    self,
+    vectors: MatrixLike,
+    groups: Optional[Sequence[Optional[str]]] = None,
+    flat_max: int = 4096,
+    nprobe: int = 8,
+    nlist: Optional[int] = None,
+    iterations: int = 8,
+    seed: int = 0
+  ) -> None:
+    unit, _ = l2_normalize(as_matrix(vectors))
+    rows = unit.shape[0]
+    self.nprobe = max(1, nprobe)
+    # Group code 0 holds rows without a group.
+    names = sorted({group for group in groups if group is not None}) if groups else []
+    self.group_ids: Dict[str, int] = {name: code for code, name in enumerate(names, start=1)}
+    codes = np.fromiter(
+      (self.group_ids.get(group, 0) for group in groups), dtype=np.int64, count=rows
+    ) if groups else np.zeros(rows, dtype=np.int64)
+
+    self.centroids: Optional[np.ndarray] = None
+    if rows <= max(flat_max, 1):
+      nlist, lists = 1, np.zeros(rows, dtype=np.int64)
+    else:
+      nlist = max(2, min(rows, nlist or int(math.sqrt(rows))))
+      self.centroids = _spherical_kmeans(unit, nlist, iterations, np.random.default_rng(seed))
+      lists = _assign(unit, self.centroids).astype(np.int64)
+    cell = lists * self.ngroups + codes
+    order = np.argsort(cell, kind='stable')
+    self.unit = np.ascontiguousarray(unit[order])
+    self.unit.setflags(write=False)
+    self.row_ids = order.astype(np.int32)
+    # Cell (list l, group g) is unit[cells[l * ngroups + g]:cells[l * ngroups + g + 1]].
+    self.cells = np.searchsorted(cell[order], np.arange(nlist * self.ngroups + 1)).astype(np.int64)
+
+  def __len__(self) -> int:
+    return self.unit.shape[0]
+
+  @property
+  def ngroups(self) -> int:
+    return len(self.group_ids) + 1
+
+  @property
+  def is_flat(self) -> bool:
+    return self.centroids is None
+
+  @property
+  def nbytes(self) -> int:
+    centroids = self.centroids.nbytes if self.centroids is not None else 0
+    return self.unit.nbytes + self.row_ids.nbytes + self.cells.nbytes + centroids
+
+  def search(
+    self,
+    query: VectorLike,
+    groups: Optional[Iterable[str]] = None,
+    threshold: float = 1.0
+  ) -> Tuple[int, float]:
+    """Return ``(row, cosine)`` of the best match, or ``(-1, 0.0)`` for an empty index or zero query.
+
+    With ``groups``, rows in those groups are searched first; the result is
+    returned when it scores at least ``threshold``, otherwise all rows are.
+    """
+    vec = _unit(query)
+    if vec is None or not len(self):
+      return -1, 0.0
+    codes = [self.group_ids[group] for group in groups if group in self.group_ids] if groups else []
+    if codes:
+      row, score = self._search(vec, sorted(set(codes)))
+      if row >= 0 and score >= threshold:
+        return row, score
+    return self._search(vec, None)
+
+  def _search(self, vec: np.ndarray, codes: Optional[List[int]]) -> Tuple[int, float]:
+    if self.centroids is None:
+      lists: Iterable[int] = (0,)
+    else:
+      centroid_scores = self.centroids @ vec
+      nprobe = min(self.nprobe, len(centroid_scores))
+      lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe].tolist()
+    width = self.ngroups
+    best_row, best_score = -1, -np.inf
+    for probe in lists:
+      base = probe * width
+      spans = [(base, base + width)] if codes is None else [(base + code, base + code + 1) for code in codes]
+      for first, last in spans:
+        start, end = self.cells[first], self.cells[last]
+        if start == end:
+          continue
+        scores = self.unit[start:end] @ vec
+        local = int(np.argmax(scores))
+        if scores[local] > best_score:
+          best_row, best_score = int(start) + local, float(scores[local])
+    if best_row < 0:
+      return -1, 0.0
+    return int(self.row_ids[best_row]), best_score
@@ -2,14 +2,24 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from utils.embeddings_client import cosine_similarity, get_embeddings_client
+import numpy as np
 
+from utils.embeddings_client import get_embeddings_client
+from utils.settings import get_settings
+from utils.similarity_index import SimilarityIndex
 
-@dataclass
+
+@dataclass(slots=True)
 class OntologyEntry:
   canonicalId: str
   displayName: str
@@ -18,18 +28,85 @@ class OntologyEntry:
   updatedAt: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillOntology:
-  entries: List[OntologyEntry]
-  by_id: Dict[str, OntologyEntry]
-  by_display: Dict[str, OntologyEntry]
-  alias_to_entry: Dict[str, OntologyEntry]
-  embeddings: Dict[str, List[float]]
+  """Array-backed ontology: entry ``i`` is spread over parallel columns.
+
+  Strings are interned, so repeated categories and aliases shared between
+  keys and entries are stored once. ``OntologyEntry`` objects are only built
+  when a lookup returns one. ``keys`` maps every lowercased alias, display
+  name and canonical id to its entry index. Each distinct key is embedded
+  once into ``embedding_index``, grouped by lowercased category.
+  ``label_entries[row]`` is the entry index of ``embedding_labels[row]``.
+  """
+
+  canonical_ids: List[str]
+  display_names: List[str]
+  categories: List[Optional[str]]
+  updated_at: List[Optional[str]]
+  # Aliases of entry i are alias_values[alias_offsets[i]:alias_offsets[i + 1]].
+  alias_offsets: np.ndarray
+  alias_values: List[str]
+  keys: Dict[str, int]
+  names: Dict[str, int]
+  embedding_labels: List[str]
+  label_entries: np.ndarray
+  embedding_index: SimilarityIndex
+  _materialized: List[Optional[OntologyEntry]] = field(default_factory=list, repr=False)
+  # (token as embedded, threshold, category hints) -> entry index or -1; see similarity_to_canonical.
+  _similar: 'OrderedDict[Tuple[str, float, Tuple[str, ...]], int]' = field(default_factory=OrderedDict, repr=False)
+
+  def __len__(self) -> int:
+    return len(self.canonical_ids)
+
+  @property
+  def entries(self) -> List[OntologyEntry]:
+    return [self.entry(idx) for idx in range(len(self))]
+
+  def entry(self, idx: int) -> OntologyEntry:
+    if not self._materialized:
+      self._materialized = [None] * len(self)
+    found = self._materialized[idx]
+    if found is None:
+      start, end = self.alias_offsets[idx], self.alias_offsets[idx + 1]
+      found = OntologyEntry(
+        canonicalId=self.canonical_ids[idx],
+        displayName=self.display_names[idx],
+        aliases=self.alias_values[start:end],
+        category=self.categories[idx],
+        updatedAt=self.updated_at[idx]
+      )
+      self._materialized[idx] = found
+    return found
+
+  def lookup(self, key: str) -> Optional[OntologyEntry]:
+    """Entry whose lowercased alias, display name or id equals ``key``."""
+    idx = self.keys.get(key)
+    return self.entry(idx) if idx is not None else None
+
+  def has_category(self, category: str) -> bool:
+    """Whether ``category`` (lowercased) can be used as a search hint."""
+    return category in self.embedding_index.group_ids
+
+  def find(self, name: str) -> Optional[OntologyEntry]:
+    """Entry by exact display name or canonical id."""
+    idx = self.names.get(name)
+    return self.entry(idx) if idx is not None else None
 
 
 _CACHE: SkillOntology | None = None
 _UNKNOWN_COUNTS: Dict[str, int] = {}
-_EMBED_CLIENT = get_embeddings_client()
+_RECORD_UNKNOWN: ContextVar[bool] = ContextVar('record_unknown_skills', default=True)
+_EMBED_CHUNK = 2048
+_SIMILAR_MEMO_MAX = 100_000
+_SIMILAR_LOCK = threading.Lock()
+# Exported by utils/metrics.py; plain ints, so concurrent updates may rarely drop a count.
+_STATS = {'alias_hits': 0, 'alias_misses': 0, 'unknown_recorded': 0}
+
+
+@lru_cache(maxsize=1)
+def _embed_client():
+  return get_embeddings_client()
 
 
 def _default_paths():
@@ -55,9 +132,19 @@ def _write_unknown_counts(path: Path):
     pass
 
 
-def _embed(texts: List[str]) -> Dict[str, List[float]]:
-  vectors = _EMBED_CLIENT.embed(texts)
-  return {text: vec for text, vec in zip(texts, vectors)}
+def _intern(value: Optional[str]) -> Optional[str]:
+  return sys.intern(value) if isinstance(value, str) else value
+
+
+def _embed(texts: List[str]) -> np.ndarray:
+  # Labels go straight to the provider in chunks: a large ontology would otherwise
+  # flush the shared embedding LRU that request-time tokens rely on.
+  client = _embed_client()
+  provider = getattr(client, 'inner', client)
+  if not texts:
+    return np.zeros((0, provider.dim), dtype=np.float32)
+  chunks = [provider.embed_array(texts[start:start + _EMBED_CHUNK]) for start in range(0, len(texts), _EMBED_CHUNK)]
+  return np.ascontiguousarray(np.concatenate(chunks), dtype=np.float32)
 
 
 def load_skill_ontology(force_reload: bool = False) -> SkillOntology:
@@ -70,35 +157,43 @@ def load_skill_ontology(force_reload: bool = False) -> SkillOntology:
   if overrides:
     ontology_path = Path(overrides)
 
-  raw_entries = _load_json(ontology_path)
-  entries: List[OntologyEntry] = []
-  for item in raw_entries:
-    try:
-      entries.append(
-        OntologyEntry(
-          canonicalId=item.get('canonicalId') or item.get('id') or item.get('displayName'),
-          displayName=item.get('displayName') or item.get('canonicalId'),
-          aliases=item.get('aliases') or [],
-          category=item.get('category'),
-          updatedAt=item.get('updatedAt')
-        )
-      )
-    except Exception:
+  settings = get_settings()
+  canonical_ids: List[str] = []
+  display_names: List[str] = []
+  categories: List[Optional[str]] = []
+  updated_at: List[Optional[str]] = []
+  alias_offsets: List[int] = [0]
+  alias_values: List[str] = []
+  keys: Dict[str, int] = {}
+  names: Dict[str, int] = {}
+  for item in _load_json(ontology_path):
+    if not isinstance(item, dict):
       continue
-
-  by_id = {e.canonicalId: e for e in entries if e.canonicalId}
-  by_display = {e.displayName: e for e in entries if e.displayName}
-  alias_to_entry: Dict[str, OntologyEntry] = {}
-  for e in entries:
-    for alias in e.aliases or []:
-      alias_to_entry[alias.lower()] = e
-    if e.displayName:
-      alias_to_entry[e.displayName.lower()] = e
-    if e.canonicalId:
-      alias_to_entry[e.canonicalId.lower()] = e
-
-  texts = list(by_display.keys()) + list(alias_to_entry.keys())
-  embeddings = _embed(texts) if texts else {}
+    canonical = item.get('canonicalId') or item.get('id') or item.get('displayName')
+    display = item.get('displayName') or item.get('canonicalId')
+    if not canonical or not display:
+      continue
+    idx = len(canonical_ids)
+    canonical_ids.append(_intern(canonical))
+    display_names.append(_intern(display))
+    categories.append(_intern(item.get('category')))
+    updated_at.append(item.get('updatedAt'))
+    aliases = [_intern(alias) for alias in item.get('aliases') or [] if isinstance(alias, str)]
+    alias_values.extend(aliases)
+    alias_offsets.append(len(alias_values))
+    # Later entries win on conflicting keys, as with the former per-key dicts.
+    names[display] = names[canonical] = idx
+    for key in (*aliases, display, canonical):
+      keys[_intern(key.lower())] = idx
+
+  labels = list(keys)
+  label_entries = np.fromiter(keys.values(), dtype=np.int32, count=len(keys))
+  index = SimilarityIndex(
+    _embed(labels),
+    [categories[idx].lower() if categories[idx] else None for idx in label_entries.tolist()],
+    flat_max=settings.ontology_index_flat_max,
+    nprobe=settings.ontology_index_nprobe
+  )
 
   # load unknown counts
   _UNKNOWN_COUNTS.clear()
@@ -116,7 +211,10 @@ def load_skill_ontology(force_reload: bool = False) -> SkillOntology:
     except Exception:
       _UNKNOWN_COUNTS.clear()
 
-  _CACHE = SkillOntology(entries, by_id, by_display, alias_to_entry, embeddings)
+  _CACHE = SkillOntology(
+    canonical_ids, display_names, categories, updated_at, np.asarray(alias_offsets, dtype=np.int64), alias_values,
+    keys, names, labels, label_entries, index
+  )
   return _CACHE
 
 
@@ -126,36 +224,63 @@ def get_skill_ontology() -> SkillOntology:
 
 def resolve_alias_to_canonical(raw: str) -> OntologyEntry | None:
   ontology = get_skill_ontology()
-  key = (raw or '').lower().strip()
-  return ontology.alias_to_entry.get(key)
+  entry = ontology.lookup((raw or '').lower().strip())
+  _STATS['alias_hits' if entry is not None else 'alias_misses'] += 1
+  return entry
 
 
-def similarity_to_canonical(raw: str, threshold: float = 0.82) -> OntologyEntry | None:
+def similarity_to_canonical(
+  raw: str,
+  threshold: float = 0.82,
+  categories: Optional[Iterable[str]] = None
+) -> OntologyEntry | None:
+  """Closest entry by embedding, if at least ``threshold`` similar.
+
+  ``categories`` are ontology categories suggested by context; their labels
+  are searched first and the rest only when they hold no match.
+  """
   ontology = get_skill_ontology()
-  if not ontology.embeddings:
+  if not len(ontology.embedding_index):
     return None
 
-  raw_vec = _EMBED_CLIENT.embed([raw])[0]
-  best_entry = None
-  best_score = 0.0
-
-  for label, vec in ontology.embeddings.items():
-    score = cosine_similarity(raw_vec, vec)
-    if score > best_score:
-      best_score = score
-      # prefer display name match
-      best_entry = ontology.by_display.get(label) or ontology.alias_to_entry.get(label)
-
-  if best_entry and best_score >= threshold:
-    return best_entry
-  return None
+  # Tokens repeat heavily across documents; remember the outcome per ontology load,
+  # least recently used first out. The key is the exact text embedded, so the
+  # outcome for a spelling never depends on which spelling was seen first.
+  hints = tuple(sorted({category.lower() for category in categories or ()}))
+  key = (raw or '', threshold, hints)
+  with _SIMILAR_LOCK:
+    idx = ontology._similar.get(key)
+    if idx is not None:
+      ontology._similar.move_to_end(key)
+  if idx is None:
+    row, score = ontology.embedding_index.search(_embed_client().embed_array([raw or ''])[0], hints, threshold)
+    idx = int(ontology.label_entries[row]) if row >= 0 and score > 0.0 and score >= threshold else -1
+    with _SIMILAR_LOCK:
+      ontology._similar[key] = idx
+      ontology._similar.move_to_end(key)
+      while len(ontology._similar) > _SIMILAR_MEMO_MAX:
+        ontology._similar.popitem(last=False)
+  return ontology.entry(idx) if idx >= 0 else None
+
+
+@contextmanager
+def suppress_unknown_skill_recording():
+  """Skip unknown-skill bookkeeping for synthetic traffic (warm-up, benchmarks)."""
+  token = _RECORD_UNKNOWN.set(False)
+  try:
+    yield
+  finally:
+    _RECORD_UNKNOWN.reset(token)
 
 
 def record_unknown_skill(raw: str):
+  if not _RECORD_UNKNOWN.get():
+    return
   cleaned = (raw or '').strip()
   if not cleaned:
     return
   _UNKNOWN_COUNTS[cleaned] = _UNKNOWN_COUNTS.get(cleaned, 0) + 1
+  _STATS['unknown_recorded'] += 1
   _, _, unknown_path = _default_paths()
   override = os.getenv('UNKNOWN_SKILLS_PATH')
   if override:
@@ -166,3 +291,12 @@ def record_unknown_skill(raw: str):
 def list_unknown_skills() -> Dict[str, int]:
   return dict(sorted(_UNKNOWN_COUNTS.items(), key=lambda kv: kv[1], reverse=True))
 
+
+def alias_lookup_stats() -> Dict[str, int]:
+  """Exact alias hits vs. misses that fall through to embedding similarity."""
+  return {'hits': _STATS['alias_hits'], 'misses': _STATS['alias_misses']}
+
+
+def unknown_skill_stats() -> Dict[str, int]:
+  return {'recorded': _STATS['unknown_recorded'], 'distinct': len(_UNKNOWN_COUNTS)}
+
@@ -0,0 +1,130 @@
+"""Skill lists as integer id arrays for bulk overlap scoring.
+
+The recommendation scorer compares skills by ``strip().lower()`` key.
+``SkillVocabulary`` gives every key a dense integer id. Ontology display
+names and canonical ids are registered first, in ontology order, so the
+same ontology yields the same ids in every process.
+
+``SkillSets`` stores many skill lists in CSR form: one flat id array plus
+row offsets. Duplicates are kept because the scorer counts them. Overlap
+with one set is then a boolean gather and a ``bincount``: "how many of each
+row's skills does the candidate have" for thousands of jobs in one pass.
+
+Encoding normalizes each distinct string once. Keys unknown to the
+vocabulary get ids that are only valid for that call, unless ``grow=True``
+registers them permanently (for long-lived data such as a job catalog).
+All sets returned by one ``encode`` call share one id space, whose size is
+``universe``.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from utils.skill_ontology_loader import load_skill_ontology
+
+
+def skill_key(skill: str) -> str:
+  return skill.strip().lower()
+
+
+@dataclass(frozen=True)
+class SkillSets:
+  """Rows of skill ids; row ``i`` is ``ids[offsets[i]:offsets[i + 1]]``."""
+
+  ids: np.ndarray
+  offsets: np.ndarray
+  # Ids in this set (and in sets from the same ``encode`` call) are below ``universe``.
+  universe: int
+
+  def __len__(self) -> int:
+    return len(self.offsets) - 1
+
+  @property
+  def sizes(self) -> np.ndarray:
+    return np.diff(self.offsets)
+
+  def row(self, idx: int) -> np.ndarray:
+    return self.ids[self.offsets[idx]:self.offsets[idx + 1]]
+
+  def row_index(self) -> np.ndarray:
+    return np.repeat(np.arange(len(self), dtype=np.int64), self.sizes)
+
+  def mask(self, idx: int = 0) -> np.ndarray:
+    """Boolean membership vector over the id space for row ``idx``."""
+    members = np.zeros(self.universe, dtype=bool)
+    members[self.row(idx)] = True
+    return members
+
+  def count_in(self, members: np.ndarray) -> np.ndarray:
+    """Per row, how many listed ids are set in ``members`` (a duplicate counts each time)."""
+    if not len(self.ids):
+      return np.zeros(len(self), dtype=np.float64)
+    return np.bincount(self.row_index(), weights=members[self.ids], minlength=len(self))
+
+
+class SkillVocabulary:
+  """Dense ids for skill keys; see the module docstring."""
+
+  def __init__(self, keys: Iterable[str] = ()) -> None:
+    self._ids: Dict[str, int] = {}
+    self._lock = threading.Lock()
+    for key in keys:
+      if key:
+        self._ids.setdefault(key, len(self._ids))
+
+  def __len__(self) -> int:
+    return len(self._ids)
+
+  def lookup(self, skill: str) -> int:
+    """Permanent id of ``skill``, or -1 if it has none."""
+    return self._ids.get(skill_key(skill), -1) if skill else -1
+
+  def encode(self, *groups: Sequence[Sequence[str]], grow: bool = False) -> List[SkillSets]:
+    """One ``SkillSets`` per group of skill lists. Empty strings are dropped, as ``_normalized`` drops them."""
+    flats = [list(chain.from_iterable(lists)) for lists in groups]
+    distinct = set(chain.from_iterable(flats))
+    distinct.discard('')
+    local: Dict[str, int] = {}
+    id_of: Dict[str, int] = {'': -1}
+    with self._lock:
+      for skill in distinct:
+        key = skill_key(skill)
+        found = self._ids.get(key)
+        if found is None:
+          found = self._ids.setdefault(key, len(self._ids)) if grow else local.setdefault(key, -2 - len(local))
+        id_of[skill] = found
+      # Call-local ids go after the permanent ones; only this call's arrays ever hold them.
+      base = len(self._ids)
+    universe = base + len(local)
+
+    out: List[SkillSets] = []
+    for lists, flat in zip(groups, flats):
+      ids = np.fromiter(map(id_of.__getitem__, flat), dtype=np.int64, count=len(flat))
+      # Call-local ids were handed out as -2, -3, ...; move them past the permanent ones.
+      ids = np.where(ids <= -2, base - 2 - ids, ids)
+      keep = ids >= 0
+      rows = np.repeat(np.arange(len(lists), dtype=np.int64), np.fromiter(map(len, lists), dtype=np.int64, count=len(lists)))
+      offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+      np.cumsum(np.bincount(rows[keep], minlength=len(lists)), out=offsets[1:])
+      out.append(SkillSets(ids[keep], offsets, universe))
+    return out
+
+
+_VOCABULARY: Optional[SkillVocabulary] = None
+_VOCABULARY_LOCK = threading.Lock()
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+  global _VOCABULARY
+  with _VOCABULARY_LOCK:
+    if _VOCABULARY is None:
+      ontology = load_skill_ontology()
+      _VOCABULARY = SkillVocabulary(
+        skill_key(name) for name in chain(ontology.display_names, ontology.canonical_ids) if name
+      )
+    return _VOCABULARY
@@ -0,0 +1,122 @@
+"""Per-stage latency spans for the AI pipelines.
+
+Services wrap each stage in ``span('resume.llm')``. Every span is added to a
+process-wide histogram. While a pipeline runs under ``collect_timings`` the
+span is also recorded in a per-request collector held in a ContextVar. The
+collector reaches threads started with ``contextvars.copy_context`` (executor
+and fan-out pools), so a stage timed on another thread still shows up.
+
+The outermost ``collect_timings`` logs one ``stage_timings`` event with every
+stage as a structured field. Requests with ``include_timings`` get the same
+numbers back in the response's ``timings`` field.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the last bucket is unbounded.
+BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+
+class StageTimings:
+  """Milliseconds spent per stage during one request; repeated stages accumulate."""
+
+  def __init__(self, pipeline: str) -> None:
+    self.pipeline = pipeline
+    self._stages: Dict[str, int] = {}
+    self._lock = threading.Lock()
+
+  def add(self, name: str, elapsed_ns: int) -> None:
+    with self._lock:
+      self._stages[name] = self._stages.get(name, 0) + elapsed_ns
+
+  def as_dict(self) -> Dict[str, float]:
+    with self._lock:
+      return {name: round(ns / 1e6, 3) for name, ns in self._stages.items()}
+
+
+class Histogram:
+  """Cumulative-bucket latency histogram (Prometheus layout)."""
+
+  def __init__(self, buckets: Tuple[float, ...] = BUCKETS_MS) -> None:
+    self.buckets = buckets
+    self.counts: List[int] = [0] * len(buckets)
+    self.count = 0
+    self.sum_ms = 0.0
+
+  def observe(self, value_ms: float) -> None:
+    self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+    self.count += 1
+    self.sum_ms += value_ms
+
+  def snapshot(self) -> Dict[str, object]:
+    return {'buckets': list(self.buckets), 'counts': list(self.counts), 'count': self.count, 'sum_ms': self.sum_ms}
+
+
+_COLLECTOR: ContextVar[Optional[StageTimings]] = ContextVar('stage_timings', default=None)
+_HISTOGRAMS: Dict[str, Histogram] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def _observe(name: str, elapsed_ns: int) -> None:
+  with _HISTOGRAMS_LOCK:
+    histogram = _HISTOGRAMS.get(name)
+    if histogram is None:
+      histogram = _HISTOGRAMS[name] = Histogram()
+    histogram.observe(elapsed_ns / 1e6)
+  collector = _COLLECTOR.get()
+  if collector is not None:
+    collector.add(name, elapsed_ns)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+  """Time the enclosed block as stage ``name``."""
+  started = time.perf_counter_ns()
+  try:
+    yield
+  finally:
+    _observe(name, time.perf_counter_ns() - started)
+
+
+@contextmanager
+def collect_timings(pipeline: str) -> Iterator[StageTimings]:
+  """Collect spans for one pipeline run; nested pipelines share the outer collector.
+
+  The pipeline itself is timed as a ``<pipeline>`` stage.
+  """
+  outer = _COLLECTOR.get()
+  timings = outer or StageTimings(pipeline)
+  token = _COLLECTOR.set(timings) if outer is None else None
+  try:
+    with span(pipeline):
+      yield timings
+  finally:
+    if token is not None:
+      _COLLECTOR.reset(token)
+      logger.info(
+        'stage_timings',
+        extra={'event': 'stage_timings', 'pipeline': pipeline, 'timings_ms': timings.as_dict()}
+      )
+      # CPU pool children serve no HTTP traffic; this is where their metrics get flushed.
+      from utils.metrics import flush
+
+      flush()
+
+
+def histogram_snapshot() -> Dict[str, Dict[str, object]]:
+  with _HISTOGRAMS_LOCK:
+    return {name: histogram.snapshot() for name, histogram in _HISTOGRAMS.items()}
+
+
+def reset_histograms() -> None:
+  with _HISTOGRAMS_LOCK:
+    _HISTOGRAMS.clear()
@@ -0,0 +1,82 @@
+"""Cosine similarity kernels over float32 matrices.
+
+Rows are L2-normalized once (``NormalizedMatrix``), so a similarity query is a
+single mat-vec / mat-mat product with no per-pair norm computation. Zero
+vectors normalize to zero rows and score 0 against everything.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+VectorLike = Union[np.ndarray, Sequence[float]]
+MatrixLike = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def as_matrix(vectors: MatrixLike) -> np.ndarray:
+  """Return ``vectors`` as a C-contiguous 2-D float32 array (no copy if already one)."""
+  matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+  if matrix.ndim == 1:
+    matrix = matrix.reshape(1, -1) if matrix.size else matrix.reshape(0, 0)
+  return matrix
+
+
+def l2_normalize(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  """Return ``(unit_rows, norms)`` for a 2-D float32 matrix."""
+  norms = np.linalg.norm(matrix, axis=1)
+  unit = np.divide(matrix, norms[:, None], out=np.zeros_like(matrix), where=norms[:, None] > 0)
+  return unit, norms
+
+
+@dataclass
+class NormalizedMatrix:
+  """Row-normalized float32 matrix with the original row norms cached."""
+
+  unit: np.ndarray
+  norms: np.ndarray
+
+  @classmethod
+  def from_vectors(cls, vectors: MatrixLike) -> 'NormalizedMatrix':
+    unit, norms = l2_normalize(as_matrix(vectors))
+    unit.setflags(write=False)
+    norms.setflags(write=False)
+    return cls(unit, norms)
+
+  def __len__(self) -> int:
+    return self.unit.shape[0]
+
+  @property
+  def dim(self) -> int:
+    return self.unit.shape[1] if self.unit.ndim == 2 else 0
+
+
+def _unit_query(query: VectorLike) -> np.ndarray:
+  vec = np.asarray(query, dtype=np.float32).reshape(-1)
+  norm = float(np.sqrt(vec @ vec))
+  return vec / norm if norm > 0 else np.zeros_like(vec)
+
+
+def _as_normalized(matrix: Union[NormalizedMatrix, MatrixLike]) -> NormalizedMatrix:
+  return matrix if isinstance(matrix, NormalizedMatrix) else NormalizedMatrix.from_vectors(matrix)
+
+
+def cosine_one_to_many(query: VectorLike, matrix: Union[NormalizedMatrix, MatrixLike]) -> np.ndarray:
+  """Cosine similarity of ``query`` against every row; float32 array of shape ``(n,)``."""
+  index = _as_normalized(matrix)
+  if not len(index):
+    return np.zeros(0, dtype=np.float32)
+  return index.unit @ _unit_query(query)
+
+
+def cosine_many_to_many(
+  queries: Union[NormalizedMatrix, MatrixLike],
+  matrix: Union[NormalizedMatrix, MatrixLike]
+) -> np.ndarray:
+  """Pairwise cosine similarity; float32 array of shape ``(len(queries), len(matrix))``."""
+  left = _as_normalized(queries)
+  right = _as_normalized(matrix)
+  if not len(left) or not len(right):
+    return np.zeros((len(left), len(right)), dtype=np.float32)
+  return left.unit @ right.unit.T
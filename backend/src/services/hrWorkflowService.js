@@ -191,10 +191,12 @@ const ensureMatchResultBaseImpl = async ({ job, resume, forceRefresh = false, re
       resumeSummaryLength: parsedData?.summary ? parsedData.summary.length : 0,
       resumeTextLength: resumeText.length,
       includeTrace: tracingEnabled,
-      payloadKeys: ['resume_skills', 'job_required_skills', 'resume_summary', 'job_summary', 'scoring_config', 'scoring_config_version', 'include_trace']
+      payloadKeys: ['resume_id', 'resume_skills', 'job_required_skills', 'resume_summary', 'job_summary', 'scoring_config', 'scoring_config_version', 'include_trace']
     });
   }
   const aiResponse = await matchResumeToJob({
+    // Lets the AI service re-score a corrected or re-extracted resume from its previous evaluation.
+    resume_id: String(resume._id),
     resume_skills: resumeSkills,
     job_required_skills: jobRequiredSkills,
     resume_summary: parsedData?.summary,